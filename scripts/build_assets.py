@@ -1,69 +1,924 @@
+import os
+import io
 import sys
+import time
 import datetime
+import argparse
+import hashlib
 import json
-import zlib
-import base64
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
+
+import pygame
 
 # Make sure we can import helpers from src/core when running this utility.
 ROOT_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT_DIR / "src"))
 
 from core.path_resolver import assets_root, asset_font, ensure_dir, locale_dir # noqa: E402
+from core.config_manager import DEFAULT_LANGUAGE_CODE, SUPPORTED_RESOLUTIONS # noqa: E402
+from core.locale.pak_loader import STRING_TABLE_ENTRY, STRING_TABLE_FORMAT, dump_string_table, flatten_strings # noqa: E402
+from core.pak_format import CODECS, PAK_VERSION, PIXEL_FORMAT, PakFormatError, PakIntegrityError, PakWriter, encode_payload, variant_name # noqa: E402
+from core.asset_manager import PakFile # noqa: E402
+from core.sprite_atlas import atlas_frames_name, atlas_page_name, frame_character, group_sequences # noqa: E402
+from core.scene.DialogueStructure import SetBackground # noqa: E402
+from core.scene_compiler import SCENE_FORMAT, SceneCompileError, compile_scene, dump_scene, load_compiled_scene # noqa: E402
+from core.chapter_manifest import ( # noqa: E402
+    CHAPTER_MANIFEST_VERSION, CHAPTER_NAME, chapter_manifest_path, scene_references, shard_pak_name
+)
 
 corresponding_font = {
     "en_us": "CactusClassicalSerif-Regular.ttf",
     "zh_tw": "CactusClassicalSerif-Regular.ttf"
 }
 
-LANG_DIR = locale_dir()
-ensure_dir(LANG_DIR)
-
-# Locales & Font
-for lang_path in LANG_DIR.glob("*.json"):
-    lang_code = lang_path.stem
-    with lang_path.open("r", encoding="utf-8") as reader:
-        data = json.load(reader)
-        data["font_path"] = str(asset_font(corresponding_font[lang_code]))
-        compressed = base64.b64encode(zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8")))
-        output_path = ensure_dir(lang_path.with_suffix(".pak"))
-        with output_path.open("wb") as f:
-            f.write(compressed)
-
-# Assets
-for foldername, filetype in zip(
-        ["illustration", "sprite", "scene"],
-        ["png", "png", "json"]
-    ):
-    pak_raw_data = {
-        "category": foldername,
-        "built_at": datetime.datetime.now().isoformat(),
-
-        "header": {
-            "filetype": filetype,
-            "count": 0,
-        },
-        "entries": {}
+# (folder name, source file type)
+ASSET_CATEGORIES = (
+    ("illustration", "png"),
+    ("sprite", "png"),
+    ("scene", "json"),
+)
+
+# Codec of every entry unless overridden with --codec.
+# PNG is already deflate-compressed; compressing it again costs decode time for next to no gain.
+DEFAULT_CODECS = {
+    "png": "raw",
+    "json": "zlib",
+}
+
+# Categories that get pre-scaled variants for every supported resolution with --variants
+VARIANT_CATEGORIES = ("illustration", "sprite")
+
+# Width the art is authored for, see SceneManager.uniform_scale
+REFERENCE_WIDTH = 1920
+
+# Atlas pages are packed in shelves up to this width and height (see --atlas)
+ATLAS_PAGE_SIZE = (4096, 4096)
+
+# Per-source content hashes and build parameters of the last build
+MANIFEST_PATH = assets_root() / "build_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def load_manifest() -> dict[str, Any]:
+    try:
+        with MANIFEST_PATH.open("r", encoding="utf-8") as reader:
+            manifest = json.load(reader)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": MANIFEST_VERSION, "outputs": {}}
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "outputs": {}}
+    return manifest
+
+
+def save_manifest(manifest: dict[str, Any]) -> None:
+    with MANIFEST_PATH.open("w", encoding="utf-8") as writer:
+        json.dump(manifest, writer, indent=1, sort_keys=True)
+
+
+def open_previous_paks(foldername: str) -> list[PakFile]:
+    # The base pak and every chapter shard of the last build.
+    # Only indexed paks can hand back single stored payloads.
+    paks: list[PakFile] = []
+    for pak_path in [assets_root() / shard_pak_name(foldername, None), *existing_shards(foldername)]:
+        try:
+            paks.append(PakFile(pak_path))
+        except (FileNotFoundError, PakFormatError):
+            continue
+    return paks
+
+
+def existing_shards(foldername: str) -> list[Path]:
+    return sorted(assets_root().glob(shard_pak_name(foldername, "*")))
+
+
+class StageTimer:
+    """Accumulates wall time per build stage."""
+    def __init__(self) -> None:
+        self.totals: dict[str, float] = {}
+
+    def add(self, stage: str, started_at: float) -> None:
+        self.totals[stage] = self.totals.get(stage, 0.0) + time.perf_counter() - started_at
+
+    def summary(self) -> str:
+        return " | ".join(f"{stage} {seconds:.2f}s" for stage, seconds in self.totals.items())
+
+
+def print_report(label: str, rebuilt: list[str], total: int, timer: StageTimer) -> None:
+    print(f"[{label}] rebuilt {len(rebuilt)}/{total} | {timer.summary()}")
+    for name in rebuilt:
+        print(f"    * {name}")
+
+
+def build_locales(manifest: dict[str, Any], force: bool, built_at: str) -> None:
+    """
+    Flatten and validate every locale, then write it as a string table pak (see core/locale/pak_loader.py).
+    Every language must define exactly the strings of the default language.
+    """
+    lang_dir = locale_dir()
+    ensure_dir(lang_dir)
+
+    tables: dict[str, dict[str, str]] = {}
+    errors: list[str] = []
+    for lang_path in sorted(lang_dir.glob("*.json")):
+        try:
+            tables[lang_path.stem] = flatten_strings(json.loads(lang_path.read_text(encoding="utf-8")))
+        except (json.JSONDecodeError, TypeError, ValueError) as e:
+            errors.append(f"Locale {lang_path.stem!r}: {e}")
+
+    reference = tables.get(DEFAULT_LANGUAGE_CODE)
+    for lang_code, table in tables.items():
+        if reference is None or table is reference:
+            continue
+        for key in sorted(reference.keys() - table.keys()):
+            errors.append(f"Locale {lang_code!r} is missing {key!r}")
+        for key in sorted(table.keys() - reference.keys()):
+            errors.append(f"Locale {lang_code!r} defines {key!r}, unknown to {DEFAULT_LANGUAGE_CODE!r}")
+    if errors:
+        raise SystemExit("\n".join(errors))
+
+    for lang_code, table in tables.items():
+        timer = StageTimer()
+        lang_path = lang_dir / f"{lang_code}.json"
+        output_path = lang_path.with_suffix(".pak")
+
+        started_at = time.perf_counter()
+        source = lang_path.read_bytes()
+        font_path = str(asset_font(corresponding_font[lang_code]))
+        params = {"font_path": font_path, "format": STRING_TABLE_FORMAT}
+        source_hash = content_hash(source)
+        timer.add("hash", started_at)
+
+        previous = manifest["outputs"].get(f"locale/{lang_code}")
+        if not force and output_path.exists() and previous == {"params": params, "source_hash": source_hash}:
+            print_report(f"locale/{lang_code}", [], 1, timer)
+            continue
+
+        started_at = time.perf_counter()
+        table["font_path"] = font_path
+        data = dump_string_table(table)
+        timer.add("encode", started_at)
+
+        started_at = time.perf_counter()
+        with PakWriter(output_path, "locale", "strings", built_at) as writer:
+            writer.meta["language"] = lang_code
+            writer.add(STRING_TABLE_ENTRY, data, "zlib", filename=lang_path.name, format=STRING_TABLE_FORMAT)
+        timer.add("write", started_at)
+
+        manifest["outputs"][f"locale/{lang_code}"] = {"params": params, "source_hash": source_hash}
+        print_report(f"locale/{lang_code}", [lang_code], 1, timer)
+
+
+type EncodedEntry = tuple[bytes, str, int, dict[str, Any]]  # (payload, codec, decoded size, meta)
+
+
+def encode_file(path: str, codec: str) -> EncodedEntry:
+    """
+    Read and encode one source file. Runs inside worker processes.
+    """
+    data = Path(path).read_bytes()
+    return encode_payload(data, codec), codec, len(data), {}
+
+
+def encode_data(data: bytes, codec: str) -> EncodedEntry:
+    return encode_payload(data, codec), codec, len(data), {}
+
+
+def _as_32bit(surface: pygame.Surface) -> pygame.Surface:
+    # smoothscale only accepts 24/32-bit surfaces; no display exists here to convert() against
+    if surface.get_bitsize() in (24, 32):
+        return surface
+    converted = pygame.Surface(surface.get_size(), pygame.SRCALPHA, 32)
+    converted.blit(surface, (0, 0))
+    return converted
+
+
+def trim_surface(surface: pygame.Surface) -> tuple[pygame.Surface, list[int] | None]:
+    """
+    Crop the fully transparent margins of an image.
+
+    :return tuple: (cropped view, [x, y, width, height] of the crop offset and the untrimmed size),
+        or the image itself and None when there is nothing to crop.
+    """
+    rect = surface.get_bounding_rect()
+    if rect.size == surface.get_size() or not rect.width or not rect.height:
+        return surface, None
+    return surface.subsurface(rect), [rect.x, rect.y, *surface.get_size()]
+
+
+def encode_surface(surface: pygame.Surface, codec: str, pixels: bool = False, trim: bool = False) -> EncodedEntry:
+    """
+    Encode an image as PNG, or as raw PIXEL_FORMAT pixels the runtime wraps without decoding.
+    Trimmed images record where they sit in the untrimmed one as meta "trim", see trim_surface.
+    """
+    meta: dict[str, Any] = {}
+    if trim:
+        surface, meta["trim"] = trim_surface(surface)
+        if meta["trim"] is None:
+            del meta["trim"]
+    meta["image_size"] = list(surface.get_size())
+    if pixels:
+        data = pygame.image.tobytes(surface, PIXEL_FORMAT)
+        meta["pixels"] = PIXEL_FORMAT
+    else:
+        buffer = io.BytesIO()
+        pygame.image.save(surface, buffer, "png")
+        data = buffer.getvalue()
+    return encode_payload(data, codec), codec, len(data), meta
+
+
+def encode_scaled_image(
+        path: str,
+        size: tuple[int, int] | None,
+        factor: float | None,
+        codec: str,
+        blur: int = 0,
+        pixels: bool = False,
+        trim: bool = False
+    ) -> EncodedEntry:
+    """
+    Scale (and blur) an image the same way the runtime would and encode it.
+    Runs inside worker processes.
+
+    :param path: Source image.
+    :param size: Exact target size (illustrations are scaled to the window size).
+    :param factor: Scale factor, used when size is None (sprites are scaled by uniform_scale).
+        Both None keep the source size.
+    :param codec: Key of CODECS.
+    :param blur: Gaussian blur radius applied after scaling.
+    :param pixels: Store raw pixels instead of PNG, see encode_surface.
+    :param trim: Crop transparent margins after scaling, see trim_surface.
+    """
+    surface = _as_32bit(pygame.image.load(path))
+    if size is not None:
+        if surface.get_size() != size:
+            surface = pygame.transform.smoothscale(surface, size)
+    elif factor is not None and factor != 1.0:
+        surface = pygame.transform.smoothscale_by(surface, factor)
+    if blur:
+        surface = pygame.transform.gaussian_blur(surface, blur)
+    return encode_surface(surface, codec, pixels, trim)
+
+
+type FrameRect = tuple[int, int, int, int, int]  # (page, x, y, w, h)
+
+
+def pack_frames(sizes: dict[str, tuple[int, int]], page_size: tuple[int, int]) -> tuple[dict[str, FrameRect], list[tuple[int, int]]]:
+    """
+    Shelf-pack frames into as few pages as possible, tallest first.
+    Pages are cropped to the area they actually use.
+
+    :param sizes: Frame name -> (width, height).
+    :param page_size: Maximum page size.
+    :return tuple: (frame name -> rect, size of every page)
+    """
+    page_w, page_h = page_size
+    placements: dict[str, FrameRect] = {}
+    page_sizes: list[tuple[int, int]] = []
+    x = y = shelf_h = used_w = 0
+
+    for name in sorted(sizes, key=lambda n: (-sizes[n][1], -sizes[n][0], n)):
+        w, h = sizes[name]
+        if w > page_w or h > page_h:
+            raise ValueError(f"Sprite {name} ({w}x{h}) doesn't fit in a {page_w}x{page_h} atlas page")
+
+        if x + w > page_w:  # Next shelf
+            x, y, shelf_h = 0, y + shelf_h, 0
+        if y + h > page_h:  # Next page
+            page_sizes.append((used_w, y))
+            x = y = shelf_h = used_w = 0
+
+        placements[name] = (len(page_sizes), x, y, w, h)
+        x += w
+        shelf_h = max(shelf_h, h)
+        used_w = max(used_w, x)
+
+    if placements:
+        page_sizes.append((used_w, y + shelf_h))
+    return placements, page_sizes
+
+
+def build_sprite_atlas(
+        frame_paths: dict[str, str],
+        size: tuple[int, int] | None,
+        factor: float,
+        page_codec: str,
+        table_codec: str,
+        pixels: bool = False,
+        trim: bool = False
+    ) -> list[tuple[str, EncodedEntry]]:
+    """
+    Pack the frames of every character into atlas pages and encode the pages plus
+    the frame table (see core/sprite_atlas.py). Runs inside worker processes.
+
+    :param frame_paths: Frame name -> source image.
+    :param size: Window size the atlas is baked for, None for the reference atlas.
+    :param factor: Scale factor applied to every frame.
+    :param page_codec: Key of CODECS for the page images.
+    :param table_codec: Key of CODECS for the frame table.
+    :param pixels: Store the pages as raw pixels instead of PNG, see encode_surface.
+    :param trim: Crop the transparent margins of every frame after scaling, see trim_surface.
+    :return list: (entry name, encoded entry) pairs, frame table first.
+    """
+    characters: dict[str, dict[str, pygame.Surface]] = {}
+    trims: dict[str, list[int]] = {}
+    for name, path in sorted(frame_paths.items()):
+        surface = _as_32bit(pygame.image.load(path))
+        if factor != 1.0:
+            surface = pygame.transform.smoothscale_by(surface, factor)
+        if trim:
+            surface, frame_trim = trim_surface(surface)
+            if frame_trim is not None:
+                trims[name] = frame_trim
+        characters.setdefault(frame_character(name), {})[name] = surface
+
+    pages: list[tuple[str, EncodedEntry]] = []
+    table: dict[str, Any] = {"scale": factor, "pages": [], "frames": {}, "sequences": group_sequences(frame_paths)}
+    for character, frames in characters.items():
+        placements, page_sizes = pack_frames({name: s.get_size() for name, s in frames.items()}, ATLAS_PAGE_SIZE)
+
+        page_surfaces = [pygame.Surface(page_size, pygame.SRCALPHA, 32) for page_size in page_sizes]
+        for name, (page, x, y, _, _) in placements.items():
+            # RGBA_MAX over a transparent page copies the pixels, alpha included, without blending
+            page_surfaces[page].blit(frames[name], (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            table["frames"][name] = [len(table["pages"]) + page, x, y, *frames[name].get_size(), *trims.get(name, [])]
+
+        for idx, page_surface in enumerate(page_surfaces):
+            page_name = atlas_page_name(character, idx, size)
+            pages.append((page_name, encode_surface(page_surface, page_codec, pixels)))
+            table["pages"].append(page_name)
+
+    data = json.dumps(table, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return [(atlas_frames_name(size), (encode_payload(data, table_codec), table_codec, len(data), {}))] + pages
+
+
+def compile_scenes() -> dict[str, bytes]:
+    """
+    Compile every scene script, checking references against the asset sources.
+    All errors of all scenes are reported at once and abort the build.
+
+    :return dict: Scene name -> compiled scene (see core/scene_compiler.py).
+    """
+    root = assets_root()
+    illustrations = {path.stem for path in (root / "illustration").glob("*.png")}
+    sprites = {path.stem for path in (root / "sprite").glob("*.png")}
+    scene_paths = sorted((root / "scene").glob("*.json"))
+    scenes = {path.stem for path in scene_paths}
+
+    compiled: dict[str, bytes] = {}
+    errors: list[str] = []
+    for scene_path in scene_paths:
+        try:
+            data = json.loads(scene_path.read_text(encoding="utf-8"))
+            script = compile_scene(
+                data, scene_path.stem, illustrations=illustrations, sprites=sprites, scenes=scenes
+            )
+        except json.JSONDecodeError as e:
+            errors.append(f"Scene {scene_path.stem!r} is not valid JSON: {e}")
+        except SceneCompileError as e:
+            errors.append(str(e))
+        else:
+            compiled[scene_path.stem] = dump_scene(script)
+
+    if errors:
+        raise SystemExit("\n".join(errors))
+    return compiled
+
+
+def collect_background_blurs(compiled_scenes: dict[str, bytes]) -> dict[str, set[int]]:
+    """
+    Find every blurred set_background of the compiled scenes.
+
+    :param compiled_scenes: Scene name -> compiled scene, see compile_scenes.
+    :return dict: Illustration name -> blur radii the scenes use.
+    """
+    blurs: dict[str, set[int]] = {}
+    for data in compiled_scenes.values():
+        for step in load_compiled_scene(data).steps:
+            for action in step.actions:
+                match action:
+                    case SetBackground(filename, blur) if filename is not None and blur:
+                        blurs.setdefault(filename, set()).add(blur)
+    return blurs
+
+
+def collect_scene_chapters() -> dict[str, str]:
+    """
+    Read the chapter every scene script declares.
+
+    :return dict: Scene name -> chapter, for the scenes that declare one.
+    """
+    chapters: dict[str, str] = {}
+    errors: list[str] = []
+    for scene_path in sorted((assets_root() / "scene").glob("*.json")):
+        chapter = json.loads(scene_path.read_text(encoding="utf-8")).get("chapter")
+        if chapter is None:
+            continue
+        if not isinstance(chapter, str) or not CHAPTER_NAME.fullmatch(chapter):
+            errors.append(f"Scene {scene_path.stem!r}: chapter must be made of letters, digits, '_' and '-', got {chapter!r}")
+            continue
+        chapters[scene_path.stem] = chapter
+
+    if errors:
+        raise SystemExit("\n".join(errors))
+    return chapters
+
+
+def build_chapter_manifest(compiled_scenes: dict[str, bytes], declared: dict[str, str]) -> dict[str, Any]:
+    """
+    Walk the scenes through their change_dialogue_scene edges and record what
+    every scene and chapter reaches (see core/chapter_manifest.py).
+
+    Scenes without a chapter inherit it breadth-first from the scenes leading to them;
+    scenes no chaptered scene leads to stay unassigned (chapter None).
+    """
+    references = {
+        name: scene_references(load_compiled_scene(data)) for name, data in sorted(compiled_scenes.items())
     }
 
-    assets_sub_dir = assets_root() / foldername
-
-    for asset_path in assets_sub_dir.glob(f"*.{filetype}"):
-        with asset_path.open("rb") as reader:
-            pak_raw_data["entries"][asset_path.stem] = {
-                "filename": asset_path.name,
-                "encoded_string": base64.b64encode(reader.read()).decode("ascii")
-            }
-            pak_raw_data["header"]["count"] = pak_raw_data["header"].get("count", 0) + 1
-
-    with open(assets_root() / f"{foldername}.pak", "wb") as writer:
-        writer.write(
-            base64.b64encode(
-                zlib.compress(
-                    json.dumps(
-                        pak_raw_data,
-                        separators=(",", ":")).encode("utf-8"),
-                        level=9
+    chapters: dict[str, str] = dict(declared)
+    queue = deque(name for name in references if name in declared)
+    while queue:
+        name = queue.popleft()
+        for next_scene in references[name][2]:
+            if next_scene not in chapters:
+                chapters[next_scene] = chapters[name]
+                queue.append(next_scene)
+
+    manifest: dict[str, Any] = {"version": CHAPTER_MANIFEST_VERSION, "scenes": {}, "chapters": {}, "shards": {}}
+    for name, (illustrations, sprites, next_scenes) in references.items():
+        chapter = chapters.get(name)
+        manifest["scenes"][name] = {
+            "chapter": chapter,
+            "illustrations": sorted(illustrations),
+            "sprites": sorted(sprites),
+            "next": next_scenes,
+        }
+        if chapter is None:
+            continue
+        reached = manifest["chapters"].setdefault(chapter, {"scenes": [], "illustrations": [], "sprites": []})
+        reached["scenes"].append(name)
+        reached["illustrations"] = sorted(set(reached["illustrations"]) | illustrations)
+        reached["sprites"] = sorted(set(reached["sprites"]) | sprites)
+    return manifest
+
+
+def chapter_owners(manifest: dict[str, Any]) -> dict[str, dict[str, str]]:
+    """
+    Assign every asset only one chapter uses to that chapter.
+    Assets shared by several chapters, used by unassigned scenes or by no scene at all
+    (e.g. the title screen) stay in the base pak.
+
+    :return dict: Category -> asset name -> chapter.
+    """
+    users: dict[tuple[str, str], set[str | None]] = {}
+    for name, scene in manifest["scenes"].items():
+        chapter = scene["chapter"]
+        users.setdefault(("scene", name), set()).add(chapter)
+        for category in ("illustration", "sprite"):
+            for asset in scene[f"{category}s"]:
+                users.setdefault((category, asset), set()).add(chapter)
+
+    owners: dict[str, dict[str, str]] = {}
+    for (category, asset), chapters in sorted(users.items()):
+        if len(chapters) == 1 and None not in chapters:
+            owners.setdefault(category, {})[asset] = next(iter(chapters)) # type: ignore
+    return owners
+
+
+def entry_asset(foldername: str, name: str) -> str | None:
+    """
+    Asset an entry was built from: the source of a variant, the character of a
+    sprite frame or atlas page. None for entries shared by every asset (atlas frame tables).
+    """
+    name = name.split("@", 1)[0]
+    if foldername != "sprite":
+        return name
+    if name.startswith("atlas/"):
+        parts = name.split("/")
+        return parts[1] if len(parts) == 3 else None
+    return frame_character(name)
+
+
+def save_chapter_manifest(manifest: dict[str, Any]) -> None:
+    with chapter_manifest_path().open("w", encoding="utf-8") as writer:
+        json.dump(manifest, writer, indent=1, sort_keys=True)
+
+
+def run_task(pool: Executor | None, fn: Callable[..., Any], *args: Any) -> Future:
+    # Without a pool, tasks run right away so the single-core path stays simple
+    if pool is not None:
+        return pool.submit(fn, *args)
+    future: Future = Future()
+    future.set_result(fn(*args))
+    return future
+
+
+@dataclass
+class EntryJob:
+    name: str       # Entry name in the pak
+    filename: str   # Source filename, kept for reference
+    key: str        # Hash of the source plus every parameter the payload depends on
+    source_size: int
+    result: Future | None = None  # None when the previous payload is reused
+    grouped: bool = False         # The job produces several entries, see build_sprite_atlas
+
+
+class CategoryBuild:
+    """
+    Builds one asset category into an indexed binary pak (see core/pak_format.py).
+
+    plan() hashes the sources and submits the entries that need re-encoding to the pool;
+    finish() collects them in a fixed order and writes the pak, so the output does not
+    depend on how many workers ran. Entries whose key is unchanged since the last build
+    are copied from the previous pak byte-for-byte.
+
+    With atlas=True the sprites are packed into atlas pages (see core/sprite_atlas.py)
+    instead of being stored one entry per file.
+
+    Each entry picks its own codec, see codec_for(). Scenes are stored compiled.
+    """
+    def __init__(
+            self,
+            foldername: str,
+            filetype: str,
+            manifest: dict[str, Any],
+            force: bool,
+            built_at: str,
+            *,
+            variants: bool = False,
+            blurs: dict[str, set[int]] | None = None,
+            atlas: bool = False,
+            codecs: dict[str, str] | None = None,
+            compiled_scenes: dict[str, bytes] | None = None,
+            owners: dict[str, str] | None = None,
+            pixels: bool = False,
+            trim: bool = False
+        ) -> None:
+        self.foldername = foldername
+        self.filetype = filetype
+        self.manifest = manifest
+        self.built_at = built_at
+        self.variants = variants and foldername in VARIANT_CATEGORIES
+        self.blurs = blurs if blurs and foldername == "illustration" else {}
+        self.atlas = atlas and foldername == "sprite"
+        self.codecs = codecs or {}
+        self.compiled_scenes = compiled_scenes if foldername == "scene" else None
+        self.pixels = pixels and foldername in VARIANT_CATEGORIES
+        # Appended to the key of every image so switching --pixels re-encodes them
+        self.trim = trim and foldername == "sprite"
+        self.image_key = f"|pixels={PIXEL_FORMAT}" if self.pixels else ""
+        self.image_key += "|trim" if self.trim else ""
+        self.owners = owners or {}  # Asset name -> chapter shard, see chapter_owners
+        self.shards: dict[str, str] = {}  # Entry name -> chapter, filled by finish
+        self.params = {"format": PAK_VERSION}
+
+        previous_output = manifest["outputs"].get(foldername, {})
+        self.previous_keys: dict[str, str] = previous_output.get("entries", {})
+        self.previous_groups: dict[str, list[str]] = previous_output.get("groups", {})
+        reusable = not force and previous_output.get("params") == self.params
+        self.previous_paks = open_previous_paks(foldername) if reusable else []
+        # Entries are looked up by name whichever shard they were in, so re-sharding reuses them too
+        self.previous_entries: dict[str, PakFile] = {
+            name: pak for pak in self.previous_paks for name in pak.names()
+        }
+
+        self.jobs: list[EntryJob] = []
+        self.submitted: dict[str, Future] = {}  # key -> encode task, shared by sources with identical content
+        self.timer = StageTimer()
+        self.wall_time = 0.0
+
+    def can_reuse(self, job: EntryJob) -> bool:
+        if self.previous_keys.get(job.name) != job.key:
+            return False
+
+        names = self.output_names(job, self.previous_groups)
+        if not all(name in self.previous_entries for name in names):
+            return False
+        # A corrupt payload is re-encoded rather than copied into the new pak
+        try:
+            for name in names:
+                self.previous_entries[name].verify(name)
+        except PakIntegrityError:
+            return False
+        return True
+
+    def codec_for(self, name: str, filetype: str | None = None) -> str:
+        """
+        Codec of an entry: a per-entry override ("sprite/Ann", also applied to its variants),
+        then a per-category override ("sprite"), then the default of the file type.
+        """
+        base_name = name.split("@", 1)[0]
+        for target in (f"{self.foldername}/{base_name}", self.foldername):
+            if target in self.codecs:
+                return self.codecs[target]
+        return DEFAULT_CODECS[filetype or self.filetype]
+
+    @staticmethod
+    def output_names(job: EntryJob, groups: dict[str, list[str]]) -> list[str]:
+        return groups.get(job.name, []) if job.grouped else [job.name]
+
+    def plan(self, pool: Executor | None) -> None:
+        started_at = time.perf_counter()
+
+        atlas_sources: dict[str, tuple[Path, str]] = {}
+        for asset_path in sorted((assets_root() / self.foldername).glob(f"*.{self.filetype}")):
+            hash_started_at = time.perf_counter()
+            data = asset_path.read_bytes()
+            key = content_hash(data)
+            self.timer.add("hash", hash_started_at)
+
+            if self.atlas:
+                atlas_sources[asset_path.stem] = (asset_path, key)
+                continue
+
+            codec = self.codec_for(asset_path.stem)
+            if self.compiled_scenes is not None:
+                self.add_job(
+                    pool,
+                    EntryJob(asset_path.stem, asset_path.name, content_hash(f"{key}|scene_format={SCENE_FORMAT}|codec={codec}".encode()), len(data)),
+                    encode_data, self.compiled_scenes[asset_path.stem], codec
                 )
+                continue
+
+            job = EntryJob(asset_path.stem, asset_path.name, content_hash(f"{key}|codec={codec}{self.image_key}".encode()), len(data))
+            if self.pixels or self.trim:
+                self.add_job(pool, job, encode_scaled_image, str(asset_path), None, None, codec, 0, self.pixels, self.trim)
+            else:
+                self.add_job(pool, job, encode_file, str(asset_path), codec)
+
+            if self.variants:
+                self.plan_variants(pool, asset_path, key, len(data))
+            if asset_path.stem in self.blurs:
+                self.plan_blurred_variants(pool, asset_path, key, len(data))
+
+        if atlas_sources:
+            self.plan_atlases(pool, atlas_sources)
+
+        self.wall_time += time.perf_counter() - started_at
+
+    def add_job(self, pool: Executor | None, job: EntryJob, fn: Callable[..., EncodedEntry], *args: Any) -> None:
+        if not self.can_reuse(job):
+            # Keys hold no entry names, so a duplicated source hits the task of its first copy
+            if job.grouped or job.key not in self.submitted:
+                encode_started_at = time.perf_counter()
+                self.submitted[job.key] = run_task(pool, fn, *args)
+                self.timer.add("encode", encode_started_at)
+            job.result = self.submitted[job.key]
+        self.jobs.append(job)
+
+    def plan_variants(self, pool: Executor | None, asset_path: Path, source_key: str, source_size: int) -> None:
+        # One pre-scaled copy per supported resolution; the reference resolution is the source itself
+        for size in SUPPORTED_RESOLUTIONS:
+            if size[0] == REFERENCE_WIDTH:
+                continue
+
+            name = variant_name(asset_path.stem, size)
+            codec = self.codec_for(name)
+            if self.foldername == "illustration":
+                key = content_hash(f"{source_key}|size={size}|codec={codec}{self.image_key}".encode())
+                args = (str(asset_path), size, None, codec, 0, self.pixels, self.trim)
+            else:
+                factor = size[0] / REFERENCE_WIDTH
+                key = content_hash(f"{source_key}|factor={factor}|codec={codec}{self.image_key}".encode())
+                args = (str(asset_path), None, factor, codec, 0, self.pixels, self.trim)
+
+            self.add_job(pool, EntryJob(name, asset_path.name, key, source_size), encode_scaled_image, *args)
+
+    def plan_blurred_variants(self, pool: Executor | None, asset_path: Path, source_key: str, source_size: int) -> None:
+        # The runtime blurs after scaling to the window, so every resolution needs its own copy
+        for blur in sorted(self.blurs[asset_path.stem]):
+            for size in SUPPORTED_RESOLUTIONS:
+                name = variant_name(asset_path.stem, size, blur)
+                codec = self.codec_for(name)
+                key = content_hash(f"{source_key}|size={size}|blur={blur}|codec={codec}{self.image_key}".encode())
+                self.add_job(
+                    pool,
+                    EntryJob(name, asset_path.name, key, source_size),
+                    encode_scaled_image, str(asset_path), size, None, codec, blur, self.pixels
+                )
+
+    def plan_atlases(self, pool: Executor | None, sources: dict[str, tuple[Path, str]]) -> None:
+        # One atlas at the reference scale, plus one per supported resolution with --variants
+        frame_paths = {name: str(path) for name, (path, _) in sources.items()}
+        sources_key = "|".join(f"{name}={key}" for name, (_, key) in sorted(sources.items()))
+        source_size = sum(path.stat().st_size for path, _ in sources.values())
+
+        page_codec = self.codec_for("atlas")
+        table_codec = self.codec_for(atlas_frames_name(), "json")
+
+        sizes: list[tuple[int, int] | None] = [None]
+        if self.variants:
+            sizes += [size for size in SUPPORTED_RESOLUTIONS if size[0] != REFERENCE_WIDTH]
+
+        for size in sizes:
+            factor = size[0] / REFERENCE_WIDTH if size is not None else 1.0
+            key = content_hash(
+                f"{sources_key}|atlas={ATLAS_PAGE_SIZE}|factor={factor}|codec={page_codec},{table_codec}{self.image_key}".encode()
+            )
+            self.add_job(
+                pool,
+                EntryJob(atlas_frames_name(size), "", key, source_size, grouped=True),
+                build_sprite_atlas, frame_paths, size, factor, page_codec, table_codec, self.pixels, self.trim
             )
-        )
\ No newline at end of file
+
+    def writer_for(self, writers: dict[str | None, PakWriter], name: str) -> PakWriter:
+        # Entries of an asset owned by a chapter go to that chapter's shard
+        asset = entry_asset(self.foldername, name)
+        chapter = self.owners.get(asset) if asset is not None else None
+        if chapter is not None:
+            self.shards[name] = chapter
+
+        if chapter not in writers:
+            writers[chapter] = self.new_writer(chapter)
+        return writers[chapter]
+
+    def new_writer(self, chapter: str | None) -> PakWriter:
+        pak_path = assets_root() / shard_pak_name(self.foldername, chapter)
+        return PakWriter(pak_path, self.foldername, self.filetype, self.built_at)
+
+    def finish(self) -> None:
+        started_at = time.perf_counter()
+        rebuilt: list[str] = []
+        groups: dict[str, list[str]] = {}
+
+        # The base pak is always written, shards only when they get entries
+        writers: dict[str | None, PakWriter] = {None: self.new_writer(None)}
+        try:
+            for job in self.jobs:
+                if job.result is None:
+                    reuse_started_at = time.perf_counter()
+                    for name in self.output_names(job, self.previous_groups):
+                        previous_pak = self.previous_entries[name]
+                        old = previous_pak.entry(name)
+                        payload = bytes(previous_pak.read_stored(name))
+                        self.writer_for(writers, name).add_encoded(
+                            name, payload, old.codec, old.size, filename=job.filename, **old.meta
+                        )
+                    if job.grouped:
+                        groups[job.name] = self.previous_groups[job.name]
+                    self.timer.add("reuse", reuse_started_at)
+                    continue
+
+                encode_started_at = time.perf_counter()
+                outputs = job.result.result() if job.grouped else [(job.name, job.result.result())]
+                self.timer.add("encode", encode_started_at)
+
+                write_started_at = time.perf_counter()
+                for name, (payload, codec, size, meta) in outputs:
+                    self.writer_for(writers, name).add_encoded(name, payload, codec, size, filename=job.filename, **meta)
+                    rebuilt.append(name)
+                if job.grouped:
+                    groups[job.name] = [name for name, _ in outputs]
+                self.timer.add("write", write_started_at)
+        except BaseException:
+            for writer in writers.values():
+                writer.abort()
+            raise
+        finally:
+            # The old files must be unmapped before the new ones replace them
+            for previous_pak in self.previous_paks:
+                previous_pak.close()
+
+        write_started_at = time.perf_counter()
+        for writer in writers.values():
+            writer.close()
+        # Shards of chapters that no longer own anything would still be shipped
+        written = {writer.path for writer in writers.values()}
+        for pak_path in existing_shards(self.foldername):
+            if pak_path not in written:
+                pak_path.unlink()
+        self.timer.add("write", write_started_at)
+
+        self.manifest["outputs"][self.foldername] = {
+            "params": self.params,
+            "entries": {job.name: job.key for job in self.jobs},
+            "groups": groups,
+        }
+        self.wall_time += time.perf_counter() - started_at
+
+        source_mb = sum(job.source_size for job in self.jobs) / (1024 * 1024)
+        print_report(self.foldername, rebuilt, sum(len(writer.entries) for writer in writers.values()), self.timer)
+        for chapter, writer in writers.items():
+            if chapter is not None:
+                print(f"    {writer.path.name}: {len(writer.entries)} entries, {writer.path.stat().st_size / (1024 * 1024):.1f} MB")
+        deduplicated_bytes = sum(writer.deduplicated_bytes for writer in writers.values())
+        if deduplicated_bytes:
+            print(f"    {deduplicated_bytes / (1024 * 1024):.1f} MB of duplicated payloads stored once")
+        print(f"    {source_mb:.1f} MB in {self.wall_time:.2f}s ({source_mb / max(self.wall_time, 1e-9):.1f} MB/s)")
+
+
+def build_timestamp() -> str:
+    # Honour SOURCE_DATE_EPOCH so that repeated builds can be compared byte for byte
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.datetime.fromtimestamp(int(epoch), datetime.timezone.utc).isoformat()
+    return datetime.datetime.now().isoformat()
+
+
+def parse_codec_overrides(parser: argparse.ArgumentParser, values: list[str]) -> dict[str, str]:
+    overrides: dict[str, str] = {}
+    categories = [foldername for foldername, _ in ASSET_CATEGORIES]
+    for value in values:
+        target, sep, codec = value.partition("=")
+        if not sep or codec not in CODECS or target.split("/", 1)[0] not in categories:
+            parser.error(
+                f"invalid --codec {value!r}: expected CATEGORY[/ENTRY]=CODEC with CATEGORY in {categories} "
+                f"and CODEC in {sorted(CODECS)}"
+            )
+        overrides[target] = codec
+    return overrides
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Pack locales and assets into .pak files.")
+    parser.add_argument("--force", action="store_true", help="ignore the build manifest and re-encode everything")
+    parser.add_argument(
+        "--variants", action="store_true",
+        help="bake illustrations and sprites pre-scaled for every supported resolution"
+    )
+    parser.add_argument(
+        "--blur-variants", action=argparse.BooleanOptionalAction, default=True,
+        help="bake every (illustration, blur) pair used by set_background in the scene scripts (default: on)"
+    )
+    parser.add_argument(
+        "--atlas", action="store_true",
+        help="pack sprites into per-character atlas pages instead of one entry per file"
+    )
+    parser.add_argument(
+        "--pixels", action="append", default=[], choices=VARIANT_CATEGORIES, metavar="CATEGORY",
+        help=f"store the images of a category as raw {PIXEL_FORMAT} pixels instead of PNG: larger paks, "
+             f"no image decode when loading; may be repeated (categories: {', '.join(VARIANT_CATEGORIES)})"
+    )
+    parser.add_argument(
+        "--trim", action=argparse.BooleanOptionalAction, default=True,
+        help="crop the transparent margins of sprites, recording where they sit in the full frame (default: on)"
+    )
+    parser.add_argument(
+        "--chapters", action="store_true",
+        help="move the scenes and assets only one chapter uses into <category>.<chapter>.pak shards"
+    )
+    parser.add_argument(
+        "--codec", action="append", default=[], metavar="CATEGORY[/ENTRY]=CODEC",
+        help=f"override the codec of a category or a single entry, may be repeated "
+             f"(codecs: {', '.join(sorted(CODECS))}; default: {DEFAULT_CODECS})"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="worker processes used to encode entries (0: one per CPU core, default: 1)"
+    )
+    args = parser.parse_args(argv)
+    codecs = parse_codec_overrides(parser, args.codec)
+
+    manifest = load_manifest()
+    built_at = build_timestamp()
+    started_at = time.perf_counter()
+
+    # Scene scripts are validated first so broken references fail the build before any encoding
+    compiled_scenes = compile_scenes()
+    chapter_manifest = build_chapter_manifest(compiled_scenes, collect_scene_chapters())
+    owners = chapter_owners(chapter_manifest) if args.chapters else {}
+
+    # Locales & Font
+    build_locales(manifest, args.force, built_at)
+
+    # Assets
+    # Every category is planned first so the pool stays busy across category boundaries
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    blurs = collect_background_blurs(compiled_scenes) if args.blur_variants else {}
+    try:
+        builds = [
+            CategoryBuild(
+                foldername, filetype, manifest, args.force, built_at,
+                variants=args.variants, blurs=blurs, atlas=args.atlas, codecs=codecs,
+                compiled_scenes=compiled_scenes, owners=owners.get(foldername),
+                pixels=foldername in args.pixels, trim=args.trim
+            )
+            for foldername, filetype in ASSET_CATEGORIES
+        ]
+        for build in builds:
+            build.plan(pool)
+        for build in builds:
+            build.finish()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    chapter_manifest["shards"] = {build.foldername: build.shards for build in builds if build.shards}
+    save_manifest(manifest)
+    save_chapter_manifest(chapter_manifest)
+    print(f"Done in {time.perf_counter() - started_at:.2f}s with {jobs} worker(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,446 @@
+import os
+import io
+import sys
+import time
+import argparse
+import datetime
+from typing import NamedTuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+
+import pygame
+
+# Make sure we can import helpers from src/core when running this utility.
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from core.path_resolver import asset_overlay, assets_root, locale_dir # noqa: E402
+from core.config_manager import SUPPORTED_RESOLUTIONS # noqa: E402
+from core.pak_format import ( # noqa: E402
+    CODECS, PIXEL_FORMAT, PakFormatError, PakIntegrityError, PakWriter, decode_payload, encode_payload, is_pak_file
+)
+from core.asset_manager import PakFile # noqa: E402
+from core.pak_patch import apply_patch, make_patch # noqa: E402
+
+
+# Source folders the codec report can sample, by name
+REPORT_SOURCES = {
+    "illustration": lambda: sorted((assets_root() / "illustration").glob("*.png")),
+    "sprite": lambda: sorted((assets_root() / "sprite").glob("*.png")),
+    "scene": lambda: sorted((assets_root() / "scene").glob("*.json")),
+    "locale": lambda: sorted(locale_dir().glob("*.json")),
+}
+
+
+def default_paks() -> list[Path]:
+    return sorted(assets_root().glob("*.pak")) + sorted(asset_overlay().glob("*.pak")) + sorted(locale_dir().glob("*.pak"))
+
+
+def split_entries(pak: PakFile, chunks: int) -> list[list[str]]:
+    """
+    Split the entries into chunks of roughly equal stored size, largest entries first.
+    """
+    bins: list[tuple[int, list[str]]] = [(0, []) for _ in range(max(1, chunks))]
+    for entry in sorted(pak.entries.values(), key=lambda e: (-e.length, e.name)):
+        idx = min(range(len(bins)), key=lambda i: bins[i][0])
+        total, names = bins[idx]
+        names.append(entry.name)
+        bins[idx] = (total + entry.length, names)
+    return [names for _, names in bins if names]
+
+
+def verify_entries(path: str, names: list[str], strong: bool) -> list[str]:
+    """
+    Verify the given entries of a pak. Runs inside worker processes.
+
+    :return list: Error messages of the corrupt entries.
+    """
+    pak = PakFile(path)
+    errors: list[str] = []
+    try:
+        for name in names:
+            try:
+                pak.verify(name, strong)
+            except PakIntegrityError as e:
+                errors.append(str(e))
+    finally:
+        pak.close()
+    return errors
+
+
+def verify_pak(path: Path, pool: Executor | None, jobs: int, strong: bool) -> bool:
+    """
+    Verify every entry of one pak and print a report.
+
+    :return bool: True when the pak is intact.
+    """
+    if not path.exists():
+        print(f"[{path.name}] missing")
+        return False
+    if not is_pak_file(path):
+        print(f"[{path.name}] legacy format, no checksums to verify")
+        return True
+
+    started_at = time.perf_counter()
+    try:
+        pak = PakFile(path)
+    except PakFormatError as e:
+        print(f"[{path.name}] unreadable: {e}")
+        return False
+
+    entry_count = len(pak)
+    stored_mb = sum(entry.length for entry in pak.entries.values()) / (1024 * 1024)
+    chunks = split_entries(pak, jobs)
+    pak.close()
+
+    if pool is None:
+        errors = [error for names in chunks for error in verify_entries(str(path), names, strong)]
+    else:
+        futures = [pool.submit(verify_entries, str(path), names, strong) for names in chunks]
+        errors = [error for future in futures for error in future.result()]
+
+    seconds = time.perf_counter() - started_at
+    status = "OK" if not errors else f"{len(errors)} corrupt"
+    print(f"[{path.name}] {entry_count} entries, {stored_mb:.1f} MB in {seconds:.2f}s "
+          f"({stored_mb / max(seconds, 1e-9):.0f} MB/s) | {status}")
+    for error in sorted(errors):
+        print(f"    ! {error}")
+    return not errors
+
+
+def verify_command(args: argparse.Namespace) -> int:
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        results = [verify_pak(Path(path), pool, jobs, not args.fast) for path in (args.paks or default_paks())]
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return 0 if all(results) else 1
+
+
+def sample_files(paths: list[Path], sample: int) -> list[Path]:
+    # Evenly spaced so the sample doesn't depend on how the files happen to be named
+    if sample <= 0 or len(paths) <= sample:
+        return paths
+    step = len(paths) / sample
+    return [paths[int(i * step)] for i in range(sample)]
+
+
+def measure_codec(sources: list[bytes], codec: str, repeat: int) -> tuple[int, float, float]:
+    """
+    Encode and decode every source with one codec.
+
+    :return tuple: (stored bytes, encode seconds, best decode seconds over repeat runs)
+    """
+    started_at = time.perf_counter()
+    payloads = [encode_payload(data, codec) for data in sources]
+    encode_seconds = time.perf_counter() - started_at
+
+    decode_seconds = float("inf")
+    for _ in range(max(1, repeat)):
+        started_at = time.perf_counter()
+        for payload in payloads:
+            decode_payload(payload, codec)
+        decode_seconds = min(decode_seconds, time.perf_counter() - started_at)
+
+    return sum(len(payload) for payload in payloads), encode_seconds, decode_seconds
+
+
+def codecs_command(args: argparse.Namespace) -> int:
+    for category in args.categories or sorted(REPORT_SOURCES):
+        paths = sample_files(REPORT_SOURCES[category](), args.sample)
+        if not paths:
+            print(f"[{category}] no sources")
+            continue
+
+        sources = [path.read_bytes() for path in paths]
+        source_bytes = sum(len(data) for data in sources)
+        source_mb = source_bytes / (1024 * 1024)
+        print(f"[{category}] {len(paths)} file(s), {source_bytes / 1024:.1f} KB")
+        print(f"    {'codec':<6} {'stored KB':>12} {'ratio':>7} {'encode MB/s':>12} {'decode MB/s':>12}")
+
+        for codec in args.codecs:
+            stored, encode_seconds, decode_seconds = measure_codec(sources, codec, args.repeat)
+            # "raw" decodes to the stored bytes themselves; there is nothing to time
+            decode_speed = "zero-copy" if codec == "raw" else f"{source_mb / max(decode_seconds, 1e-9):.1f}"
+            encode_speed = "-" if codec == "raw" else f"{source_mb / max(encode_seconds, 1e-9):.1f}"
+            print(f"    {codec:<6} {stored / 1024:>12.1f} {stored / max(source_bytes, 1):>7.3f} "
+                  f"{encode_speed:>12} {decode_speed:>12}")
+    return 0
+
+
+class EntryProfile(NamedTuple):
+    pak: str
+    name: str
+    codec: str
+    stored: int
+    size: int
+    decode_seconds: float  # Payload decode plus image decode, best of the runs
+    dimensions: tuple[int, int] | None
+
+    @property
+    def ratio(self) -> float:
+        return self.stored / max(self.size, 1)
+
+    @property
+    def surface_bytes(self) -> int:
+        # What the decoded image takes once converted to a 32-bit surface
+        return self.dimensions[0] * self.dimensions[1] * 4 if self.dimensions else 0
+
+
+INSPECT_SORT_KEYS = {
+    "stored": lambda p: p.stored,
+    "size": lambda p: p.size,
+    "ratio": lambda p: p.ratio,
+    "decode": lambda p: p.decode_seconds,
+    "surface": lambda p: p.surface_bytes,
+    "name": lambda p: p.name,
+}
+
+
+def profile_entry(pak: PakFile, name: str, repeat: int) -> EntryProfile:
+    entry = pak.entry(name)
+    is_image = pak.filetype == "png" and not name.startswith("atlas/frames")
+
+    best = float("inf")
+    dimensions = None
+    for _ in range(max(1, repeat)):
+        started_at = time.perf_counter()
+        data = decode_payload(pak.read_stored(name), entry.codec)
+        if is_image and "pixels" in entry.meta:
+            # Raw pixels are wrapped, not decoded, the same way SceneManager.load_image does
+            dimensions = pygame.image.frombuffer(data, tuple(entry.meta["image_size"]), entry.meta["pixels"]).get_size()
+        elif is_image:
+            dimensions = pygame.image.load(io.BytesIO(data)).get_size()
+        best = min(best, time.perf_counter() - started_at)
+
+    return EntryProfile(pak.path.name, name, entry.codec, entry.length, entry.size, best, dimensions)
+
+
+def inspect_command(args: argparse.Namespace) -> int:
+    profiles: list[EntryProfile] = []
+    failed = False
+    for path in args.paks or default_paks():
+        if not path.exists():
+            print(f"[{path.name}] missing")
+            failed = True
+            continue
+        try:
+            if not is_pak_file(path):
+                print(f"[{path.name}] legacy format, nothing to inspect")
+                continue
+            pak = PakFile(path)
+            try:
+                pak_profiles = [profile_entry(pak, name, args.repeat) for name in pak.names()]
+            finally:
+                pak.close()
+        except (OSError, PakFormatError) as e:
+            print(f"[{path.name}] unreadable: {e}")
+            failed = True
+            continue
+
+        # Entries sharing one deduplicated payload count once in the stored total
+        stored = path.stat().st_size
+        size = sum(p.size for p in pak_profiles)
+        decode = sum(p.decode_seconds for p in pak_profiles)
+        print(f"[{path.name}] {len(pak_profiles)} entries, {stored / (1024 * 1024):.1f} MB stored, "
+              f"{size / (1024 * 1024):.1f} MB decoded, {decode:.2f}s to decode everything")
+        profiles += pak_profiles
+
+    profiles.sort(key=INSPECT_SORT_KEYS[args.sort], reverse=args.sort != "name")
+    if args.top > 0:
+        profiles = profiles[:args.top]
+
+    print(f"{'pak':<24} {'entry':<36} {'codec':<6} {'stored KB':>10} {'decoded KB':>11} {'ratio':>6} "
+          f"{'decode ms':>10} {'dimensions':>11} {'surface MB':>11}")
+    for p in profiles:
+        dimensions = f"{p.dimensions[0]}x{p.dimensions[1]}" if p.dimensions else "-"
+        print(f"{p.pak:<24} {p.name:<36} {p.codec:<6} {p.stored / 1024:>10.1f} {p.size / 1024:>11.1f} "
+              f"{p.ratio:>6.3f} {p.decode_seconds * 1000:>10.2f} {dimensions:>11} {p.surface_bytes / (1024 * 1024):>11.2f}")
+    return 1 if failed else 0
+
+
+def time_best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started_at = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+def pixels_command(args: argparse.Namespace) -> int:
+    # convert() needs a display; a hidden one has the same pixel format as a real window
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    paths = sample_files(REPORT_SOURCES["illustration"](), args.sample)
+    sources = [pygame.image.load(path).convert() for path in paths]
+    print(f"[illustration] {len(paths)} file(s), load + convert() per image, best of {args.repeat}")
+    print(f"    {'size':<10} {'encoding':<12} {'stored KB':>10} {'load ms':>9} {'speedup':>8}")
+
+    for size in sorted(SUPPORTED_RESOLUTIONS):
+        scaled = [pygame.transform.smoothscale(surface, size) for surface in sources]
+        encodings: dict[str, list[bytes]] = {"png": [], "raw": []}
+        for surface in scaled:
+            buffer = io.BytesIO()
+            pygame.image.save(surface, buffer, "png")
+            encodings["png"].append(buffer.getvalue())
+            encodings["raw"].append(pygame.image.tobytes(surface, PIXEL_FORMAT))
+        encodings["raw+zlib"] = [encode_payload(data, "zlib") for data in encodings["raw"]]
+
+        loaders = {
+            "png": lambda data: pygame.image.load(io.BytesIO(data)).convert(),
+            "raw": lambda data: pygame.image.frombuffer(memoryview(data), size, PIXEL_FORMAT).convert(),
+            "raw+zlib": lambda data: pygame.image.frombuffer(decode_payload(data, "zlib"), size, PIXEL_FORMAT).convert(),
+        }
+        png_seconds = 0.0
+        for encoding, payloads in encodings.items():
+            seconds = sum(time_best(lambda: loaders[encoding](data), args.repeat) for data in payloads) / len(payloads)
+            png_seconds = png_seconds or seconds
+            stored = sum(len(data) for data in payloads) / len(payloads)
+            print(f"    {f'{size[0]}x{size[1]}':<10} {encoding:<12} {stored / 1024:>10.1f} "
+                  f"{seconds * 1000:>9.2f} {png_seconds / max(seconds, 1e-9):>7.1f}x")
+    return 0
+
+
+def diff_command(args: argparse.Namespace) -> int:
+    started_at = time.perf_counter()
+    try:
+        stats = make_patch(args.base, args.target, args.output)
+    except PakFormatError as e:
+        print(f"[{args.output.name}] not written: {e}")
+        return 1
+
+    target_mb = args.target.stat().st_size / (1024 * 1024)
+    patch_mb = args.output.stat().st_size / (1024 * 1024)
+    print(f"[{args.output.name}] {stats.added} added, {stats.changed} changed, {stats.removed} removed, "
+          f"{stats.unchanged} unchanged ({stats.copied} reusing base payloads)")
+    print(f"    {patch_mb:.2f} MB patch for a {target_mb:.1f} MB pak "
+          f"({patch_mb / max(target_mb, 1e-9):.1%}) in {time.perf_counter() - started_at:.2f}s")
+    return 0
+
+
+def apply_command(args: argparse.Namespace) -> int:
+    output = args.output or args.base
+    started_at = time.perf_counter()
+    try:
+        entry_count = apply_patch(args.base, args.patch, output)
+    except PakFormatError as e:
+        print(f"[{output.name}] not patched: {e}")
+        return 1
+    print(f"[{output.name}] patched, {entry_count} entries in {time.perf_counter() - started_at:.2f}s")
+    return 0
+
+
+def pack_command(args: argparse.Namespace) -> int:
+    paths = sorted(path for path in args.folder.iterdir() if path.is_file())
+    if not paths:
+        print(f"[{args.folder}] nothing to pack")
+        return 1
+
+    output = args.output or asset_overlay(f"{args.folder.name}.{args.category}.pak")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    filetype = paths[0].suffix.lstrip(".")
+    with PakWriter(output, args.category, filetype, datetime.datetime.now().isoformat()) as writer:
+        writer.meta["priority"] = args.priority
+        for path in paths:
+            # PNG is already compressed; scenes stay JSON and are compiled when loaded
+            writer.add(path.stem, path.read_bytes(), "raw" if path.suffix == ".png" else "zlib", filename=path.name)
+    print(f"[{output.name}] {len(writer.entries)} {args.category} entries at priority {args.priority}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect and check built .pak files.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    verify_parser = subparsers.add_parser("verify", help="check every entry against its build-time checksums")
+    verify_parser.add_argument("paks", nargs="*", help="paks to verify (default: every asset and locale pak)")
+    verify_parser.add_argument("--fast", action="store_true", help="only compare CRC32, skip the BLAKE2b digests")
+    verify_parser.add_argument(
+        "-j", "--jobs", type=int, default=0,
+        help="worker processes (0: one per CPU core, default: 0)"
+    )
+    verify_parser.set_defaults(func=verify_command)
+
+    codecs_parser = subparsers.add_parser(
+        "codecs", help="measure stored size and decode speed of every codec on the asset sources"
+    )
+    codecs_parser.add_argument(
+        "categories", nargs="*", choices=sorted(REPORT_SOURCES), default=None,
+        help="source folders to measure (default: all)"
+    )
+    codecs_parser.add_argument(
+        "--codecs", nargs="+", choices=sorted(CODECS), default=sorted(CODECS),
+        help="codecs to compare (default: all)"
+    )
+    codecs_parser.add_argument(
+        "--sample", type=int, default=16,
+        help="files measured per folder, evenly spaced (0: every file, default: 16)"
+    )
+    codecs_parser.add_argument("--repeat", type=int, default=3, help="decode runs, the fastest counts (default: 3)")
+    codecs_parser.set_defaults(func=codecs_command)
+
+    inspect_parser = subparsers.add_parser(
+        "inspect", help="list entries with their sizes, codec, decode time and image dimensions"
+    )
+    inspect_parser.add_argument("paks", nargs="*", type=Path, help="paks to inspect (default: every asset and locale pak)")
+    inspect_parser.add_argument(
+        "--sort", choices=sorted(INSPECT_SORT_KEYS), default="stored",
+        help="sort entries by this column, heaviest first (default: stored)"
+    )
+    inspect_parser.add_argument("--top", type=int, default=0, help="only list the first N entries (0: all, default: 0)")
+    inspect_parser.add_argument("--repeat", type=int, default=1, help="decode runs per entry, the fastest counts (default: 1)")
+    inspect_parser.set_defaults(func=inspect_command)
+
+    pixels_parser = subparsers.add_parser(
+        "pixels", help="compare PNG decoding with raw pixel payloads (build_assets.py --pixels) per resolution"
+    )
+    pixels_parser.add_argument(
+        "--sample", type=int, default=8,
+        help="illustrations measured, evenly spaced (0: every file, default: 8)"
+    )
+    pixels_parser.add_argument("--repeat", type=int, default=3, help="load runs per image, the fastest counts (default: 3)")
+    pixels_parser.set_defaults(func=pixels_command)
+
+    diff_parser = subparsers.add_parser(
+        "diff", help="write a patch holding only what changed between two builds of a pak"
+    )
+    diff_parser.add_argument("base", type=Path, help="pak the players have")
+    diff_parser.add_argument("target", type=Path, help="new build of the same pak")
+    diff_parser.add_argument("-o", "--output", type=Path, required=True, help="patch file to write")
+    diff_parser.set_defaults(func=diff_command)
+
+    apply_parser = subparsers.add_parser("apply", help="apply a patch written by diff")
+    apply_parser.add_argument("base", type=Path, help="pak the patch was made against")
+    apply_parser.add_argument("patch", type=Path, help="patch to apply")
+    apply_parser.add_argument(
+        "-o", "--output", type=Path, default=None,
+        help="where to write the patched pak (default: update the base in place)"
+    )
+    apply_parser.set_defaults(func=apply_command)
+
+    pack_parser = subparsers.add_parser(
+        "pack", help="pack a folder of assets into an overlay pak (DLC, mods) mounted over the base pak"
+    )
+    pack_parser.add_argument("category", choices=("illustration", "sprite", "scene"), help="category the overlay extends")
+    pack_parser.add_argument("folder", type=Path, help="folder of files named like the entries they add or replace")
+    pack_parser.add_argument(
+        "-o", "--output", type=Path, default=None,
+        help="pak to write (default: assets/overlay/<folder>.<category>.pak)"
+    )
+    pack_parser.add_argument(
+        "--priority", type=int, default=0,
+        help="layer priority, higher wins and ties go to the overlay; the base pak is 0 (default: 0)"
+    )
+    pack_parser.set_defaults(func=pack_command)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,18 @@
 import os
 import io
+import mmap
 import datetime
 import json
 import zlib
 import base64
+import threading
 
-from typing import Union, TypedDict, NotRequired
-from core.path_resolver import assets_root
+from collections.abc import Hashable
+from pathlib import Path
+from typing import Any, Iterator, Protocol, Union, TypedDict, NotRequired
+from core.path_resolver import asset_overlay, assets_root
+from core.chapter_manifest import load_chapter_shards, shard_pak_name
+from core.pak_format import PakEntry, decode_payload, is_pak_file, read_index, verify_payload
 
 
 class AssetPak(TypedDict):
@@ -16,58 +22,390 @@ class AssetPak(TypedDict):
     entries: dict[str, NotRequired[dict[str, str]]]
 
 
-def read_illustration_pak() -> AssetPak:
-    pak_path = assets_root() / "illustration.pak"
+class AssetSource(Protocol):
+    """Read-only view over the entries of one asset category."""
+    category: str
 
-    if not os.path.exists(pak_path):
-        raise FileExistsError
+    def __contains__(self, name: object) -> bool: ...
+    def names(self) -> Iterator[str]: ...
+    def read(self, name: str) -> Any: ...
+    def content_key(self, name: str) -> Hashable: ...
+    def entry_meta(self, name: str) -> dict[str, Any]: ...
+    def drop_stored(self, name: str) -> None: ...
+    def close(self) -> None: ...
 
-    with pak_path.open("rb") as reader:
-        pak_data = json.loads(
-            zlib.decompress(
-                base64.b64decode(reader.read())
-            ),
-        )
-    return AssetPak(
-        category = pak_data["category"],
-        built_at = datetime.datetime.now().fromisoformat(pak_data["built_at"]),
-        header = {
-            "filetype": pak_data["header"]["filetype"],
-            "count": int(pak_data["header"]["count"])
-        },
-        entries = {
-            pk: pv for pk, pv in pak_data["entries"].items()
-        }
-    )
 
-def read_sprite_pak() -> AssetPak:
-    pak_path = assets_root() / "sprite.pak"
+class PakFile:
+    """
+    Memory-mapped view of an indexed binary .pak (see core.pak_format).
+    Opening costs O(index); reading an entry costs O(entry size).
+    Each entry is checked against its CRC32 the first time it is read.
+    """
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
 
-    if not os.path.exists(pak_path):
-        raise FileExistsError
+        with open(self.path, "rb") as reader:
+            self._mmap = mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
 
-    with pak_path.open("rb") as reader:
-        pak_data = json.loads(
-            zlib.decompress(
-                base64.b64decode(reader.read())
-            ),
+        self.meta, self.entries = read_index(self._view)
+        self.category: str = self.meta["category"]
+        self.filetype: str = self.meta["filetype"]
+        self.built_at = datetime.datetime.fromisoformat(self.meta["built_at"])
+        self._verified: set[str] = set()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def names(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def entry(self, name: str) -> PakEntry:
+        return self.entries[name]
+
+    def read_stored(self, name: str) -> memoryview:
+        """
+        Return the stored (still encoded) payload as a zero-copy slice of the mapping.
+        """
+        entry = self.entries[name]
+        return self._view[entry.offset:entry.offset + entry.length]
+
+    def read(self, name: str) -> Any:
+        """
+        Return the decoded payload. Entries stored with the "raw" codec come back
+        as a memoryview over the mapping without copying.
+
+        :raise PakIntegrityError: The stored payload is corrupt.
+        """
+        payload = self.read_stored(name)
+        if name not in self._verified:
+            self.verify(name)
+        return decode_payload(payload, self.entries[name].codec)
+
+    def verify(self, name: str, strong: bool = False) -> None:
+        """
+        Check one entry against the checksums recorded at build time.
+
+        :param strong: Also compare the BLAKE2b digest, not only the CRC32.
+        :raise PakIntegrityError: The stored payload is corrupt.
+        """
+        verify_payload(self.entries[name], self.read_stored(name), strong)
+        self._verified.add(name)
+
+    def content_key(self, name: str) -> Hashable:
+        """
+        Key identifying the decoded content of an entry: names sharing one payload share the key.
+        """
+        entry = self.entries[name]
+        if not entry.digest:  # Built before digests were recorded
+            return (self.path, name)
+        return (entry.codec, entry.digest)
+
+    def entry_meta(self, name: str) -> dict[str, Any]:
+        """
+        Build-time metadata of an entry, e.g. "image_size" or the "pixels" format of raw pixel payloads.
+        """
+        return self.entries[name].meta
+
+    def drop_stored(self, name: str) -> None:
+        """
+        Hint the OS that the stored pages of a decoded entry are no longer needed.
+        Raw entries are skipped for their decoded form still points into the mapping.
+        """
+        entry = self.entries[name]
+        if entry.codec == "raw" or not hasattr(mmap, "MADV_DONTNEED"):
+            return
+
+        # madvise needs a page-aligned start; neighbours are simply paged in again when touched
+        start = entry.offset - entry.offset % mmap.PAGESIZE
+        self._mmap.madvise(mmap.MADV_DONTNEED, start, entry.offset + entry.length - start)
+
+    def close(self) -> None:
+        """
+        Unmap the pak. Raw reads still referenced keep the mapping alive; it is
+        unmapped once the last of them is dropped.
+        """
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Raw payloads still export the mapping; the mmap unmaps itself when it is collected
+            pass
+
+
+class LegacyPak:
+    """
+    Adapter exposing a legacy base64(zlib(JSON)) AssetPak through the AssetSource interface.
+    """
+    def __init__(self, pak: AssetPak, path: Path | None = None) -> None:
+        """
+        :param path: File the pak was read from, None for paks built in memory.
+        """
+        self.pak = pak
+        self.path = path
+        self.category: str = pak["category"]
+        self.built_at = pak["built_at"]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.pak["entries"]
+
+    def __len__(self) -> int:
+        return len(self.pak["entries"])
+
+    def names(self) -> Iterator[str]:
+        return iter(self.pak["entries"])
+
+    def read(self, name: str) -> bytes:
+        return unpack_encoded_string(self.pak["entries"][name]["encoded_string"])
+
+    def content_key(self, name: str) -> Hashable:
+        # Legacy entries carry no digest, so the key names the pak: an overlay must not share the base's entries
+        return (self.category, self.path, self.built_at, name)
+
+    def entry_meta(self, name: str) -> dict[str, Any]:
+        return {}
+
+    def drop_stored(self, name: str) -> None:
+        # The legacy format can't reload a single entry, so the encoded strings stay
+        return
+
+    def close(self) -> None:
+        return
+
+
+class AssetHandle:
+    """
+    Lazily decoded entry of an asset source.
+    The entry is decoded on first access and kept until its last holder releases it.
+    Prefetch workers may decode it while the main thread unloads it.
+    """
+    def __init__(self, source: AssetSource, name: str) -> None:
+        self.source = source
+        self.name = name
+        self.refcount = 0
+        self._data: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._data is not None
+
+    @property
+    def data(self) -> Any:
+        # The local result stays valid even if unload() runs right after the decode
+        data = self._data
+        if data is None:
+            with self._lock:
+                data = self._data
+                if data is None:
+                    data = self._data = self.source.read(self.name)
+                    self.source.drop_stored(self.name)
+        return data
+
+    def iofile(self) -> io.BytesIO:
+        return io.BytesIO(self.data)
+
+    def acquire(self) -> "AssetHandle":
+        self.refcount += 1
+        return self
+
+    def release(self) -> None:
+        self.refcount = max(0, self.refcount - 1)
+        if self.refcount == 0:
+            self.unload()
+
+    def unload(self) -> None:
+        """
+        Drop the decoded form; it is decoded again on next access.
+        """
+        self._data = None
+
+
+class ShardedPak:
+    """
+    One asset category split into a base pak and per-chapter shards (see core.chapter_manifest).
+    The entry -> shard map comes from the manifest, so a shard is only opened
+    when one of its entries is first used; a missing shard only fails then.
+    """
+    def __init__(self, category: str, base: PakFile | LegacyPak, shards: dict[str, str]) -> None:
+        """
+        :param base: Source of the entries not moved to a shard.
+        :param shards: Entry name -> chapter of the shard holding it.
+        """
+        self.category = category
+        self.base = base
+        self.shards = shards
+        self._opened: dict[str, PakFile | LegacyPak] = {}
+        self._lock = threading.Lock()  # Prefetch workers may open a shard concurrently
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.shards or name in self.base
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.shards)
+
+    def names(self) -> Iterator[str]:
+        yield from self.base.names()
+        yield from self.shards
+
+    @property
+    def opened_shards(self) -> list[str]:
+        return list(self._opened)
+
+    def source_of(self, name: str) -> PakFile | LegacyPak:
+        """
+        Return the pak holding the entry, opening its shard on first use.
+        """
+        chapter = self.shards.get(name)
+        if chapter is None:
+            return self.base
+
+        shard = self._opened.get(chapter)
+        if shard is None:
+            with self._lock:
+                shard = self._opened.get(chapter)
+                if shard is None:
+                    shard = self._opened[chapter] = _open_pak_file(assets_root() / shard_pak_name(self.category, chapter))
+        return shard
+
+    def read(self, name: str) -> Any:
+        return self.source_of(name).read(name)
+
+    def content_key(self, name: str) -> Hashable:
+        return self.source_of(name).content_key(name)
+
+    def entry_meta(self, name: str) -> dict[str, Any]:
+        return self.source_of(name).entry_meta(name)
+
+    def drop_stored(self, name: str) -> None:
+        self.source_of(name).drop_stored(name)
+
+    def close(self) -> None:
+        self.base.close()
+        for shard in self._opened.values():
+            shard.close()
+        self._opened.clear()
+
+
+class PakStack:
+    """
+    Sources of one category layered by priority, e.g. DLC and mods over the base pak.
+    Every entry is read from the highest layer holding it; on equal priority the
+    layer mounted last wins. The name -> layer index is merged once per mount, so
+    a lookup is one dict access however many layers are mounted, and entries
+    overridden by a higher layer are never read.
+    """
+    def __init__(self, category: str, base: AssetSource) -> None:
+        self.category = category
+        self.base = base
+        self.layers: list[tuple[int, int, AssetSource]] = []  # (priority, mount order, source), lowest first
+        self._index: dict[str, AssetSource] = {}
+        self._mounted = 0
+        self.mount(base)
+
+    def mount(self, source: AssetSource, priority: int = 0) -> None:
+        self.layers.append((priority, self._mounted, source))
+        self._mounted += 1
+        self.layers.sort(key=lambda layer: layer[:2])
+        self._merge_index()
+
+    def unmount(self, source: AssetSource) -> None:
+        """
+        Remove a layer and close it; the entries it overrode are visible again.
+        """
+        self.layers = [layer for layer in self.layers if layer[2] is not source]
+        self._merge_index()
+        source.close()
+
+    def _merge_index(self) -> None:
+        # Higher layers are merged last so they overwrite the names they share with lower ones
+        self._index = {name: source for _, _, source in self.layers for name in source.names()}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def names(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def source_of(self, name: str) -> AssetSource:
+        """
+        Return the layer the entry is read from.
+        """
+        return self._index[name]
+
+    def read(self, name: str) -> Any:
+        return self._index[name].read(name)
+
+    def content_key(self, name: str) -> Hashable:
+        return self._index[name].content_key(name)
+
+    def entry_meta(self, name: str) -> dict[str, Any]:
+        return self._index[name].entry_meta(name)
+
+    def drop_stored(self, name: str) -> None:
+        self._index[name].drop_stored(name)
+
+    def close(self) -> None:
+        for _, _, source in self.layers:
+            source.close()
+        self.layers.clear()
+        self._index.clear()
+
+
+def open_overlays(category: str) -> list[tuple[int, PakFile]]:
+    """
+    Open the overlay paks of a category found in assets/overlay.
+    An overlay's priority is the "priority" of its index (default 0); overlays of
+    equal priority are returned in file name order, so later names take precedence.
+
+    :return list: (priority, pak) pairs in mount order.
+    """
+    overlays: list[tuple[int, PakFile]] = []
+    for pak_path in sorted(asset_overlay().glob("*.pak")):
+        if not is_pak_file(pak_path):
+            continue
+        pak = PakFile(pak_path)
+        if pak.category != category:
+            pak.close()
+            continue
+        overlays.append((int(pak.meta.get("priority", 0)), pak))
+    return sorted(overlays, key=lambda overlay: overlay[0])
+
+
+def open_pak(category: str) -> PakFile | LegacyPak | ShardedPak:
+    """
+    Open the base pak of the given category, picking the reader from the file contents.
+    Categories split into chapter shards are returned as one ShardedPak.
+    Overlays are mounted on top by the caller, see open_overlays.
+
+    :param category: e.g. 'illustration', 'sprite', 'scene'
+    :return PakFile | LegacyPak | ShardedPak: Indexed pak when available, legacy adapter otherwise.
+    """
+    base = _open_pak_file(assets_root() / shard_pak_name(category, None))
+    shards = load_chapter_shards().get(category)
+    if shards and isinstance(base, PakFile):
+        return ShardedPak(category, base, shards)
+    return base
+
+
+def _open_pak_file(pak_path: Path) -> PakFile | LegacyPak:
+    if not os.path.exists(pak_path):
+        raise FileNotFoundError(
+            f"Can't find asset {pak_path.name}.\nPlease check file integrity."
         )
-    return AssetPak(
-        category = pak_data["category"],
-        built_at = datetime.datetime.now().fromisoformat(pak_data["built_at"]),
-        header = {
-            "filetype": pak_data["header"]["filetype"],
-            "count": int(pak_data["header"]["count"])
-        },
-        entries = {
-            pk: pv for pk, pv in pak_data["entries"].items()
-        }
-    )
 
+    if is_pak_file(pak_path):
+        return PakFile(pak_path)
+    return LegacyPak(_read_legacy_pak(pak_path), pak_path)
 
-def read_scene_pak() -> AssetPak:
-    pak_path = assets_root() / "scene.pak"
 
+def _read_legacy_pak(pak_path: Path) -> AssetPak:
     if not os.path.exists(pak_path):
         raise FileExistsError
 
@@ -89,5 +427,14 @@ def read_scene_pak() -> AssetPak:
         }
     )
 
+def read_illustration_pak() -> AssetPak:
+    return _read_legacy_pak(assets_root() / "illustration.pak")
+
+def read_sprite_pak() -> AssetPak:
+    return _read_legacy_pak(assets_root() / "sprite.pak")
+
+def read_scene_pak() -> AssetPak:
+    return _read_legacy_pak(assets_root() / "scene.pak")
+
 def unpack_encoded_string(encoded_string: str) -> bytes:
-    return base64.b64decode(encoded_string)
\ No newline at end of file
+    return base64.b64decode(encoded_string)
@@ -0,0 +1,143 @@
+import threading
+import pygame
+
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from core.pak_format import PakFormatError
+from core.scene.DialogueStructure import ChangeDialogueScene, DialogueScript, SetBackground, ShowCharacter
+from core.surface_cache import SurfaceKey
+if TYPE_CHECKING: # Prevent exception of circular import
+    from core.scene.SceneManager import SceneManager
+
+
+class AssetPrefetcher:
+    """
+    Decode and scale the surfaces upcoming dialogue steps need on worker threads,
+    so they are already in the surface cache when the action runs.
+    """
+    def __init__(self, scene_manager: "SceneManager", lookahead: int = 4, workers: int = 1) -> None:
+        self.sm = scene_manager
+        self.lookahead = max(0, lookahead)
+
+        # workers == 0 disables prefetching entirely
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch") if workers > 0 else None
+        self._pending: dict[SurfaceKey, Future] = {}
+        self._lock = threading.Lock()  # Guards _pending and the counters below, which workers update too
+
+        self.scheduled = 0
+        self.completed = 0
+        self.failed = 0
+        self.late = 0  # Actions that executed before their prefetch completed
+
+    def schedule(self, key: SurfaceKey, build: Callable[[], pygame.Surface]) -> None:
+        """
+        Build the surface on a worker unless it is already cached or in flight.
+        """
+        if self._executor is None or key in self.sm.surface_cache:
+            return
+
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending[key] = self._executor.submit(self._run, key, build)
+            self.scheduled += 1
+
+    def submit[T](self, job: Callable[..., T], *args) -> Future[T] | None:
+        """
+        Run any other loading job on the prefetch workers. Returns None when prefetching is disabled.
+        """
+        if self._executor is None:
+            return None
+        return self._executor.submit(job, *args)
+
+    def wait(self, key: SurfaceKey) -> pygame.Surface | None:
+        """
+        Block until an in-flight prefetch of the key finishes and return its surface.
+        Returns None when the key was never scheduled or the prefetch failed.
+        """
+        with self._lock:
+            future = self._pending.get(key)
+        if future is None:
+            return None
+
+        if not future.done():
+            with self._lock:
+                self.late += 1
+        try:
+            return future.result()
+        except (OSError, PakFormatError, pygame.error):
+            # Let the caller rebuild it synchronously and surface the error there
+            return None
+
+    def prefetch_steps(self, dialogue_data: DialogueScript, start_step: int) -> None:
+        """
+        Scan steps [start_step, start_step + lookahead) for set_background, show_character
+        and change_dialogue_scene, and schedule the surfaces they will need.
+        """
+        if self._executor is None or self.lookahead == 0:
+            return
+
+        window_size = self.sm.screen.get_size()
+        sprite_scales = {
+            c.id: (c.sprite_filename, self.sm.uniform_scale * c.scale)
+            for c in dialogue_data.characters
+        }
+
+        for step in dialogue_data.steps[start_step:start_step + self.lookahead]:
+            for action in step.actions:
+                match action:
+                    case SetBackground(filename, blur) if filename is not None:
+                        self.sm.prefetch_illustration(filename, window_size, blur)
+                    case ShowCharacter(character_id):
+                        sprite = sprite_scales.get(character_id)
+                        if sprite is not None:
+                            self.sm.prefetch_sprite(*sprite)
+                    case ChangeDialogueScene(branches):
+                        for branch in branches:
+                            self._prefetch_scene_entry(branch.scene_id, window_size)
+
+    def _prefetch_scene_entry(self, scene_id: str, window_size: tuple[int, int]) -> None:
+        # What a freshly entered DialogueScene loads: every character and the opening backgrounds
+        try:
+            scene_data = self.sm.get_scene_data(scene_id)
+        except (KeyError, FileNotFoundError):  # Unknown scene, or its chapter shard isn't installed
+            return
+
+        for c in scene_data.characters:
+            self.sm.prefetch_sprite(c.sprite_filename, self.sm.uniform_scale * c.scale)
+
+        for step in scene_data.steps[:self.lookahead]:
+            for action in step.actions:
+                if isinstance(action, SetBackground) and action.filename is not None:
+                    self.sm.prefetch_illustration(action.filename, window_size, action.blur)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "scheduled": self.scheduled,
+                "completed": self.completed,
+                "failed": self.failed,
+                "in_flight": len(self._pending),
+                "late": self.late,
+            }
+
+    def _run(self, key: SurfaceKey, build: Callable[[], pygame.Surface]) -> pygame.Surface:
+        try:
+            surface = build()
+            self.sm.surface_cache.put(key, surface)
+            return surface
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+                self.completed += 1
@@ -0,0 +1,83 @@
+"""
+Chapter manifest written by scripts/build_assets.py.
+
+Scenes declare the chapter they open with an optional "chapter" field; scenes
+without one inherit the chapter of the first scene leading to them through
+change_dialogue_scene. The manifest records what every scene and chapter
+reaches:
+
+    {
+        "version": 1,
+        "scenes":   {scene: {"chapter", "illustrations", "sprites", "next"}},
+        "chapters": {chapter: {"scenes", "illustrations", "sprites"}},
+        "shards":   {category: {entry name: chapter}}
+    }
+
+Built with --chapters, assets used by a single chapter (and the scenes of that
+chapter) are moved out of <category>.pak into <category>.<chapter>.pak.
+"shards" maps every moved entry to its shard so the runtime knows where an
+entry lives without opening any shard.
+"""
+import re
+import json
+
+from pathlib import Path
+from typing import Any
+
+from core.path_resolver import assets_root
+from core.scene.DialogueStructure import ChangeDialogueScene, DialogueScript, SetBackground
+
+
+CHAPTER_MANIFEST_VERSION = 1
+
+# Chapter names end up in file names
+CHAPTER_NAME = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def chapter_manifest_path() -> Path:
+    return assets_root() / "chapters.json"
+
+
+def shard_pak_name(category: str, chapter: str | None) -> str:
+    """
+    File name of the pak holding a chapter's share of a category; None is the base pak.
+    """
+    return f"{category}.{chapter}.pak" if chapter is not None else f"{category}.pak"
+
+
+def scene_references(script: DialogueScript) -> tuple[set[str], set[str], list[str]]:
+    """
+    Assets and scenes a scene refers to.
+
+    :return tuple: (illustration names, sprite names, next scene ids)
+    """
+    illustrations: set[str] = set()
+    next_scenes: list[str] = []
+    for step in script.steps:
+        for action in step.actions:
+            match action:
+                case SetBackground(filename) if filename is not None:
+                    illustrations.add(filename)
+                case ChangeDialogueScene(branches):
+                    next_scenes += [branch.scene_id for branch in branches if branch.scene_id not in next_scenes]
+
+    # A scene loads every declared character when it starts, shown or not
+    sprites = {character.sprite_filename for character in script.characters}
+    return illustrations, sprites, next_scenes
+
+
+def load_chapter_shards() -> dict[str, dict[str, str]]:
+    """
+    Read which entries were moved into chapter shards.
+
+    :return dict: Category -> entry name -> chapter. Empty without a manifest or without shards.
+    """
+    try:
+        with chapter_manifest_path().open("r", encoding="utf-8") as reader:
+            manifest: dict[str, Any] = json.load(reader)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+    if manifest.get("version") != CHAPTER_MANIFEST_VERSION:
+        return {}
+    return manifest.get("shards", {})
@@ -43,6 +43,13 @@ DEFAULT_CONFIG = {
         "text_display_speed": 50,
         "autoplay_mode_speed": 50,
         "skip_read_scenes": False
+    },
+    "Performance": {
+        "surface_cache_mb": 256,
+        "prefetch_lookahead": 4,
+        "prefetch_workers": 1,
+        "font_cache_size": 32,
+        "text_cache_mb": 16
     }
 }
 
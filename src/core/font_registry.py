@@ -0,0 +1,105 @@
+import io
+import pygame
+import threading
+
+from collections import OrderedDict
+from enum import IntFlag
+
+type FontKey = tuple[str, int, FontStyle]
+
+
+class FontStyle(IntFlag):
+    NORMAL = 0
+    BOLD = 1
+    ITALIC = 2
+    UNDERLINE = 4
+    STRIKETHROUGH = 8
+
+
+class FontRegistry:
+    """
+    LRU registry of fonts shared by every scene, keyed by (font path, pixel size, style).
+
+    Font files are read once and kept in memory, so a new size or style parses the
+    TTF from memory instead of opening it again. Fonts are shared and must not be
+    restyled; ask for the style instead. Files can be preloaded from worker threads.
+    """
+    def __init__(self, max_fonts: int) -> None:
+        self.max_fonts = max(1, max_fonts)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._fonts: OrderedDict[FontKey, pygame.font.Font] = OrderedDict()
+        self._files: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._fonts)
+
+    def preload(self, path: str) -> bytes:
+        """
+        Read a font file into memory unless it already is.
+
+        :return bytes: The file's content.
+        """
+        with self._lock:
+            data = self._files.get(path)
+        if data is not None:
+            return data
+        with open(path, "rb") as reader:
+            data = reader.read()
+        with self._lock:
+            return self._files.setdefault(path, data)
+
+    def get(self, path: str, size: int, style: FontStyle = FontStyle.NORMAL) -> pygame.font.Font:
+        """
+        Return the shared font, creating it on a miss and evicting the least recently used
+        one beyond max_fonts. Scenes still holding an evicted font keep a working object.
+        """
+        key = (path, size, style)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self.hits += 1
+                self._fonts.move_to_end(key)
+                return font
+            self.misses += 1
+
+        # Every font needs its own stream; the bytes themselves are shared
+        font = pygame.font.Font(io.BytesIO(self.preload(path)), size)
+        font.bold = FontStyle.BOLD in style
+        font.italic = FontStyle.ITALIC in style
+        font.underline = FontStyle.UNDERLINE in style
+        font.strikethrough = FontStyle.STRIKETHROUGH in style
+
+        with self._lock:
+            # Another thread may have created the same font meanwhile; share theirs
+            font = self._fonts.setdefault(key, font)
+            self._fonts.move_to_end(key)
+            while len(self._fonts) > self.max_fonts:
+                self._fonts.popitem(last=False)
+                self.evictions += 1
+        return font
+
+    def invalidate(self, keep_path: str | None = None) -> None:
+        """
+        Forget every font and font file except the ones of keep_path.
+        """
+        with self._lock:
+            self._files = {path: data for path, data in self._files.items() if path == keep_path}
+            for key in [key for key in self._fonts if key[0] != keep_path]:
+                del self._fonts[key]
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "fonts": len(self._fonts),
+            "files": len(self._files),
+            "file_bytes": sum(len(data) for data in self._files.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
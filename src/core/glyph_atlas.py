@@ -0,0 +1,246 @@
+"""
+Glyph atlases for long runs of text such as dialogue and the backlog.
+
+font.render and font.size lay out and rasterize every glyph of a string again
+through FreeType. A GlyphAtlas rasterizes each character of one font in one
+color once, packs it into a shared page and keeps its metrics; lines are then
+measured from the stored advances and composed with a single Surface.fblits,
+so drawing scales with the characters blitted rather than rasterized.
+
+Advances include the font's pair kerning, measured once per pair. Kerning is
+fractional and accumulates along a line while pairs can only be measured to the
+pixel, so lines with kerned pairs (mostly Latin) are laid out and rendered by the
+font itself; lines without (e.g. CJK) are composed and match font.render exactly.
+Atlases are only used from the main thread.
+"""
+import pygame
+
+from collections import OrderedDict
+from typing import NamedTuple
+
+type Color = tuple[int, int, int] | tuple[int, int, int, int]
+type BlitSequence = list[tuple[pygame.Surface, tuple[int, int]]]
+
+PAGE_SIZE = 1024
+MAX_ATLASES = 16
+
+
+class Glyph(NamedTuple):
+    surface: pygame.Surface | None  # View into an atlas page, None for glyphs without ink (spaces)
+    bearing: int                    # Where the glyph's pen origin sits in its cell
+    advance: int
+    extent: int                     # Rightmost pixel relative to the pen origin, at least advance
+
+
+class GlyphAtlas:
+    """
+    Glyphs of one font in one color, rasterized on first use.
+    """
+    def __init__(self, font: pygame.font.Font, color: Color) -> None:
+        self.font = font
+        self.color = color
+        self.height = font.get_height()
+
+        self.pages: list[pygame.Surface] = []
+        self._glyphs: dict[str, Glyph] = {}
+        self._kerning: dict[tuple[str, str], int] = {}
+
+        # Shelf packing cursor; every cell is one line high
+        self._cursor = (0, 0)
+
+    def __len__(self) -> int:
+        return len(self._glyphs)
+
+    def glyph(self, ch: str) -> Glyph:
+        glyph = self._glyphs.get(ch)
+        if glyph is None:
+            glyph = self._glyphs[ch] = self._rasterize(ch)
+        return glyph
+
+    def _rasterize(self, ch: str) -> Glyph:
+        rendered = self.font.render(ch, True, self.color)
+        metrics = self.font.metrics(ch)[0]
+        if metrics is None:
+            # Missing from the font: drawn as whatever render fell back to
+            min_x, max_x, advance = 0, rendered.get_width(), rendered.get_width()
+        else:
+            min_x, max_x, _min_y, _max_y, advance = metrics
+
+        extent = max(max_x, advance)
+        if max_x <= min_x:
+            return Glyph(None, 0, advance, extent)
+        return Glyph(self._pack(rendered), -min(min_x, 0), advance, extent)
+
+    def _pack(self, rendered: pygame.Surface) -> pygame.Surface:
+        w, h = rendered.get_size()
+        x, y = self._cursor
+        if not self.pages or x + w > PAGE_SIZE:
+            x, y = 0, y + self.height
+        if not self.pages or y + h > PAGE_SIZE:
+            page_size = (max(PAGE_SIZE, w), max(PAGE_SIZE, h))
+            self.pages.append(pygame.Surface(page_size, pygame.SRCALPHA))
+            x, y = 0, 0
+
+        page = self.pages[-1]
+        page.blit(rendered, (x, y))
+        self._cursor = (x + w, y)
+        return page.subsurface((x, y, w, h))
+
+    def kerning(self, prev: str, ch: str) -> int:
+        """
+        Pen adjustment between two characters, measured once per pair.
+        Rounded; along a line each kerned pair may drift the pen by less than a pixel.
+        """
+        pair = (prev, ch)
+        kern = self._kerning.get(pair)
+        if kern is None:
+            a, b = self.glyph(prev), self.glyph(ch)
+            unkerned = max(a.advance + b.extent, a.extent) + max(a.bearing, b.bearing - a.advance, 0)
+            kern = self._kerning[pair] = self.font.size(prev + ch)[0] - unkerned
+        return kern
+
+    def layout(self, text: str) -> tuple[BlitSequence, list[int]]:
+        """
+        Place the glyphs of one line. Lines with kerned pairs come from the font
+        as a single rendered line instead.
+
+        :return tuple: (fblits sequence relative to the line's top-left,
+                        width of the line cut after each character)
+        """
+        # Hot loop: cached lookups inline, misses through glyph() and kerning()
+        glyphs, kernings = self._glyphs, self._kerning
+        blits: BlitSequence = []
+        extents: list[int] = []
+        pen = right = 0
+        prev = None
+        kerned = False
+        for ch in text:
+            glyph = glyphs.get(ch) or self.glyph(ch)
+            if prev is None:
+                pen = glyph.bearing
+            else:
+                kern = kernings.get((prev, ch))
+                if kern is None:
+                    kern = self.kerning(prev, ch)
+                pen += kern
+                kerned = kerned or kern != 0
+            if glyph.surface is not None:
+                blits.append((glyph.surface, (pen - glyph.bearing, 0)))
+            if pen + glyph.extent > right:
+                right = pen + glyph.extent
+            extents.append(right)
+            pen += glyph.advance
+            prev = ch
+
+        if kerned:
+            blits = [(self.font.render(text, True, self.color), (0, 0))]
+            extents = [self.font.size(text[:idx + 1])[0] for idx in range(len(text))]
+        return blits, extents
+
+    def size(self, text: str) -> tuple[int, int]:
+        """
+        Like font.size, from the stored metrics.
+        """
+        extents = self.layout(text)[1]
+        return extents[-1] if extents else 0, self.height
+
+    def render(self, text: str) -> pygame.Surface:
+        """
+        Like font.render, composed from atlas cells.
+        """
+        return self.render_layout(*self.layout(text))
+
+    def render_layout(self, blits: BlitSequence, extents: list[int]) -> pygame.Surface:
+        """
+        Compose a line from a layout already made with layout().
+        """
+        surface = pygame.Surface((max(extents[-1] if extents else 0, 1), self.height), pygame.SRCALPHA)
+        surface.fblits(blits)
+        return surface
+
+    def draw(self, dest: pygame.Surface, text: str, pos: tuple[float, float]) -> None:
+        """
+        Draw a line straight onto dest with its top-left at pos.
+        """
+        blits, _ = self.layout(text)
+        x, y = int(pos[0]), int(pos[1])
+        dest.fblits([(surface, (x + gx, y + gy)) for surface, (gx, gy) in blits])
+
+    def wrap(self, text: str, max_width: int) -> list[str]:
+        """
+        Break text into lines no wider than max_width, at any character and at '\\n'.
+        """
+        return [text[start:end] for start, end in self.wrap_spans(text, max_width)]
+
+    def wrap_spans(self, text: str, max_width: int) -> list[tuple[int, int]]:
+        """
+        Like wrap, as (start, end) indices into text. The '\\n' between lines belong to neither.
+        """
+        if not text:
+            return [(0, 0)]
+
+        glyphs, kernings = self._glyphs, self._kerning
+        lines: list[tuple[int, int]] = []
+        start = 0
+        pen = right = 0
+        prev = None
+        kerned = 0  # Kerned pairs on the current line, each may be a pixel off
+
+        for idx, ch in enumerate(text):
+            if ch == "\n":
+                lines.append((start, idx))
+                start, pen, right, prev, kerned = idx + 1, 0, 0, None, 0
+                continue
+
+            glyph = glyphs.get(ch) or self.glyph(ch)
+            if prev is None:
+                ch_pen = glyph.bearing
+            else:
+                kern = kernings.get((prev, ch))
+                if kern is None:
+                    kern = self.kerning(prev, ch)
+                ch_pen = pen + kern
+                kerned += kern != 0
+
+            ch_right = max(right, ch_pen + glyph.extent)
+            if kerned and ch_right > max_width - kerned:
+                # Too close to call from the rounded kerning; ask the font
+                fits = self.font.size(text[start:idx + 1])[0] <= max_width
+            else:
+                fits = ch_right <= max_width
+            if fits:
+                pen, right = ch_pen + glyph.advance, ch_right
+            else:
+                if idx > start:
+                    lines.append((start, idx))
+                start = idx
+                pen, right = glyph.bearing + glyph.advance, glyph.bearing + glyph.extent
+                kerned = 0
+            prev = ch
+
+        if start < len(text):
+            lines.append((start, len(text)))
+
+        return lines
+
+
+_atlases: OrderedDict[tuple[pygame.font.Font, Color], GlyphAtlas] = OrderedDict()
+
+
+def glyph_atlas(font: pygame.font.Font, color: Color) -> GlyphAtlas:
+    """
+    Return the shared atlas of a font and color, keeping the MAX_ATLASES most recently used.
+    """
+    key = (font, color)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = GlyphAtlas(font, color)
+        while len(_atlases) > MAX_ATLASES:
+            _atlases.popitem(last=False)
+    else:
+        _atlases.move_to_end(key)
+    return atlas
+
+
+def clear_glyph_atlases() -> None:
+    _atlases.clear()
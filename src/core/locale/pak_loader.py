@@ -1,18 +1,68 @@
+"""
+Language data built by scripts/build_assets.py.
+
+Every locale .pak is an indexed pak (see core.pak_format) holding one entry,
+"strings": a flat string table mapping the dotted path of every string
+(e.g. "saveSelector.slot_label") to its text, marshalled. Sources are nested
+JSON; they are flattened and validated at build time, so loading is a single
+marshal.loads and every lookup is a single dict access.
+Locales still stored in the legacy base64(zlib(JSON)) format are flattened when loaded.
+"""
 import os
 import json
 import zlib
 import base64
+import marshal
 
-from collections.abc import Mapping
 from typing import Any
 from core.path_resolver import locale_dir
+from core.pak_format import is_pak_file
+from core.asset_manager import PakFile
 
 type LangNode = str | LangDict
 type LangDict = dict[str, LangNode]
 
+STRING_TABLE_ENTRY = "strings"
+STRING_TABLE_FORMAT = 1
 
-class LangData(dict[str, LangNode]):
-    """Nested language dictionary with helper methods."""
+
+def flatten_strings(data: Any) -> dict[str, str]:
+    """
+    Flatten nested language data into dotted paths.
+
+    :raise TypeError: A value is neither a string nor a nested dict.
+    :raise ValueError: A key contains '.', which would make its path ambiguous.
+    """
+    if not isinstance(data, dict):
+        raise TypeError("Language data root must be a dict")
+
+    table: dict[str, str] = {}
+
+    def walk(node: dict, prefix: str) -> None:
+        for key, value in node.items():
+            key = str(key)
+            if "." in key:
+                raise ValueError(f"Invalid key {prefix + key!r} in language data ('.' separates paths)")
+            if isinstance(value, str):
+                table[prefix + key] = value
+            elif isinstance(value, dict):
+                walk(value, f"{prefix}{key}.")
+            else:
+                raise TypeError(
+                    f"Invalid value in language data at {prefix + key!r}: {value!r} "
+                    "(expected str or dict[str, ...])"
+                )
+
+    walk(data, "")
+    return table
+
+
+def dump_string_table(table: dict[str, str]) -> bytes:
+    return marshal.dumps(table)
+
+
+class LangData(dict[str, str]):
+    """Flat string table of one language, keyed by dotted path."""
 
     @classmethod
     def from_pak(cls, lang_code: str) -> "LangData":
@@ -20,7 +70,7 @@ class LangData(dict[str, LangNode]):
         Load encoded .paks with the given language code and return LangData.
 
         :param lang_code: e.g. 'zh_tw', 'en_us'
-        :return: LangData (nested dictionary of UI texts).
+        :return: LangData (flat table of UI texts).
         """
         pak_path = locale_dir(f"{lang_code}.pak")
 
@@ -29,61 +79,47 @@ class LangData(dict[str, LangNode]):
                 f"Can't find asset {lang_code}.pak.\nPlease check file integrity."
             )
 
-        # No try-except for language .paks are necessary
+        if is_pak_file(pak_path):
+            pak = PakFile(pak_path)
+            try:
+                entry_format = pak.entry_meta(STRING_TABLE_ENTRY).get("format")
+                if entry_format != STRING_TABLE_FORMAT:
+                    raise ValueError(f"Unsupported string table format {entry_format} in {lang_code}.pak, please rebuild it")
+                return cls(marshal.loads(pak.read(STRING_TABLE_ENTRY)))
+            finally:
+                pak.close()
+
+        # Legacy pak: nested JSON, flattened and validated here
         with open(pak_path, "rb") as f:
             encoded = f.read()
-
-        decoded = zlib.decompress(base64.b64decode(encoded)).decode("utf-8")
-        raw = json.loads(decoded)
-
-        if not isinstance(raw, dict):
-            raise ValueError("Language pak root must be a dict")
-
-        def _validate(node: Any) -> LangNode:
-            if isinstance(node, str):
-                return node
-            if isinstance(node, dict):
-                return {str(k): _validate(v) for k, v in node.items()}
-            raise TypeError(
-                f"Invalid value in language pak: {node!r} "
-                "(expected str or dict[str, ...])"
-            )
-
-        validated: LangDict = {str(k): _validate(v) for k, v in raw.items()}
-        return cls(validated)
+        return cls(flatten_strings(json.loads(zlib.decompress(base64.b64decode(encoded)).decode("utf-8"))))
 
     def get_str(self, *path: str) -> str:
         """
-        Get a leaf string at the given path, e.g. ["menu", "title"].
-        Raises TypeError if the leaf is not a string.
+        Get the string at the given path, e.g. ("menu", "title") or "menu.title".
 
         :param path: Path to the key.
         :return str: Value of the key.
         """
-        cur: LangNode = self
-        for key in path:
-            if not isinstance(cur, Mapping):
-                raise TypeError(f"Expected dict at {key=}, got {type(cur)!r}")
-            cur = cur[key]
-
-        if not isinstance(cur, str):
-            raise TypeError("Expected str at leaf")
-        return cur
+        return self[".".join(path)]
 
     def get_map(self, *path: str) -> LangDict:
         """
-        Get a nested dict at the given path.
-        Raises TypeError if the leaf is not a dict-like mapping.
+        Rebuild the nested dict below the given path. Scans the whole table; prefer get_str.
 
         :param path: Path to the key of the dictionary
         :return LangDict: The target dictionary
         """
-        cur: LangNode = self
-        for key in path:
-            if not isinstance(cur, Mapping):
-                raise TypeError(f"Expected dict at {key=}, got {type(cur)!r}")
-            cur = cur[key]
-
-        if not isinstance(cur, dict):
-            raise TypeError("Expected nested dict at leaf")
-        return cur
\ No newline at end of file
+        prefix = ".".join(path) + "." if path else ""
+        result: LangDict = {}
+        for key, value in self.items():
+            if not key.startswith(prefix):
+                continue
+            *parents, leaf = key[len(prefix):].split(".")
+            node = result
+            for parent in parents:
+                node = node.setdefault(parent, {}) # type: ignore
+            node[leaf] = value
+        if not result:
+            raise KeyError(".".join(path))
+        return result
@@ -0,0 +1,310 @@
+"""
+Binary .pak container shared by scripts/build_assets.py and the runtime.
+
+Layout (all integers little-endian):
+
+    [header][payload 0][payload 1]...[payload n-1][index]
+
+The header has a fixed size and points at the index, which is written last so
+entries can be streamed to disk without knowing the final index size. The index
+is UTF-8 JSON mapping every entry name to its (offset, length, codec, checksum).
+Payloads are stored back to back and can be sliced straight out of a mmap.
+
+Every entry records the CRC32 and the BLAKE2b digest of its stored payload.
+Readers check the CRC32 when an entry is first read; the digest is meant for
+full verification passes (scripts/pak_tool.py verify).
+
+Image entries may store decoded pixels instead of PNG: their meta then holds
+"pixels" (byte order, PIXEL_FORMAT) and "image_size", and the runtime hands the
+payload straight to pygame.image.frombuffer.
+
+Payloads are content-addressed: entries whose stored bytes are identical point
+at the same (offset, length), so a duplicated asset is stored once.
+"""
+import os
+import bz2
+import json
+import lzma
+import zlib
+import struct
+import hashlib
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+
+PAK_MAGIC = b"NXPK"
+PAK_VERSION = 1
+
+# magic, version, flags, entry_count, index_offset, index_length, index_crc32
+PAK_HEADER = struct.Struct("<4sHHIQQI")
+
+# Byte order of raw pixel payloads; matches the 32-bit display formats SDL picks on little-endian
+# machines, so converting such a surface to the display is a plain copy
+PIXEL_FORMAT = "BGRA"
+
+# codec name -> (encode, decode)
+# Decoders accept any bytes-like object so payloads can be fed from a memoryview.
+# Every codec is chosen per entry; see DEFAULT_CODECS in scripts/build_assets.py.
+CODECS: dict[str, tuple[Callable[[bytes], bytes], Callable[[Any], bytes]]] = {
+    "raw": (lambda data: data, lambda payload: payload),
+    "zlib": (lambda data: zlib.compress(data, level=9), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+    "bz2": (lambda data: bz2.compress(data, compresslevel=9), bz2.decompress),
+}
+
+
+class PakFormatError(ValueError):
+    """Raised when a file is not a valid .pak container."""
+
+
+class PakIntegrityError(PakFormatError):
+    """Raised when a stored payload doesn't match the checksum recorded at build time."""
+    def __init__(self, entry_name: str, reason: str) -> None:
+        super().__init__(f"Pak entry {entry_name!r} is corrupt ({reason})")
+        self.entry_name = entry_name
+
+
+@dataclass(frozen=True, slots=True)
+class PakEntry:
+    name: str
+    offset: int
+    length: int    # Stored (encoded) size in bytes
+    codec: str
+    checksum: int  # CRC32 of the stored payload
+    size: int      # Decoded size in bytes
+    digest: str = ""  # BLAKE2b of the stored payload (hex), empty for paks built before it existed
+    filename: str = ""
+    meta: dict[str, Any] = field(default_factory=dict)
+
+    def to_index(self) -> dict[str, Any]:
+        record = {
+            "offset": self.offset,
+            "length": self.length,
+            "codec": self.codec,
+            "checksum": self.checksum,
+            "size": self.size,
+            "digest": self.digest,
+            "filename": self.filename,
+        }
+        if self.meta:
+            record["meta"] = self.meta
+        return record
+
+    @classmethod
+    def from_index(cls, name: str, record: dict[str, Any]) -> "PakEntry":
+        return cls(
+            name=name,
+            offset=int(record["offset"]),
+            length=int(record["length"]),
+            codec=str(record["codec"]),
+            checksum=int(record["checksum"]),
+            size=int(record["size"]),
+            digest=str(record.get("digest", "")),
+            filename=str(record.get("filename", "")),
+            meta=dict(record.get("meta", {})),
+        )
+
+
+def is_pak_file(path: str | Path) -> bool:
+    """
+    Check whether the file at the given path starts with the container magic.
+
+    :param path: Path to the file.
+    :return bool: True for the indexed binary format, False otherwise (e.g. legacy paks).
+    """
+    with open(path, "rb") as reader:
+        return reader.read(len(PAK_MAGIC)) == PAK_MAGIC
+
+
+def variant_name(name: str, size: tuple[int, int], blur: int = 0) -> str:
+    """
+    Entry name of a variant pre-scaled for a window size and optionally blurred,
+    e.g. 'factory1@1280x720' or 'factory1@1280x720#blur8'.
+    """
+    name = f"{name}@{size[0]}x{size[1]}"
+    return f"{name}#blur{blur}" if blur else name
+
+
+def payload_digest(payload: Any) -> str:
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def verify_payload(entry: PakEntry, payload: Any, strong: bool = False) -> None:
+    """
+    Check a stored payload against the checksums of its entry.
+
+    :param entry: Entry as recorded in the index.
+    :param payload: Stored (still encoded) bytes of the entry.
+    :param strong: Also compare the BLAKE2b digest, not only the CRC32.
+    :raise PakIntegrityError: On any mismatch.
+    """
+    if len(payload) != entry.length:
+        raise PakIntegrityError(entry.name, f"expected {entry.length} bytes, found {len(payload)}")
+    if zlib.crc32(payload) != entry.checksum:
+        raise PakIntegrityError(entry.name, "CRC32 mismatch")
+    if strong and entry.digest and payload_digest(payload) != entry.digest:
+        raise PakIntegrityError(entry.name, "BLAKE2b mismatch")
+
+
+def encode_payload(data: bytes, codec: str) -> bytes:
+    if codec not in CODECS:
+        raise PakFormatError(f"Unknown codec: {codec!r}")
+    return CODECS[codec][0](data)
+
+
+def decode_payload(payload: Any, codec: str) -> Any:
+    """
+    Decode a stored payload. The "raw" codec hands back the input object as-is,
+    so a memoryview slice stays zero-copy.
+    """
+    if codec not in CODECS:
+        raise PakFormatError(f"Unknown codec: {codec!r}")
+    return CODECS[codec][1](payload)
+
+
+def read_index(buffer: Any) -> tuple[dict[str, Any], dict[str, PakEntry]]:
+    """
+    Parse the header and index of a container held in a bytes-like buffer (e.g. a mmap).
+    Only the header and the index are touched; payloads are left alone.
+
+    :param buffer: Bytes-like object covering the whole file.
+    :return tuple: (pak metadata, entries keyed by name)
+    """
+    if len(buffer) < PAK_HEADER.size:
+        raise PakFormatError("File is too small to be a pak")
+
+    magic, version, _flags, entry_count, index_offset, index_length, index_crc = PAK_HEADER.unpack_from(buffer, 0)
+    if magic != PAK_MAGIC:
+        raise PakFormatError("Bad pak magic")
+    if version > PAK_VERSION:
+        raise PakFormatError(f"Unsupported pak version {version}")
+    if index_offset + index_length > len(buffer):
+        raise PakFormatError("Pak index lies beyond the end of file (truncated?)")
+
+    raw_index = buffer[index_offset:index_offset + index_length]
+    if zlib.crc32(raw_index) != index_crc:
+        raise PakFormatError("Pak index checksum mismatch")
+
+    index = json.loads(bytes(raw_index))
+    entries = {
+        name: PakEntry.from_index(name, record) for name, record in index.pop("entries").items()
+    }
+    if len(entries) != entry_count:
+        raise PakFormatError("Pak entry count mismatch")
+    for entry in entries.values():
+        if entry.offset < PAK_HEADER.size or entry.offset + entry.length > index_offset:
+            raise PakFormatError(f"Pak entry {entry.name!r} lies outside the payload area")
+
+    return index, entries
+
+
+class PakWriter:
+    """
+    Stream entries into a new container.
+    The file is written next to the target and moved into place on close().
+    Identical payloads are written once and shared by every entry naming them.
+    """
+    def __init__(self, path: str | Path, category: str, filetype: str, built_at: str) -> None:
+        self.path = Path(path)
+        self.meta: dict[str, Any] = {
+            "category": category,
+            "built_at": built_at,
+            "filetype": filetype,
+        }
+        self.entries: dict[str, PakEntry] = {}
+        self.deduplicated_bytes = 0
+
+        # (digest, codec) -> first entry that stored the payload
+        self._blobs: dict[tuple[str, str], PakEntry] = {}
+
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._writer = open(self._tmp_path, "wb")
+        self._writer.write(b"\0" * PAK_HEADER.size)
+        self._offset = PAK_HEADER.size
+
+    def add(self, name: str, data: bytes, codec: str = "zlib", *, filename: str = "", **meta: Any) -> PakEntry:
+        """
+        Encode and append one entry.
+
+        :param name: Lookup key of the entry.
+        :param data: Decoded bytes.
+        :param codec: Key of CODECS.
+        :param filename: Original source filename, kept for reference.
+        :return PakEntry: The entry as recorded in the index.
+        """
+        payload = encode_payload(data, codec)
+        return self.add_encoded(name, payload, codec, len(data), filename=filename, **meta)
+
+    def add_encoded(self, name: str, payload: bytes, codec: str, size: int, *, filename: str = "", **meta: Any) -> PakEntry:
+        """
+        Append an already encoded payload as-is.
+        """
+        if name in self.entries:
+            raise KeyError(f"Duplicated pak entry: {name}")
+
+        digest = payload_digest(payload)
+        blob = self._blobs.get((digest, codec))
+        if blob is not None and blob.length == len(payload):
+            offset = blob.offset
+            self.deduplicated_bytes += len(payload)
+        else:
+            offset = self._offset
+            self._writer.write(payload)
+            self._offset += len(payload)
+
+        entry = PakEntry(
+            name=name,
+            offset=offset,
+            length=len(payload),
+            codec=codec,
+            checksum=zlib.crc32(payload),
+            size=size,
+            digest=digest,
+            filename=filename,
+            meta=meta,
+        )
+        self._blobs.setdefault((digest, codec), entry)
+        self.entries[name] = entry
+        return entry
+
+    def raw_index(self) -> bytes:
+        """
+        The index close() writes for the entries added so far.
+        """
+        index = dict(self.meta)
+        index["entries"] = {name: entry.to_index() for name, entry in self.entries.items()}
+        return json.dumps(index, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def close(self) -> None:
+        raw_index = self.raw_index()
+        self._writer.write(raw_index)
+        self._writer.seek(0)
+        self._writer.write(PAK_HEADER.pack(
+            PAK_MAGIC,
+            PAK_VERSION,
+            0,
+            len(self.entries),
+            self._offset,
+            len(raw_index),
+            zlib.crc32(raw_index),
+        ))
+        self._writer.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """
+        Discard everything written so far and leave the previous file untouched.
+        """
+        self._writer.close()
+        os.remove(self._tmp_path)
+
+    def __enter__(self) -> "PakWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
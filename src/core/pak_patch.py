@@ -0,0 +1,195 @@
+"""
+Delta patches between two builds of a .pak (see core.pak_format).
+
+A patch is itself a pak holding only the stored payloads the base build lacks.
+Its index carries the metadata of the target build plus a "patch" record:
+
+    base      fingerprint of the build the patch applies to
+    target    fingerprint of the target build, checked before the result is kept
+    order     entry names of the target build in index order
+    removed   base entries dropped by the target
+    copies    target entries whose payload the base already has, by base entry name
+
+Every other base entry is carried over unchanged. Entries are written in the
+target's order, so the result is byte-identical to the target build and the
+next patch made against that build applies to it as well. Payloads are copied
+still encoded, straight between mappings, so applying a patch never holds more
+than one entry in memory and never decodes anything.
+"""
+import zlib
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from core.asset_manager import PakFile
+from core.pak_format import PAK_HEADER, PakEntry, PakFormatError, PakIntegrityError, PakWriter, verify_payload
+
+
+PATCH_FORMAT = 2
+
+
+@dataclass(slots=True)
+class PatchStats:
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    copied: int = 0     # Added or changed entries whose payload was already in the base
+    unchanged: int = 0
+    payload_bytes: int = 0  # Stored bytes shipped inside the patch
+
+
+def pak_fingerprint(path: str | Path) -> dict[str, Any]:
+    """
+    Identify one build of a pak by its header. The index checksum covers every
+    entry's offset and digest, so any rebuild that changes a payload changes it.
+    """
+    with open(path, "rb") as reader:
+        _magic, _version, _flags, entry_count, _offset, index_length, index_crc = PAK_HEADER.unpack(
+            reader.read(PAK_HEADER.size)
+        )
+    return {"entries": entry_count, "index_length": index_length, "index_checksum": index_crc}
+
+
+def _writer_fingerprint(writer: PakWriter) -> dict[str, Any]:
+    # pak_fingerprint of the file the writer is about to close
+    raw_index = writer.raw_index()
+    return {"entries": len(writer.entries), "index_length": len(raw_index), "index_checksum": zlib.crc32(raw_index)}
+
+
+def _same_entry(old: PakEntry, new: PakEntry) -> bool:
+    return (
+        bool(old.digest) and old.digest == new.digest and old.codec == new.codec and old.size == new.size
+        and old.filename == new.filename and old.meta == new.meta
+    )
+
+
+def make_patch(base_path: str | Path, target_path: str | Path, patch_path: str | Path) -> PatchStats:
+    """
+    Write a patch turning the pak at base_path into the one at target_path.
+
+    :param base_path: Build the players have.
+    :param target_path: New build.
+    :param patch_path: Where to write the patch.
+    :return PatchStats: What the patch contains.
+    """
+    base = PakFile(base_path)
+    target = PakFile(target_path)
+    stats = PatchStats()
+    try:
+        if base.category != target.category:
+            raise PakFormatError(f"Cannot patch a {base.category!r} pak into a {target.category!r} pak")
+
+        # (digest, codec) -> a base entry storing that payload
+        base_blobs = {(entry.digest, entry.codec): entry.name for entry in base.entries.values() if entry.digest}
+        copies: dict[str, dict[str, Any]] = {}
+
+        with PakWriter(patch_path, target.category, target.filetype, target.meta["built_at"]) as writer:
+            # Pak-level meta such as an overlay's "priority" or a locale's "language" carries over
+            writer.meta = dict(target.meta)
+            for name, entry in target.entries.items():
+                old = base.entries.get(name)
+                if old is not None and _same_entry(old, entry):
+                    stats.unchanged += 1
+                    continue
+
+                if old is None:
+                    stats.added += 1
+                else:
+                    stats.changed += 1
+
+                source = base_blobs.get((entry.digest, entry.codec)) if entry.digest else None
+                if source is not None:
+                    copies[name] = {"from": source, "filename": entry.filename, "meta": entry.meta}
+                    stats.copied += 1
+                    continue
+
+                target.verify(name, strong=True)
+                writer.add_encoded(
+                    name, target.read_stored(name), entry.codec, entry.size, filename=entry.filename, **entry.meta
+                )
+                stats.payload_bytes += entry.length
+
+            removed = [name for name in base.entries if name not in target.entries]
+            stats.removed = len(removed)
+            stats.payload_bytes -= writer.deduplicated_bytes
+            writer.meta["patch"] = {
+                "format": PATCH_FORMAT,
+                "base": pak_fingerprint(base_path),
+                "target": pak_fingerprint(target_path),
+                "order": list(target.entries),
+                "removed": removed,
+                "copies": copies,
+            }
+    finally:
+        base.close()
+        target.close()
+
+    return stats
+
+
+def _copy_entry(writer: PakWriter, name: str, payload: memoryview, entry: PakEntry, filename: str, meta: dict[str, Any]) -> None:
+    written = writer.add_encoded(name, payload, entry.codec, entry.size, filename=filename, **meta)
+    # The writer hashes every payload anyway; compare instead of hashing twice
+    if entry.digest:
+        if written.digest != entry.digest:
+            raise PakIntegrityError(entry.name, "BLAKE2b mismatch")
+    else:
+        verify_payload(entry, payload)
+
+
+def apply_patch(base_path: str | Path, patch_path: str | Path, output_path: str | Path | None = None) -> int:
+    """
+    Apply a patch made by make_patch. The result is streamed to a temporary file
+    and moved into place once complete, so an interrupted or failed update leaves
+    the base untouched.
+
+    :param base_path: Pak the patch was made against.
+    :param patch_path: Patch to apply.
+    :param output_path: Where to write the patched pak (default: replace the base).
+    :raise PakFormatError: The patch doesn't apply to this base.
+    :raise PakIntegrityError: A payload of the base or the patch is corrupt.
+    :return int: Entry count of the patched pak.
+    """
+    patch = PakFile(patch_path)
+    try:
+        info = patch.meta.get("patch")
+        if info is None:
+            raise PakFormatError(f"{Path(patch_path).name} is not a pak patch")
+        if info.get("format") != PATCH_FORMAT:
+            raise PakFormatError(f"Unsupported pak patch format {info.get('format')}")
+        if pak_fingerprint(base_path) != info["base"]:
+            raise PakFormatError(f"{Path(patch_path).name} was made for another build of {Path(base_path).name}")
+        base = PakFile(base_path)
+    except BaseException:
+        patch.close()
+        raise
+
+    copies: dict[str, dict[str, Any]] = info["copies"]
+    writer = PakWriter(output_path or base_path, patch.category, patch.filetype, patch.meta["built_at"])
+    writer.meta = {key: value for key, value in patch.meta.items() if key != "patch"}
+    try:
+        # Same order as the target, so payloads land at the target's offsets
+        for name in info["order"]:
+            if name in patch.entries:
+                entry = patch.entries[name]
+                _copy_entry(writer, name, patch.read_stored(name), entry, entry.filename, entry.meta)
+            elif name in copies:
+                entry = base.entries[copies[name]["from"]]
+                _copy_entry(writer, name, base.read_stored(entry.name), entry, copies[name]["filename"], copies[name]["meta"])
+            else:
+                entry = base.entries[name]
+                _copy_entry(writer, name, base.read_stored(name), entry, entry.filename, entry.meta)
+
+        if _writer_fingerprint(writer) != info["target"]:
+            raise PakFormatError(f"Applying {Path(patch_path).name} did not reproduce the target build")
+    except BaseException:
+        writer.abort()
+        raise
+    finally:
+        # Unmap before the result replaces the base
+        base.close()
+        patch.close()
+
+    writer.close()
+    return len(writer.entries)
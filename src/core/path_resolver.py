@@ -34,6 +34,9 @@ def asset_sprite(*sub) -> Path:
 def asset_scene(*sub) -> Path:
     return assets_root().joinpath("scene", *sub)
 
+def asset_overlay(*sub) -> Path:
+    return assets_root().joinpath("overlay", *sub)
+
 @lru_cache(maxsize=1)
 def core_root() -> Path:
     return src_root() / "core"
@@ -2,6 +2,7 @@ import pygame
 
 from typing import Union
 
+from core.glyph_atlas import glyph_atlas
 from core.scene.EventState import EventState
 from core.scene.Scene import Scene
 from core.scene.SceneManager import SceneManager
@@ -131,14 +132,13 @@ class DialogueLog(Scene):
         self._line_gap_px = self.rscale(20)
 
         # Expand dialogues to multiple lines
+        glyphs = glyph_atlas(self._font, self._text_color)
         for speaker, text in self._lines:
             prefix = f"{speaker}{':' if speaker else ''} "
             full_text = prefix + text
-            wrapped_text_lines = self._wrap_text(full_text, max_width)
 
-            for t in wrapped_text_lines:
-                surf = self._font.render(t, True, self._text_color)
-                self._render_lines.append(surf)
+            for t in glyphs.wrap(full_text, max_width):
+                self._render_lines.append(glyphs.render(t))
 
         if not self._render_lines:
             self._scroll = 0.0
@@ -155,25 +155,3 @@ class DialogueLog(Scene):
         self._max_scroll = max(0.0, float(total_height - visible_height))
 
         self._scroll = self._max_scroll
-
-    def _wrap_text(self, text: str, max_width: int) -> list[str]:
-        if not text:
-            return [""]
-
-        lines: list[str] = []
-        current = ""
-
-        for ch in text:
-            candidate = current + ch
-            w, _ = self._font.size(candidate)
-            if w <= max_width:
-                current = candidate
-            else:
-                if current:
-                    lines.append(current)
-                current = ch
-
-        if current:
-            lines.append(current)
-
-        return lines
@@ -1,15 +1,25 @@
 import pygame
 
 from typing import Union, Type
+from core.asset_manager import AssetHandle
 from core.scene.EventState import EventState
 from core.scene.SceneManager import SceneManager
 from core.scene.Scene import Scene
 from core.scene.DialogueLog import DialogueLog
-from core.scene.DialogueStructure import DialogueSceneData, DialogueActionData
+from core.scene.DialogueStructure import (
+    BackgroundTransition, ChangeDialogueScene, DialogueAction, DialogueScript, Easing, HideCharacter,
+    MoveCharacter, PlayBgm, PlaySfx, Prompt, ScreenShake as ScreenShakeAction, SetBackground, SetExpression,
+    SetHighlight, ShowCharacter, ShowText
+)
 from core.scene.PromptScene import PromptScene
+from core.glyph_atlas import glyph_atlas
+from core.sprite_atlas import SpriteFrame
+from core.text_cache import render_text
 from core.ui.components.AnimatedGlowingButton import AnimatedGlowingButton
+from core.ui.components.DialogueText import DialogueText
 from core.ui.effects.CoordsAnimator import Linear, OutCubic, InCubic, OutBack, InBack, Elastic
 from core.ui.effects.ScreenShake import ScreenShake
+from core.ui.effects.SpriteAnimation import SpriteAnimation
 from core.ui.effects.Typewriter import Typewriter
 
 
@@ -17,7 +27,7 @@ class DialogueScene(Scene):
     def __init__(
             self,
             scene_manager: SceneManager,
-            dialogue_data: DialogueSceneData,
+            dialogue_data: DialogueScript,
             *,
             is_overlay: bool = False,
             is_exclusive: bool = True
@@ -26,7 +36,7 @@ class DialogueScene(Scene):
         self.is_overlay = is_overlay
         self.is_exclusive = is_exclusive
 
-        self.dialogue_data: DialogueSceneData = dialogue_data
+        self.dialogue_data: DialogueScript = dialogue_data
 
         self.windows_size: tuple[int, int] = self.sm.screen.get_size()
         self.mouse_pos: tuple[int, int] = (0, 0)
@@ -41,6 +51,7 @@ class DialogueScene(Scene):
         self.dialogue_history: list[tuple[str, str]] = []  # For Log Overlay (Speaker, Dialogue)
 
         self._is_speaker_exist: bool = False
+        self._speaker: tuple[str, str] = ("", "")  # (Name, Title) of the current line
 
         self._dropdown_menu_toggled: bool = False
 
@@ -53,24 +64,23 @@ class DialogueScene(Scene):
         self._awaiting_overlays: list[Type[Scene]] = []
         self._bg_transition: dict[str, object] | None = None
 
+        # Asset handles referenced by this scene, released on leave
+        self._held_assets: dict[tuple[str, str], AssetHandle] = {}
+
         # UI Elements
         self.tw = Typewriter("", self.config_cps_scale)
         self.shake_controller = ScreenShake()
-        self._dialogue_lines: list[pygame.Surface] = []  # Wrapped dialogue lines (each is a rendered Surface)
 
         self.characters = {
             "sprite": {},
             "pos": {},
             "animator": {},
+            "animation": {},
             "is_highlighted": {}
         }
 
-        self.text_color: tuple[int, int, int] = self.dialogue_data.get(
-            "text_color", (214, 214, 214)
-        )
-        self.slash_color: tuple[int, int, int] = self.dialogue_data.get(
-            "slash_color", (214, 214, 214)
-        )
+        self.text_color: tuple[int, int, int] = self.dialogue_data.text_color
+        self.slash_color: tuple[int, int, int] = self.dialogue_data.slash_color
 
     def enter(self) -> None:
         self.reload_elements()
@@ -82,9 +92,12 @@ class DialogueScene(Scene):
         self._awaiting_overlays = []
 
         self._execute_step(self._curr_step_idx)
+        self.sm.prefetcher.prefetch_steps(self.dialogue_data, self._curr_step_idx + 1)
 
     def leave(self) -> None:
-        return
+        for handle in self._held_assets.values():
+            handle.release()
+        self._held_assets.clear()
 
     def handle(self, ev: EventState) -> None:
         def keyboard_event() -> bool:
@@ -174,22 +187,16 @@ class DialogueScene(Scene):
             v.update(dt)
             self.characters["pos"][k] = v.curr
 
-        # Dialogue Text (typewriter + wrap)
-        self.tw.update(dt)
-
-        # Get max width of text area
-        w, h = self.windows_size
-        dialogue_x = int(w * 0.2)
-        padding_right = self.rscale(140)
-        max_width = w - dialogue_x - padding_right
-
-        # Wrap
-        wrapped_lines = self._wrap_text(self.tw.visible_text, max_width)
+        # Character Animation Frames
+        for k, v in self.characters["animation"].items():
+            if v is None or k not in self.characters["sprite"]:
+                continue
+            v.update(dt)
+            self.characters["sprite"][k] = v.curr
 
-        # Save as Surfaces
-        self._dialogue_lines = [
-            self.dialogue_font.render(line, True, self.text_color) for line in wrapped_lines
-        ]
+        # Dialogue Text (laid out once per line of dialogue, revealed by the typewriter)
+        self.tw.update(dt)
+        self.dialogue_text.reveal(self.tw.visible_count)
 
         # Auto Mode Dialogue Advance
         if self._auto_mode:
@@ -229,27 +236,25 @@ class DialogueScene(Scene):
             progress = max(0.0, min(1.0, elapsed / duration))
 
             from_bg = self._bg_transition.get("from")
-            to_bg = self._bg_transition.get("to")
+            fading_bg = self._bg_transition.get("fading")
             if isinstance(from_bg, pygame.Surface):
                 surface.blit(from_bg, (s_x, s_y))
-            if isinstance(to_bg, pygame.Surface):
-                alpha = int(255 * progress)
-                to_bg.set_alpha(alpha)
-                surface.blit(to_bg, (s_x, s_y))
-                to_bg.set_alpha(None)
+            if isinstance(fading_bg, pygame.Surface):
+                fading_bg.set_alpha(int(255 * progress))
+                surface.blit(fading_bg, (s_x, s_y))
         else:
             surface.blit(self.background, (s_x, s_y)) # type: ignore
 
         # Character Sprites
         for k in self.characters["sprite"].keys():
-            c_sprite = self.characters["sprite"][k]
-            # Draw from rect center
-            c_rect = c_sprite.get_rect()
-            c_w, c_h = c_rect.width, c_rect.height
+            c_frame: SpriteFrame = self.characters["sprite"][k]
+            c_sprite = c_frame.surface
+            # Draw from the center of the untrimmed frame; trimmed sprites sit at their offset in it
+            c_w, c_h = c_frame.size
             pos = self.characters["pos"][k]
 
-            c_pos = (pos[0] - c_w // 2 + s_x, pos[1] - c_h // 2 + s_y)
-            surface.blit(self.characters["sprite"][k], c_pos)
+            c_pos = (pos[0] - c_w // 2 + c_frame.offset[0] + s_x, pos[1] - c_h // 2 + c_frame.offset[1] + s_y)
+            surface.blit(c_sprite, c_pos)
 
             # Highlight effect (Dim others)
             if self.characters["is_highlighted"][k]:
@@ -278,22 +283,9 @@ class DialogueScene(Scene):
         surface.blit(self.ctitle_surface, ctitle_pos)
 
         # Lines of Text
-        d_y = h * 0.8
-        line_gap = self.rscale(4)
         padding_bottom = self.rscale(40)
-
-        for line_surf in self._dialogue_lines:
-            line_h = line_surf.get_height()
-
-            # Stop when it's out of screen
-            if d_y > h - padding_bottom:
-                break
-
-            if self._is_speaker_exist:
-                surface.blit(line_surf, (w * 0.2, d_y))
-            else:
-                surface.blit(line_surf, (w * 0.15, d_y))
-            d_y += line_h + line_gap
+        text_x = w * 0.2 if self._is_speaker_exist else w * 0.15
+        self.dialogue_text.render(surface, (text_x, h * 0.8), h - padding_bottom)
 
         if self._is_speaker_exist:
             slash_pos = (w * 0.17, h * 0.8)
@@ -316,25 +308,41 @@ class DialogueScene(Scene):
         return round(base_value * self.sm.uniform_scale)
 
     def reload_language_data(self) -> None:
-        self.reload_elements()
+        # Only fonts and text depend on the language; art and layout are kept
+        self._reload_text()
 
     def reload_elements(self) -> None:
+        self._reload_text()
+        self._reload_dialogue_overlay()
+        self._reload_background()
+        self._reload_characters()
+
+    def _reload_text(self) -> None:
         # Fonts
-        font_path = self.sm.language_data.get_str("font_path")
-        self.name_font = pygame.font.Font(font_path, self.rscale(50))
-        self.ctitle_font = pygame.font.Font(font_path, self.rscale(36))
-        self.slash_font = pygame.font.Font(font_path, self.rscale(92))
-        self.dialogue_font = pygame.font.Font(font_path, self.rscale(40))
-        self.button_font = pygame.font.Font(font_path, self.rscale(40))
+        self.name_font = self.sm.get_font(self.rscale(50))
+        self.ctitle_font = self.sm.get_font(self.rscale(36))
+        self.slash_font = self.sm.get_font(self.rscale(92))
+        self.dialogue_font = self.sm.get_font(self.rscale(40))
+        self.button_font = self.sm.get_font(self.rscale(40))
 
         # Surfaces
-        self.name_surface = self.name_font.render("", True, self.text_color)
-        self.ctitle_surface = self.ctitle_font.render("", True, self.text_color)
-        self.down_arrow_surface = self.dialogue_font.render("﹀", True, self.text_color)
+        speaker_name, speaker_title = self._speaker
+        self.name_surface = render_text(self.name_font, speaker_name, True, self.text_color)
+        self.ctitle_surface = render_text(self.ctitle_font, speaker_title, True, self.text_color)
+        self.down_arrow_surface = render_text(self.dialogue_font, "﹀", True, self.text_color)
+
+        # Dialogue text, laid out again with the new font
+        w = self.windows_size[0]
+        dialogue_x = int(w * 0.2)
+        padding_right = self.rscale(140)
+        self.dialogue_text = DialogueText(
+            glyph_atlas(self.dialogue_font, self.text_color),
+            w - dialogue_x - padding_right,
+            self.rscale(4)
+        )
+        self.dialogue_text.set_text(self.tw.full_text)
+        self.dialogue_text.reveal(self.tw.visible_count)
 
-        self._reload_dialogue_overlay()
-        self._reload_background()
-        self._reload_characters()
         self._build_buttons()
 
     def _reload_dialogue_overlay(self) -> None:
@@ -357,16 +365,14 @@ class DialogueScene(Scene):
 
     def _find_latest_background(self) -> tuple[str | None, int]:
         def find_in_step(step_idx: int, last_action_idx: int | None = None) -> tuple[str | None, int]:
-            curr_step = self.dialogue_data["steps"][step_idx]
-            max_idx = last_action_idx if last_action_idx is not None else len(curr_step["actions"]) - 1
+            curr_step = self.dialogue_data.steps[step_idx]
+            max_idx = last_action_idx if last_action_idx is not None else len(curr_step.actions) - 1
             if max_idx < 0:
                 return (None, 0)
 
-            for action in reversed(curr_step["actions"][:max_idx + 1]):
-                if action["type"] != "set_background":
-                    continue
-                args = action.get("args", {})
-                return args.get("filename"), int(args.get("blur", 0)) # type: ignore
+            for action in reversed(curr_step.actions[:max_idx + 1]):
+                if isinstance(action, SetBackground):
+                    return action.filename, action.blur
             return (None, 0)
 
         for idx in reversed(range(self._curr_step_idx + 1)):
@@ -384,28 +390,18 @@ class DialogueScene(Scene):
             background.fill((0, 0, 0))
             return background
 
-        background = pygame.transform.smoothscale(
-            pygame.image.load(
-                self.sm.get_illustration_iofile(filename)
-            ).convert(),
-            self.windows_size
-        )
-
-        if blur:
-            background = pygame.transform.gaussian_blur(background, blur)
-
-        return background
+        self._hold_asset("illustration", filename)
+        return self.sm.get_illustration_surface(filename, self.windows_size, blur)
 
-    def _apply_background(self, filename: str | None, blur: int = 0, transition: dict | None = None) -> None:
+    def _apply_background(self, filename: str | None, blur: int = 0, transition: BackgroundTransition | None = None) -> None:
         new_background = self._load_background_surface(filename, blur)
 
-        if not transition or not isinstance(transition, dict):
+        if transition is None:
             self.background = new_background
             self._bg_transition = None
             return
 
-        transition_type = transition.get("type", "instant")
-        duration = float(transition.get("duration", 0.0))
+        transition_type, duration = transition
 
         if transition_type == "fade" and duration > 0 and hasattr(self, "background"):
             self._bg_transition = {
@@ -413,7 +409,9 @@ class DialogueScene(Scene):
                 "duration": duration,
                 "elapsed": 0.0,
                 "from": self.background,
-                "to": new_background
+                "to": new_background,
+                # Backgrounds are shared through the illustration cache, so the alpha goes on a copy of our own
+                "fading": new_background.copy()
             }
         else:
             self.background = new_background
@@ -441,24 +439,32 @@ class DialogueScene(Scene):
             "sprite": {},
             "pos": {},
             "animator": {},
+            "animation": {},
             "is_highlighted": {}
         }
 
-        for character_data in self.dialogue_data["characters"]:
-            c_img = pygame.image.load(
-                self.sm.get_sprite_iofile(character_data["sprite_filename"])
-            ).convert_alpha()
-            c_sprite = pygame.transform.smoothscale_by(
-                c_img,
-                self.scale(character_data["scale"])
-            )
-            c_id = character_data["id"]
+        for character_data in self.dialogue_data.characters:
+            sprite_filename = character_data.sprite_filename
+            sprite_scale = self.scale(character_data.scale)
+
+            # Atlas frames live in a shared page entry
+            self._hold_asset("sprite", self.sm.sprite_entry_name(sprite_filename, sprite_scale))
+            c_sprite = self.sm.get_sprite_frame(sprite_filename, sprite_scale)
+            c_id = character_data.id
             self.characters["sprite"][c_id] = c_sprite
             # Prevent showing on the screen while initializing
             self.characters["pos"][c_id] = self.characters["pos"].get(c_id, (-10000, 0))
             self.characters["animator"][c_id] = self.characters["animator"].get(c_id, None)
+            self.characters["animation"][c_id] = None
             self.characters["is_highlighted"][c_id] = self.characters["is_highlighted"].get(c_id, False)
 
+    def _hold_asset(self, category: str, name: str) -> AssetHandle:
+        # Take one reference per asset for the lifetime of this scene
+        key = (category, name)
+        if key not in self._held_assets:
+            self._held_assets[key] = self.sm.acquire_asset(category, name)
+        return self._held_assets[key]
+
     def _build_buttons(self) -> None:
         btn_y = self.rscale(42)
         margin = self.rscale(80)
@@ -472,6 +478,7 @@ class DialogueScene(Scene):
         hide_pos = (self.windows_size[0] - margin, btn_y + vgap)
         skip_pos = (self.windows_size[0] - margin, btn_y + vgap * 2)
 
+        self.buttons = []
         for button_action, button_pos in zip(
             ["log", "auto", "more", "hide", "skip"],
             [log_pos, auto_pos, more_pos, hide_pos, skip_pos]
@@ -491,7 +498,7 @@ class DialogueScene(Scene):
         return 1 + ((config_value - 50) / 50.0)
 
     def _advance_dialogue(self) -> None:
-        steps = self.dialogue_data["steps"]
+        steps = self.dialogue_data.steps
         if self._curr_step_idx >= len(steps):
             return
 
@@ -505,22 +512,22 @@ class DialogueScene(Scene):
 
             if self._curr_step_idx < len(steps):
                 self._execute_step(self._curr_step_idx)
+                self.sm.prefetcher.prefetch_steps(self.dialogue_data, self._curr_step_idx + 1)
             else:
                 pass
 
     def _execute_step(self, idx: int) -> bool:
-        actions = self.dialogue_data["steps"][idx]["actions"]
+        actions = self.dialogue_data.steps[idx].actions
 
         if self._curr_action_idx >= len(actions):
             return True
 
         while self._curr_action_idx < len(actions):
             action = actions[self._curr_action_idx]
-            action_type = action.get("type")
 
             # Skip Mode
-            if self._skip_mode and action_type != "prompt":
-                if action_type == "show_text":
+            if self._skip_mode and not isinstance(action, Prompt):
+                if isinstance(action, ShowText):
                     self._execute_action(action)
                     self.tw.skip()
                 else:
@@ -535,7 +542,7 @@ class DialogueScene(Scene):
                 self._execute_action(action)
                 self._last_action_idx = self._curr_action_idx
 
-            if action_type in ("show_text", "prompt"):
+            if isinstance(action, (ShowText, Prompt)):
                 if not self.tw.is_finished:
                     return False
 
@@ -548,7 +555,7 @@ class DialogueScene(Scene):
             self._last_action_idx = -1
 
             # Meet Prompt Action in Skip Mode
-            if self._skip_mode and action_type == "prompt":
+            if self._skip_mode and isinstance(action, Prompt):
                 self._skip_mode = False
                 return False  # Let next frame deal with it
 
@@ -556,20 +563,18 @@ class DialogueScene(Scene):
         # self._skip_mode = False
         return True
 
-    def _execute_action(self, action: DialogueActionData) -> None:
-        args = action.get("args", {})
-
-        def show_text() -> None:
-            speaker_name = args["speaker_name"]
-            speaker_title = args["speaker_title"]
-            full_text = args["text"]
+    def _execute_action(self, action: DialogueAction) -> None:
+        def show_text(action: ShowText) -> None:
+            speaker_name, speaker_title, full_text = action
 
             self._is_speaker_exist = bool(speaker_name or speaker_title)
+            self._speaker = (speaker_name, speaker_title)
 
-            self.name_surface = self.name_font.render(speaker_name, True, self.text_color)  # type: ignore
-            self.ctitle_surface = self.ctitle_font.render(speaker_title, True, self.text_color)  # type: ignore
-            self.tw.reset(full_text)  # type: ignore
-            self.dialogue_history.append((speaker_name, full_text))  # type: ignore
+            self.name_surface = render_text(self.name_font, speaker_name, True, self.text_color)
+            self.ctitle_surface = render_text(self.ctitle_font, speaker_title, True, self.text_color)
+            self.tw.reset(full_text)
+            self.dialogue_text.set_text(full_text)
+            self.dialogue_history.append((speaker_name, full_text))
 
         def play_bgm() -> None:
             pass
@@ -577,149 +582,120 @@ class DialogueScene(Scene):
         def play_sfx() -> None:
             pass
 
-        def show_character() -> None:
-            character_id = str(args["character_id"])
-            pos = self._relative_scale_to_pos(float(args["x"]), float(args["y"]))  # type: ignore
-            self.characters["pos"][character_id] = pos
-
-        def move_character() -> None:
-            character_id = str(args["character_id"])
-            from_pos = self._relative_scale_to_pos(float(args["from_x"]), float(args["from_y"]))  # type: ignore
-            to_pos = self._relative_scale_to_pos(float(args["to_x"]), float(args["to_y"]))  # type: ignore
-            duration = float(args["duration"])  # type: ignore
-            easing = args["easing"]
-
-            match easing:
-                case "linear":
-                    self.characters["animator"][character_id] = Linear(from_pos, to_pos, duration)
-                case "out_cubic":
-                    self.characters["animator"][character_id] = OutCubic(from_pos, to_pos, duration)
-                case "in_cubic":
-                    self.characters["animator"][character_id] = InCubic(from_pos, to_pos, duration)
-                case "out_back":
-                    self.characters["animator"][character_id] = OutBack(from_pos, to_pos, duration)
-                case "in_back":
-                    self.characters["animator"][character_id] = InBack(from_pos, to_pos, duration)
-                case "elastic":
-                    self.characters["animator"][character_id] = Elastic(from_pos, to_pos, duration)
-
-        def hide_character() -> None:
-            character_id = str(args["character_id"])
+        def show_character(action: ShowCharacter) -> None:
+            pos = self._relative_scale_to_pos(action.x, action.y)
+            self.characters["pos"][action.character_id] = pos
+
+        def move_character(action: MoveCharacter) -> None:
+            from_pos = self._relative_scale_to_pos(action.from_x, action.from_y)
+            to_pos = self._relative_scale_to_pos(action.to_x, action.to_y)
+            duration = action.duration
+
+            match action.easing:
+                case Easing.LINEAR:
+                    self.characters["animator"][action.character_id] = Linear(from_pos, to_pos, duration)
+                case Easing.OUT_CUBIC:
+                    self.characters["animator"][action.character_id] = OutCubic(from_pos, to_pos, duration)
+                case Easing.IN_CUBIC:
+                    self.characters["animator"][action.character_id] = InCubic(from_pos, to_pos, duration)
+                case Easing.OUT_BACK:
+                    self.characters["animator"][action.character_id] = OutBack(from_pos, to_pos, duration)
+                case Easing.IN_BACK:
+                    self.characters["animator"][action.character_id] = InBack(from_pos, to_pos, duration)
+                case Easing.ELASTIC:
+                    self.characters["animator"][action.character_id] = Elastic(from_pos, to_pos, duration)
+
+        def hide_character(action: HideCharacter) -> None:
+            character_id = action.character_id
             self.characters["sprite"].pop(character_id)
             self.characters["pos"].pop(character_id)
             self.characters["animator"].pop(character_id)
+            self.characters["animation"].pop(character_id, None)
 
-        def set_highlight() -> None:
-            character_id = str(args["character_id"])
-            dim_others = bool(args["dim_others"])
-            if dim_others:
+        def set_expression(action: SetExpression) -> None:
+            # Hidden characters have nothing left to draw the expression with
+            if action.character_id not in self.characters["pos"]:
+                return
+
+            # Frames are looked up as "<sprite_filename>.<expression>", see core/sprite_atlas.py
+            character_data = self.dialogue_data.character(action.character_id)
+            sprite_scale = self.scale(character_data.scale)
+
+            sprite_name = character_data.sprite_filename
+            if action.expression:
+                sprite_name = f"{sprite_name}.{action.expression}"
+            for frame_name in self.sm.sprite_sequence_names(sprite_name, sprite_scale):
+                self._hold_asset("sprite", self.sm.sprite_entry_name(frame_name, sprite_scale))
+            frames = self.sm.get_sprite_sequence(sprite_name, sprite_scale)
+
+            self.characters["sprite"][action.character_id] = frames[0]
+            self.characters["animation"][action.character_id] = SpriteAnimation(
+                frames, action.fps, action.loop
+            ) if len(frames) > 1 else None
+
+        def set_highlight(action: SetHighlight) -> None:
+            if action.dim_others:
                 self.characters["is_highlighted"] = {
                     k: False for k, _ in self.characters["is_highlighted"].items()
                 }
-            if character_id != "":
-                self.characters["is_highlighted"][character_id] = True
-
-        def screen_shake() -> None:
-            duration = float(args["duration"]) # type: ignore
-            intensity = float(args["intensity"]) # type: ignore
-            freq = int(args["frequency"]) # type: ignore
-            infinite = bool(args["infinite"])
-            self.shake_controller.start(duration, intensity, freq, infinite)
-
-        def prompt() -> None:
-            flag_key = str(args["id"])
-            prompt_label = str(args["message"])
-            options = list(args["options"]) # type: ignore
-
-            option_labels = []
-            option_values = []
-            for option in options:
-                option_labels.append(option["message"])
-                option_values.append(option["flag_value"])
+            if action.character_id != "":
+                self.characters["is_highlighted"][action.character_id] = True
+
+        def screen_shake(action: ScreenShakeAction) -> None:
+            self.shake_controller.start(action.duration, action.intensity, action.frequency, action.infinite)
 
+        def prompt(action: Prompt) -> None:
             self.sm.stack_push(PromptScene(
                 self.sm,
-                prompt_label,
-                flag_key,
-                option_labels,
-                option_values,
+                action.message,
+                action.id,
+                [option.message for option in action.options],
+                [option.flag_value for option in action.options],
                 "title_background"
             ))
             # Register overlays that should resume flow when dismissed (extendable list)
             self._awaiting_overlays = [PromptScene]
 
-        def change_dialogue_scene() -> None:
-            for package in args:
-
-                scene_id = str(package["scene_id"]) # type: ignore
-                required_g_flags = dict(package["required_g_flags"]) # type: ignore
+        def change_dialogue_scene(action: ChangeDialogueScene) -> None:
+            for branch in action.branches:
 
                 # Check Flags
-                for k, v in required_g_flags.items():
+                for k, v in branch.required_g_flags.items():
                     if self.sm.g_flags.get(k, "") != v:
                         return
 
                 # Switch Scenes
                 self.sm.switch(DialogueScene(
                     self.sm,
-                    self.sm.get_scene_data(scene_id)
+                    self.sm.get_scene_data(branch.scene_id)
                 ))
                 return
 
-        match action.get("type"):
-            case "show_text":
-                show_text()
-            case "set_background":
-                self._apply_background(
-                    args.get("filename"), # type: ignore
-                    int(args.get("blur", 0)), # type: ignore
-                    args.get("transition") # type: ignore
-                )
-            case "play_bgm":
+        match action:
+            case ShowText():
+                show_text(action)
+            case SetBackground():
+                self._apply_background(action.filename, action.blur, action.transition)
+            case PlayBgm():
                 pass
-            case "play_sfx":
+            case PlaySfx():
                 pass
-            case "show_character":
-                show_character()
-            case "move_character":
-                move_character()
-            case "hide_character":
-                hide_character()
-            case "set_highlight":
-                set_highlight()
-            case "screen_shake":
-                screen_shake()
-            case "prompt":
-                prompt()
-            case "change_dialogue_scene":
-                change_dialogue_scene()
-
-    def _wrap_text(self, text: str, max_width: int) -> list[str]:
-        if not text:
-            return [""]
-
-        lines: list[str] = []
-        current = ""
-
-        for ch in text:
-            if ch == "\n":
-                lines.append(current)
-                current = ""
-                continue
-
-            candidate = current + ch
-            w, _ = self.dialogue_font.size(candidate)
-            if w <= max_width:
-                current = candidate
-            else:
-                if current:
-                    lines.append(current)
-                current = ch
-
-        if current:
-            lines.append(current)
-
-        return lines
+            case ShowCharacter():
+                show_character(action)
+            case MoveCharacter():
+                move_character(action)
+            case HideCharacter():
+                hide_character(action)
+            case SetExpression():
+                set_expression(action)
+            case SetHighlight():
+                set_highlight(action)
+            case ScreenShakeAction():
+                screen_shake(action)
+            case Prompt():
+                prompt(action)
+            case ChangeDialogueScene():
+                change_dialogue_scene(action)
 
     def _relative_scale_to_pos(self, x_scale: float, y_scale: float) -> tuple[float, float]:
         # Center: (0.0, 0.0)
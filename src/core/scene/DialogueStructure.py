@@ -1,4 +1,7 @@
-from typing import TypedDict
+from enum import IntEnum
+from typing import NamedTuple, NotRequired, TypedDict
+
+# Scene scripts as authored in JSON (input of core/scene_compiler.py)
 
 class DialogueCharacterData(TypedDict):
     id: str
@@ -15,5 +18,142 @@ class DialogueStepData(TypedDict):
     actions: list[DialogueActionData]
 
 class DialogueSceneData(TypedDict):
+    chapter: NotRequired[str]  # Inherited through change_dialogue_scene when missing, see core/chapter_manifest.py
     characters: list[DialogueCharacterData]
-    steps: list[DialogueStepData]
\ No newline at end of file
+    steps: list[DialogueStepData]
+
+# Compiled scene scripts, as loaded at runtime
+# Every argument is validated and coerced at build time.
+
+class ActionType(IntEnum):
+    SHOW_TEXT = 0
+    SET_BACKGROUND = 1
+    PLAY_BGM = 2
+    PLAY_SFX = 3
+    SHOW_CHARACTER = 4
+    MOVE_CHARACTER = 5
+    HIDE_CHARACTER = 6
+    SET_HIGHLIGHT = 7
+    SCREEN_SHAKE = 8
+    PROMPT = 9
+    CHANGE_DIALOGUE_SCENE = 10
+    SET_EXPRESSION = 11
+
+class Easing(IntEnum):
+    LINEAR = 0
+    OUT_CUBIC = 1
+    IN_CUBIC = 2
+    OUT_BACK = 3
+    IN_BACK = 4
+    ELASTIC = 5
+
+class DialogueCharacter(NamedTuple):
+    id: str
+    sprite_filename: str
+    scale: float
+    default_layer: int
+
+class BackgroundTransition(NamedTuple):
+    type: str
+    duration: float
+
+class PromptOption(NamedTuple):
+    message: str
+    flag_value: str
+
+class SceneBranch(NamedTuple):
+    scene_id: str
+    required_g_flags: dict[str, str]
+
+class ShowText(NamedTuple):
+    speaker_name: str
+    speaker_title: str
+    text: str
+
+class SetBackground(NamedTuple):
+    filename: str | None
+    blur: int
+    transition: BackgroundTransition | None
+
+class PlayBgm(NamedTuple):
+    args: dict
+
+class PlaySfx(NamedTuple):
+    args: dict
+
+class ShowCharacter(NamedTuple):
+    character_id: str
+    x: float
+    y: float
+
+class MoveCharacter(NamedTuple):
+    character_id: str
+    from_x: float
+    from_y: float
+    to_x: float
+    to_y: float
+    duration: float
+    easing: Easing
+
+class HideCharacter(NamedTuple):
+    character_id: str
+
+class SetHighlight(NamedTuple):
+    character_id: str
+    dim_others: bool
+
+class ScreenShake(NamedTuple):
+    duration: float
+    intensity: float
+    frequency: int
+    infinite: bool
+
+class Prompt(NamedTuple):
+    id: str
+    message: str
+    options: tuple[PromptOption, ...]
+
+class ChangeDialogueScene(NamedTuple):
+    branches: tuple[SceneBranch, ...]
+
+class SetExpression(NamedTuple):
+    character_id: str
+    expression: str
+    fps: float
+    loop: bool
+
+type DialogueAction = (
+    ShowText | SetBackground | PlayBgm | PlaySfx | ShowCharacter | MoveCharacter | HideCharacter
+    | SetHighlight | ScreenShake | Prompt | ChangeDialogueScene | SetExpression
+)
+
+ACTION_CLASSES: dict[ActionType, type] = {
+    ActionType.SHOW_TEXT: ShowText,
+    ActionType.SET_BACKGROUND: SetBackground,
+    ActionType.PLAY_BGM: PlayBgm,
+    ActionType.PLAY_SFX: PlaySfx,
+    ActionType.SHOW_CHARACTER: ShowCharacter,
+    ActionType.MOVE_CHARACTER: MoveCharacter,
+    ActionType.HIDE_CHARACTER: HideCharacter,
+    ActionType.SET_HIGHLIGHT: SetHighlight,
+    ActionType.SCREEN_SHAKE: ScreenShake,
+    ActionType.PROMPT: Prompt,
+    ActionType.CHANGE_DIALOGUE_SCENE: ChangeDialogueScene,
+    ActionType.SET_EXPRESSION: SetExpression,
+}
+
+class DialogueStep(NamedTuple):
+    id: str
+    actions: tuple[DialogueAction, ...]
+
+class DialogueScript(NamedTuple):
+    characters: tuple[DialogueCharacter, ...]
+    steps: tuple[DialogueStep, ...]
+    text_color: tuple[int, int, int]
+    slash_color: tuple[int, int, int]
+
+    def character(self, character_id: str) -> DialogueCharacter:
+        for character in self.characters:
+            if character.id == character_id:
+                return character
+        raise KeyError(character_id)
@@ -6,6 +6,7 @@ from typing import Union
 from core.scene.EventState import EventState
 from core.scene.SceneManager import SceneManager
 from core.scene.Scene import Scene
+from core.text_cache import render_text
 from core.ui.components.AnimatedGlowingButton import AnimatedGlowingButton
 
 
@@ -39,9 +40,8 @@ class PromptScene(Scene):
         self.option_buttons: list[AnimatedGlowingButton] = []
         self.last_mouse_pos: tuple[int, int] = (0, 0)
 
-        font_path = self.sm.language_data.get_str("font_path")
-        self.font_title = pygame.font.Font(font_path, self.rscale(50))
-        self.font_opt   = pygame.font.Font(font_path, self.rscale(44))
+        self.font_title = self.sm.get_font(self.rscale(50))
+        self.font_opt   = self.sm.get_font(self.rscale(44))
 
         # Layout constants
         self.panel_padding = self.rscale(36)
@@ -64,9 +64,8 @@ class PromptScene(Scene):
         self.panel_size = (panel_w, panel_h)
 
         # Background
-        raw_bg = pygame.image.load(
-            self.sm.get_illustration_iofile(bg_filename_no_ext)
-        ).convert_alpha()
+        # Start from the window-sized copy; the panel spans the full window width
+        raw_bg = self.sm.get_illustration_surface(bg_filename_no_ext, self.window_size, convert_mode="convert_alpha")
         self.background = self._prepare_bg(raw_bg, self.panel_size)
 
         # Build base panel (white bar with tinted background)
@@ -140,7 +139,7 @@ class PromptScene(Scene):
         panel = self.panel_surface.copy()
 
         # Draw Text
-        title_surf = self.font_title.render(self.text, True, (30,30,30))
+        title_surf = render_text(self.font_title, self.text, True, (30,30,30))
         title_rect = title_surf.get_rect(center=(self.panel_size[0] // 2, self.panel_padding + title_surf.get_height() // 2))
         panel.blit(title_surf, title_rect)
 
@@ -182,7 +181,10 @@ class PromptScene(Scene):
             max(1, int(surface.get_width() * scale_ratio)),
             max(1, int(surface.get_height() * scale_ratio))
         )
-        scaled = pygame.transform.smoothscale(surface, scaled_size)
+        if scaled_size == surface.get_size():
+            scaled = surface
+        else:
+            scaled = pygame.transform.smoothscale(surface, scaled_size)
 
         fitted = pygame.Surface(target_size, pygame.SRCALPHA)
         offset_x = (scaled_size[0] - target_w) // 2
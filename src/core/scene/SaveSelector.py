@@ -37,7 +37,7 @@ class SaveSelector(Scene):
 
     def enter(self) -> None:
         # Font
-        self.font = pygame.font.Font(self.sm.language_data.get_str("font_path"), self.rscale(36))
+        self.font = self.sm.get_font(self.rscale(36))
 
         # Background
         background_opacity = 0.9
@@ -1,31 +1,51 @@
 import pygame
 import io
-import json
+import threading
 
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
 from typing import Optional
 
-from core.asset_manager import AssetPak, read_illustration_pak, read_sprite_pak, read_scene_pak, unpack_encoded_string
+from core.asset_prefetcher import AssetPrefetcher
+from core.asset_manager import AssetPak, AssetSource, AssetHandle, LegacyPak, PakStack, open_overlays, open_pak
+from core.pak_format import PakFormatError, variant_name
 from core.config_manager import DEFAULT_LANGUAGE_CODE, get_config_parser
+from core.font_registry import FontRegistry, FontStyle
+from core.glyph_atlas import clear_glyph_atlases
 from core.locale.pak_loader import LangData
 from core.scene.Scene import Scene
 from core.scene.EventState import EventState
-from core.scene.DialogueStructure import DialogueSceneData
+from core.scene.DialogueStructure import DialogueScript
+from core.scene_compiler import load_scene
+from core.sprite_atlas import SpriteAtlas, SpriteFrame, split_sequence_frame
+from core.surface_cache import SurfaceCache, SurfaceKey
+from core.text_cache import TEXT_CACHE
 
 
 class SceneManager:
     def __init__(
             self,
             screen: pygame.Surface,
-            asset_illustrations: AssetPak | None = None,
-            asset_sprites: AssetPak | None = None,
-            asset_scenes: AssetPak | None = None
+            asset_illustrations: AssetPak | AssetSource | None = None,
+            asset_sprites: AssetPak | AssetSource | None = None,
+            asset_scenes: AssetPak | AssetSource | None = None
         ) -> None:
         self.scene_stack: list[Scene] = []
         self.screen = screen
 
-        self.asset_illustrations = asset_illustrations if asset_illustrations else read_illustration_pak()
-        self.asset_sprites = asset_sprites if asset_sprites else read_sprite_pak()
-        self.asset_scenes = asset_scenes if asset_scenes else read_scene_pak()
+        # Paks are opened on first use and entries are decoded on first request
+        self._asset_sources: dict[str, AssetSource] = {}
+        for category, pak in (
+            ("illustration", asset_illustrations),
+            ("sprite", asset_sprites),
+            ("scene", asset_scenes)
+        ):
+            if pak is not None:
+                self._asset_sources[category] = self._as_asset_source(pak)
+        self._asset_handles: dict[Hashable, AssetHandle] = {}  # Keyed by content, see AssetSource.content_key
+        self._handles_lock = threading.Lock()  # Prefetch workers look handles up too
+        self._sprite_atlases: dict[tuple[int, int] | None, SpriteAtlas | None] = {}
+        self._scene_scripts: dict[str, DialogueScript] = {}
 
         self.events = EventState()
         self._pending_switch: Optional[Scene] = None
@@ -35,31 +55,387 @@ class SceneManager:
 
         # Loads configuration and .paks of languages
         self.config_parser = get_config_parser()
+        self.fonts = FontRegistry(self.config_parser.getint("Performance", "font_cache_size", fallback=32))
+        self.language_code: str | None = None
+        self._languages: dict[str, LangData | Future[LangData]] = {}  # Loaded or preloading, by language code
         self.reload_language_data()
 
+        # Decoded & display-converted surfaces shared by every scene
+        self.surface_cache = SurfaceCache(
+            self.config_parser.getint("Performance", "surface_cache_mb", fallback=256) * 1024 * 1024
+        )
+        # Rendered text shared by every scene and UI component, see core/text_cache.py
+        self.text_cache = TEXT_CACHE
+        self.text_cache.budget_bytes = self.config_parser.getint("Performance", "text_cache_mb", fallback=16) * 1024 * 1024
+        self.prefetcher = AssetPrefetcher(
+            self,
+            self.config_parser.getint("Performance", "prefetch_lookahead", fallback=4),
+            self.config_parser.getint("Performance", "prefetch_workers", fallback=1)
+        )
+
     @property
     def uniform_scale(self) -> float:
         # Scale based on 1920x1080
         # All the supported resolutions are 16:9 so only calculates once
         return self.screen.size[0] / 1920
 
+    @property
+    def asset_illustrations(self) -> AssetSource:
+        return self.asset_source("illustration")
+
+    @property
+    def asset_sprites(self) -> AssetSource:
+        return self.asset_source("sprite")
+
+    @property
+    def asset_scenes(self) -> AssetSource:
+        return self.asset_source("scene")
+
+    @staticmethod
+    def _as_asset_source(pak: AssetPak | AssetSource) -> AssetSource:
+        # Legacy AssetPak dicts are wrapped so every category shares one interface
+        if isinstance(pak, dict):
+            return LegacyPak(pak)
+        return pak
+
+    def asset_source(self, category: str) -> AssetSource:
+        """
+        Return the asset source of the category, opening its pak and overlays on first use.
+        """
+        source = self._asset_sources.get(category)
+        if source is None:
+            self._asset_sources[category] = open_pak(category)
+            for priority, overlay in open_overlays(category):
+                self.mount_pak(category, overlay, priority)
+            source = self._asset_sources[category]
+        return source
+
+    def mount_pak(self, category: str, pak: AssetPak | AssetSource, priority: int = 0) -> None:
+        """
+        Layer a pak over the category, e.g. DLC or a mod. Its entries replace the ones
+        of lower layers with the same name (see PakStack).
+
+        :param priority: Higher layers win; on equal priority the pak mounted last wins.
+        """
+        source = self.asset_source(category)
+        if not isinstance(source, PakStack):
+            source = self._asset_sources[category] = PakStack(category, source)
+        source.mount(self._as_asset_source(pak), priority)
+
+        # Caches keyed by content are still valid; ones keyed by name may now point elsewhere
+        if category == "sprite":
+            self._sprite_atlases.clear()
+        elif category == "scene":
+            self._scene_scripts.clear()
+
+    @staticmethod
+    def _has_variant(source: AssetSource, name: str, variant: str) -> bool:
+        # A variant baked from an entry an overlay replaces would show the replaced art
+        if variant not in source:
+            return False
+        if isinstance(source, PakStack) and name in source:
+            return source.source_of(variant) is source.source_of(name)
+        return True
+
+    def get_asset_handle(self, category: str, name: str) -> AssetHandle:
+        """
+        Return the shared handle of an entry without taking a reference.
+        Entries with identical content share one handle, so they are decoded once.
+        Unreferenced handles are dropped on the next scene switch.
+        """
+        source = self.asset_source(category)
+        if name not in source:
+            raise KeyError(f"{category}.pak has no entry {name!r}")
+
+        key = source.content_key(name)
+        with self._handles_lock:
+            handle = self._asset_handles.get(key)
+            if handle is None:
+                handle = self._asset_handles[key] = AssetHandle(source, name)
+        return handle
+
+    def acquire_asset(self, category: str, name: str) -> AssetHandle:
+        """
+        Return the handle of an entry and take a reference; the caller must release() it.
+        """
+        return self.get_asset_handle(category, name).acquire()
+
+    def release_unused_assets(self) -> None:
+        """
+        Unload and forget every handle no scene holds a reference to.
+        """
+        with self._handles_lock:
+            for key, handle in list(self._asset_handles.items()):
+                if handle.refcount == 0:
+                    handle.unload()
+                    del self._asset_handles[key]
+
     def get_illustration_iofile(self, filename_no_ext: str) -> io.BytesIO:
-        return io.BytesIO(unpack_encoded_string(self.asset_illustrations["entries"][filename_no_ext]["encoded_string"]))
+        return self.get_asset_handle("illustration", filename_no_ext).iofile()
 
     def get_sprite_iofile(self, filename_no_ext: str) -> io.BytesIO:
-        return io.BytesIO(unpack_encoded_string(self.asset_sprites["entries"][filename_no_ext]["encoded_string"]))
+        return self.get_asset_handle("sprite", filename_no_ext).iofile()
+
+    def load_image(self, category: str, name: str) -> pygame.Surface:
+        """
+        Decode an image entry, not yet converted to the display format.
+        Entries stored as raw pixels skip the PNG decode and are wrapped as they are.
+        """
+        handle = self.get_asset_handle(category, name)
+        meta = self.asset_source(category).entry_meta(name)
+        if "pixels" in meta:
+            return pygame.image.frombuffer(handle.data, tuple(meta["image_size"]), meta["pixels"])
+        return pygame.image.load(handle.iofile())
+
+    def get_illustration_surface(
+            self,
+            filename_no_ext: str,
+            size: tuple[int, int] | None = None,
+            blur: int = 0,
+            convert_mode: str = "convert"
+        ) -> pygame.Surface:
+        """
+        Return an illustration decoded, converted, scaled to size and blurred, through the surface cache.
+        The returned surface is shared and must not be modified.
+
+        :param filename_no_ext: Entry name in illustration.pak.
+        :param size: Target size, None keeps the original size.
+        :param blur: Gaussian blur radius applied after scaling.
+        :param convert_mode: "convert" or "convert_alpha".
+        :return pygame.Surface: The cached surface.
+        """
+        return self._get_surface(*self._illustration_job(filename_no_ext, size, blur, convert_mode))
 
-    def get_scene_data(self, filename_no_ext: str) -> DialogueSceneData:
-        return json.loads(unpack_encoded_string(self.asset_scenes["entries"][filename_no_ext]["encoded_string"]))
+    def get_sprite_surface(self, filename_no_ext: str, scale: float = 1.0) -> pygame.Surface:
+        """
+        Return a sprite decoded with alpha and scaled by the given factor, through the surface cache.
+        The returned surface is shared and must not be modified.
+        """
+        return self._get_surface(*self._sprite_job(filename_no_ext, scale))
+
+    def get_sprite_frame(self, filename_no_ext: str, scale: float = 1.0) -> SpriteFrame:
+        """
+        Return get_sprite_surface along with where it sits in its untrimmed frame, see core/sprite_atlas.py.
+        """
+        surface = self.get_sprite_surface(filename_no_ext, scale)
+        atlas = self._atlas_for_sprite(filename_no_ext, scale)
+        if atlas is not None:
+            return SpriteFrame.from_trim(surface, atlas.trims.get(filename_no_ext), scale / atlas.scale)
+
+        entry_name, entry_scale = self._sprite_entry(filename_no_ext, scale)
+        return SpriteFrame.from_trim(surface, self.asset_sprites.entry_meta(entry_name).get("trim"), entry_scale)
+
+    def get_sprite_sequence(self, name: str, scale: float = 1.0) -> list[SpriteFrame]:
+        """
+        Return the frames of an animation sequence (e.g. 'Ann.blink' for Ann.blink.0, Ann.blink.1, ...)
+        scaled like get_sprite_frame. A still sprite is returned as a sequence of one frame.
+        """
+        return [self.get_sprite_frame(frame_name, scale) for frame_name in self.sprite_sequence_names(name, scale)]
+
+    def sprite_sequence_names(self, name: str, scale: float = 1.0) -> list[str]:
+        """
+        Sprite names of the frames get_sprite_sequence returns, in order.
+        """
+        atlas = self.sprite_atlas(scale)
+        if atlas is not None:
+            return atlas.sequence(name)
+        indexed = sorted(
+            (split[1], frame_name) for frame_name in self.asset_sprites.names()
+            if (split := split_sequence_frame(frame_name)) is not None and split[0] == name
+        )
+        return [frame_name for _, frame_name in indexed] or [name]
+
+    def sprite_atlas(self, scale: float | None = None) -> SpriteAtlas | None:
+        """
+        Return the sprite atlas best suited to draw at the given scale, or None without an atlas.
+        The atlas baked for the window is used unless it would have to be upscaled.
+        """
+        atlases = []
+        for size in (self.screen.get_size(), None):
+            if size not in self._sprite_atlases:
+                self._sprite_atlases[size] = SpriteAtlas.from_source(self.asset_sprites, self._load_atlas_page, size)
+            if self._sprite_atlases[size] is not None:
+                atlases.append(self._sprite_atlases[size])
+
+        for atlas in atlases:
+            if scale is None or scale <= atlas.scale:
+                return atlas
+        return atlases[-1] if atlases else None
+
+    def _atlas_for_sprite(self, filename_no_ext: str, scale: float) -> SpriteAtlas | None:
+        # Atlas builds store no per-frame entries, so one found in the pak comes from an overlay and wins
+        atlas = self.sprite_atlas(scale)
+        if atlas is not None and filename_no_ext in atlas and filename_no_ext not in self.asset_sprites:
+            return atlas
+        return None
+
+    def sprite_entry_name(self, filename_no_ext: str, scale: float = 1.0) -> str:
+        """
+        Name of the sprite.pak entry the sprite is decoded from: its atlas page or its own entry.
+        """
+        atlas = self._atlas_for_sprite(filename_no_ext, scale)
+        return atlas.page_name(filename_no_ext) if atlas is not None else self._sprite_entry(filename_no_ext, scale)[0]
+
+    def _sprite_entry(self, filename_no_ext: str, scale: float) -> tuple[str, float]:
+        # Sprites shown at their authored scale can use the variant baked for this resolution
+        variant = variant_name(filename_no_ext, self.screen.get_size())
+        if scale == self.uniform_scale and self._has_variant(self.asset_sprites, filename_no_ext, variant):
+            return variant, 1.0
+        return filename_no_ext, scale
+
+    def _load_atlas_page(self, page_name: str) -> pygame.Surface:
+        return self._get_surface(
+            (self.asset_sprites.content_key(page_name), None, 0, "convert_alpha"),
+            lambda: self.load_image("sprite", page_name).convert_alpha()
+        )
+
+    def prefetch_illustration(
+            self,
+            filename_no_ext: str,
+            size: tuple[int, int] | None = None,
+            blur: int = 0,
+            convert_mode: str = "convert"
+        ) -> None:
+        """
+        Schedule get_illustration_surface with the same arguments on the prefetch workers.
+        """
+        self.prefetcher.schedule(*self._illustration_job(filename_no_ext, size, blur, convert_mode))
+
+    def prefetch_sprite(self, filename_no_ext: str, scale: float = 1.0) -> None:
+        """
+        Schedule get_sprite_surface with the same arguments on the prefetch workers.
+        """
+        self.prefetcher.schedule(*self._sprite_job(filename_no_ext, scale))
+
+    def _get_surface(self, key: SurfaceKey, build: Callable[[], pygame.Surface]) -> pygame.Surface:
+        surface = self.surface_cache.get(key)
+        if surface is None:
+            # Wait for the worker rather than decoding the same asset twice
+            surface = self.prefetcher.wait(key)
+        if surface is None:
+            surface = build()
+            self.surface_cache.put(key, surface)
+        return surface
+
+    def _illustration_job(
+            self,
+            filename_no_ext: str,
+            size: tuple[int, int] | None,
+            blur: int,
+            convert_mode: str
+        ) -> tuple[SurfaceKey, Callable[[], pygame.Surface]]:
+        # A variant baked for this exact size (and blur) skips the rescale (and the live blur)
+        entry_name, entry_blur = filename_no_ext, blur
+        if size is not None:
+            source = self.asset_illustrations
+            if blur and self._has_variant(source, filename_no_ext, variant_name(filename_no_ext, size, blur)):
+                entry_name, entry_blur = variant_name(filename_no_ext, size, blur), 0
+            elif self._has_variant(source, filename_no_ext, variant_name(filename_no_ext, size)):
+                entry_name = variant_name(filename_no_ext, size)
+
+        def build() -> pygame.Surface:
+            surface = self.load_image("illustration", entry_name)
+            surface = surface.convert_alpha() if convert_mode == "convert_alpha" else surface.convert()
+            if size is not None and surface.get_size() != size:
+                surface = pygame.transform.smoothscale(surface, size)
+            if entry_blur:
+                surface = pygame.transform.gaussian_blur(surface, entry_blur)
+            return surface
+
+        return (self.asset_illustrations.content_key(entry_name), size, entry_blur, convert_mode), build
+
+    def _sprite_job(self, filename_no_ext: str, scale: float) -> tuple[SurfaceKey, Callable[[], pygame.Surface]]:
+        # Atlas frames are views into a shared page; only other scales need a copy
+        atlas = self._atlas_for_sprite(filename_no_ext, scale)
+        if atlas is not None:
+            page, rect = atlas.frames[filename_no_ext]
+            frame_scale = scale / atlas.scale
+
+            def build_frame() -> pygame.Surface:
+                frame = atlas.frame(filename_no_ext)
+                if frame_scale == 1.0:
+                    return frame
+                return pygame.transform.smoothscale_by(frame, frame_scale)
+
+            page_key = self.asset_sprites.content_key(atlas.pages[page])
+            return (page_key, ("frame", *rect, frame_scale), 0, "convert_alpha"), build_frame
+
+        entry_name, entry_scale = self._sprite_entry(filename_no_ext, scale)
+
+        def build() -> pygame.Surface:
+            surface = self.load_image("sprite", entry_name).convert_alpha()
+            if entry_scale != 1.0:
+                surface = pygame.transform.smoothscale_by(surface, entry_scale)
+            return surface
+
+        transform = ("scale", entry_scale) if entry_scale != 1.0 else None
+        return (self.asset_sprites.content_key(entry_name), transform, 0, "convert_alpha"), build
+
+    def get_scene_data(self, filename_no_ext: str) -> DialogueScript:
+        """
+        Return the compiled script of a scene. Scripts are immutable and kept once loaded.
+        """
+        script = self._scene_scripts.get(filename_no_ext)
+        if script is None:
+            if filename_no_ext not in self.asset_scenes:
+                raise KeyError(f"scene.pak has no entry {filename_no_ext!r}")
+            # Only the base build may hold compiled (marshalled) scenes, see core/scene_compiler.py
+            source = self.asset_scenes
+            trusted = not isinstance(source, PakStack) or source.source_of(filename_no_ext) is source.base
+            script = load_scene(source.read(filename_no_ext), filename_no_ext, trusted)
+            self._scene_scripts[filename_no_ext] = script
+        return script
+
+    def preload_language(self, lang_code: str) -> None:
+        """
+        Load the language data of a language on the prefetch workers, so switching to it
+        doesn't touch the disk.
+        """
+        if lang_code in self._languages:
+            return
+        future = self.prefetcher.submit(self._load_language, lang_code)
+        if future is not None:
+            self._languages[lang_code] = future
+
+    def _load_language(self, lang_code: str) -> LangData:
+        language_data = LangData.from_pak(lang_code)
+        self.fonts.preload(language_data.get_str("font_path"))
+        return language_data
 
     def reload_language_data(self) -> None:
         """
         Read language data based on current language and assign it to self.language_data.
+        Scenes are told to reload their text on the next frame, only when the language changed.
         """
         curr_language = self.config_parser.get("General", "language", fallback = DEFAULT_LANGUAGE_CODE)
-        self.language_data = LangData.from_pak(curr_language)
+        if curr_language == self.language_code:
+            return
+
+        language_data = self._languages.get(curr_language)
+        if isinstance(language_data, Future):
+            try:
+                language_data = language_data.result()
+            except (OSError, PakFormatError, pygame.error):
+                # Load it again below so the error surfaces here
+                language_data = None
+        if language_data is None:
+            language_data = LangData.from_pak(curr_language)
+        self._languages[curr_language] = language_data
+
+        self.language_data = language_data
+        self.language_code = curr_language
+        # Fonts of another font file are stale; ones of the same file stay valid
+        self.fonts.invalidate(language_data.get_str("font_path"))
+        TEXT_CACHE.clear()
+        clear_glyph_atlases()
         self.reloading_language_data = True
 
+    def get_font(self, size: int, style: FontStyle = FontStyle.NORMAL) -> pygame.font.Font:
+        """
+        Return the shared font of the current language at the given pixel size, see FontRegistry.
+        """
+        return self.fonts.get(self.language_data.get_str("font_path"), size, style)
+
     def stack_push(self, scene: Scene) -> None:
         """
         Push a scene on the stack and call enter so it can grab this manager.
@@ -93,6 +469,9 @@ class SceneManager:
         self.stack_push(self._pending_switch)
         self._pending_switch = None
 
+        # Handles the previous scenes dropped are not needed anymore
+        self.release_unused_assets()
+
     def update(self, delta: float) -> None:
         """
         Run the per-frame pipeline: events, input, update, draw, and switches.
@@ -139,6 +518,13 @@ class SceneManager:
         while self.scene_stack:
             self.stack_pop()
 
+    def shutdown(self) -> None:
+        """
+        Clear the stack and stop background workers. Call before pygame.quit().
+        """
+        self.clear()
+        self.prefetcher.shutdown()
+
     def top(self) -> Optional[Scene]:
         """
         Return the current top scene, or None if the stack is empty.
@@ -54,8 +54,12 @@ class SettingsScreen(Scene):
         self.mouse_pos: tuple[int, int] = (0, 0)
 
     def enter(self) -> None:
+        # Have every language ready by the time the screen is left
+        for lang_code in SUPPORTED_LANGUAGE_CODES:
+            self.sm.preload_language(lang_code)
+
         # Font
-        font = pygame.font.Font(self.sm.language_data.get_str("font_path"), self.rscale(40))
+        font = self.sm.get_font(self.rscale(40))
 
         # Background
         background_opacity = 0.9
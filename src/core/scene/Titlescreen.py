@@ -1,11 +1,11 @@
 import pygame
 
 from typing import Union
-from core.path_resolver import asset_illustration
 from core.locale.pak_loader import LangData
 from core.scene.EventState import EventState
 from core.scene.SceneManager import SceneManager
 from core.scene.Scene import Scene
+from core.text_cache import render_text
 from core.ui.components.AnimatedSlidingButton import AnimatedSlidingButton
 from core.scene.SettingsScreen import SettingsScreen
 from core.scene.SaveSelector import SaveSelector
@@ -76,7 +76,8 @@ class Titlescreen(Scene):
             btn.render(surface)
 
     def reload_language_data(self) -> None:
-        self.reload_elements(self.sm.language_data)
+        # The background and the overlay don't depend on the language
+        self._reload_text(self.sm.language_data)
 
     def scale(self, base_value: Union[int, float]) -> float:
         return base_value * self.sm.uniform_scale
@@ -85,35 +86,34 @@ class Titlescreen(Scene):
         return round(base_value * self.sm.uniform_scale)
 
     def reload_elements(self, language_data: LangData)-> None:
-        # Fonts
-        font_path = language_data.get_str("font_path")
-        self.title_font = pygame.font.Font(font_path, self.rscale(96))
-        self.button_font = pygame.font.Font(font_path, self.rscale(48))
-
         # Background
-        bg_img = pygame.image.load(
-            asset_illustration("title_background.png")
-        ).convert()
+        # Illustrations and supported resolutions are all 16:9, so a plain scale fills the window
+        self.background = self.sm.get_illustration_surface("title_background", self.windows_size)
 
-        bg_img_w, bg_img_h = bg_img.get_size()
+        self._reload_text(language_data)
 
-        # Background Scaling
-        if bg_img_w == 0 or bg_img_h == 0:
-            self.background = pygame.transform.scale(bg_img, self.windows_size)
-        else:
-            bg_img_scale = max(self.windows_size[0] / bg_img_w, self.windows_size[1] / bg_img_h)
-            scaled_size = (int(bg_img_w * bg_img_scale), int(bg_img_h * bg_img_scale))
-            scaled_bg_img = pygame.transform.smoothscale(bg_img, scaled_size)
+        # Trapezoid
+        self.trapezoid_overlay = pygame.Surface(self.windows_size, pygame.SRCALPHA)
+        self.trapezoid_color = (0, 0, 0, 160)
+        top_left = (0, 0)
+        top_right = (self.windows_size[0] * 0.45, 0)
+        bottom_right = (self.windows_size[0] * 0.30, self.windows_size[1])
+        bottom_left = (0, self.windows_size[1])
+
+        pygame.draw.polygon(
+            self.trapezoid_overlay,
+            self.trapezoid_color,
+            [top_left, top_right, bottom_right, bottom_left]
+        )
 
-            self.background = pygame.Surface(self.windows_size)
-            bg_offset_x = (self.windows_size[0] - scaled_size[0]) // 2
-            bg_offset_y = (self.windows_size[1] - scaled_size[1]) // 2
-            self.background.blit(scaled_bg_img, (bg_offset_x, bg_offset_y))
+    def _reload_text(self, language_data: LangData) -> None:
+        # Fonts
+        font_path = language_data.get_str("font_path")
+        self.title_font = self.sm.fonts.get(font_path, self.rscale(96))
+        self.button_font = self.sm.fonts.get(font_path, self.rscale(48))
 
         # Title
-        self.title = self.title_font.render(
-            language_data.get_str("titlescreen", "title"), True, (255, 255, 255)
-        )
+        self.title = render_text(self.title_font, language_data.get_str("titlescreen", "title"), True, (255, 255, 255))
 
         # Buttons
         button_data = [
@@ -134,17 +134,3 @@ class Titlescreen(Scene):
             )
             btn = AnimatedSlidingButton(text, action, topleft, self.button_font, self.button_hover_offset, self.button_hover_animation_speed)
             self.buttons.append(btn)
-
-        # Trapezoid
-        self.trapezoid_overlay = pygame.Surface(self.windows_size, pygame.SRCALPHA)
-        self.trapezoid_color = (0, 0, 0, 160)
-        top_left = (0, 0)
-        top_right = (self.windows_size[0] * 0.45, 0)
-        bottom_right = (self.windows_size[0] * 0.30, self.windows_size[1])
-        bottom_left = (0, self.windows_size[1])
-
-        pygame.draw.polygon(
-            self.trapezoid_overlay,
-            self.trapezoid_color,
-            [top_left, top_right, bottom_right, bottom_left]
-        )
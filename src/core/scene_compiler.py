@@ -0,0 +1,403 @@
+"""
+Compile JSON scene scripts (DialogueSceneData) into DialogueScript, see core/scene/DialogueStructure.py.
+
+scripts/build_assets.py compiles every scene at build time and fails the build on
+invalid arguments or references to missing assets, characters and scenes. The result
+is stored in scene.pak as
+
+    [SCENE_MAGIC][SCENE_FORMAT: uint16][marshal data]
+
+Action types and easings are stored as small integers and every string is interned,
+so loading a scene is a single marshal.loads plus building the named tuples.
+Scenes still stored as JSON (older paks) are compiled when loaded.
+
+marshal is not safe against crafted input, so compiled scenes are only loaded
+from the base build. Overlays (mods, DLC) ship their scenes as JSON.
+"""
+import sys
+import json
+import marshal
+import struct
+
+from collections.abc import Callable, Collection
+from enum import IntEnum
+from typing import Any
+
+from core.scene.DialogueStructure import (
+    ACTION_CLASSES, ActionType, BackgroundTransition, ChangeDialogueScene, DialogueAction, DialogueCharacter,
+    DialogueSceneData, DialogueScript, DialogueStep, Easing, HideCharacter, MoveCharacter, PlayBgm, PlaySfx,
+    Prompt, PromptOption, SceneBranch, ScreenShake, SetBackground, SetExpression, SetHighlight, ShowCharacter,
+    ShowText
+)
+from core.sprite_atlas import group_sequences
+
+SCENE_MAGIC = b"NXSC"
+SCENE_FORMAT = 1
+
+# magic, format
+_SCENE_HEADER = struct.Struct("<4sH")
+
+BACKGROUND_TRANSITIONS = ("instant", "fade")
+
+_MISSING = object()
+
+
+class SceneCompileError(ValueError):
+    """Raised with every problem found in a scene script."""
+    def __init__(self, scene_id: str, errors: list[str]) -> None:
+        super().__init__(
+            f"Scene {scene_id!r} has {len(errors)} error(s):\n" + "\n".join(f"  - {error}" for error in errors)
+        )
+        self.scene_id = scene_id
+        self.errors = errors
+
+
+class _Args:
+    """Typed access to the args of one action. Problems are collected instead of raised."""
+    def __init__(self, args: dict[str, Any], where: str, errors: list[str]) -> None:
+        self.args = args
+        self.where = where
+        self.errors = errors
+
+    def error(self, message: str) -> None:
+        self.errors.append(f"{self.where}: {message}")
+
+    def _get(self, key: str, default: Any) -> Any:
+        if key in self.args:
+            return self.args[key]
+        if default is _MISSING:
+            self.error(f"missing argument {key!r}")
+        return default
+
+    def text(self, key: str, default: Any = _MISSING) -> str:
+        value = self._get(key, default)
+        return sys.intern(str(value)) if value is not _MISSING else ""
+
+    def optional_text(self, key: str) -> str | None:
+        value = self.args.get(key)
+        return sys.intern(str(value)) if value is not None else None
+
+    def number(self, key: str, default: Any = _MISSING) -> float:
+        value = self._get(key, default)
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            if value is not _MISSING:
+                self.error(f"argument {key!r} must be a number, got {value!r}")
+            return 0.0
+
+    def integer(self, key: str, default: Any = _MISSING) -> int:
+        value = self._get(key, default)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            if value is not _MISSING:
+                self.error(f"argument {key!r} must be an integer, got {value!r}")
+            return 0
+
+    def flag(self, key: str, default: Any = _MISSING) -> bool:
+        return bool(self._get(key, default))
+
+
+class _SceneCompiler:
+    def __init__(
+            self,
+            scene_id: str,
+            illustrations: Collection[str] | None,
+            sprites: Collection[str] | None,
+            scenes: Collection[str] | None
+        ) -> None:
+        self.scene_id = scene_id
+        self.illustrations = illustrations
+        self.sprites = sprites
+        self.sequences = group_sequences(sprites) if sprites is not None else {}
+        self.scenes = scenes
+        self.characters: dict[str, DialogueCharacter] = {}
+        self.errors: list[str] = []
+
+    def compile(self, data: DialogueSceneData) -> DialogueScript:
+        if not isinstance(data, dict):
+            raise SceneCompileError(self.scene_id, [f"scene must be an object, got {type(data).__name__}"])
+
+        for idx, character_data in self.objects(data.get("characters", []), "characters", lambda idx: f"character {idx}"):
+            character = self.character(character_data, f"character {idx}")
+            if character is not None:
+                self.characters[character.id] = character
+
+        steps = []
+        for idx, step in self.objects(data.get("steps", []), "steps", lambda idx: f"step {idx}"):
+            where = f"step {idx} ({step.get('id', '')})"
+            actions = tuple(
+                action for action_idx, action_data in self.objects(
+                    step.get("actions", []), f"{where}: actions", lambda action_idx: f"{where}, action {action_idx}"
+                )
+                if (action := self.action(action_data, f"{where}, action {action_idx}")) is not None
+            )
+            steps.append(DialogueStep(sys.intern(str(step.get("id", idx))), actions))
+
+        if self.errors:
+            raise SceneCompileError(self.scene_id, self.errors)
+        return DialogueScript(
+            tuple(self.characters.values()),
+            tuple(steps),
+            self.color(data, "text_color"),
+            self.color(data, "slash_color"),
+        )
+
+    def objects(self, value: Any, where: str, item_where: Callable[[int], str]) -> list[tuple[int, dict[str, Any]]]:
+        """
+        (index, item) of a JSON list of objects. Anything else is reported and skipped.
+        """
+        if not isinstance(value, list):
+            self.errors.append(f"{where} must be a list, got {value!r}")
+            return []
+        items = []
+        for idx, item in enumerate(value):
+            if isinstance(item, dict):
+                items.append((idx, item))
+            else:
+                self.errors.append(f"{item_where(idx)}: must be an object, got {item!r}")
+        return items
+
+    def color(self, data: DialogueSceneData, key: str) -> tuple[int, int, int]:
+        value = data.get(key, (214, 214, 214))
+        try:
+            r, g, b = (int(v) for v in value) # type: ignore
+            return (r, g, b)
+        except (TypeError, ValueError):
+            self.errors.append(f"{key} must be an RGB triple, got {value!r}")
+            return (214, 214, 214)
+
+    def character(self, data: dict[str, Any], where: str) -> DialogueCharacter | None:
+        args = _Args(data, where, self.errors)
+        character = DialogueCharacter(
+            args.text("id"),
+            args.text("sprite_filename"),
+            args.number("scale", 1.0),
+            args.integer("default_layer", 0),
+        )
+        if self.sprites is not None and character.sprite_filename not in self.sprites:
+            args.error(f"sprite {character.sprite_filename!r} doesn't exist")
+        if character.id in self.characters:
+            args.error(f"duplicated character id {character.id!r}")
+        return character
+
+    def character_id(self, args: _Args, allow_empty: bool = False) -> str:
+        character_id = args.text("character_id")
+        if character_id not in self.characters and not (allow_empty and character_id == ""):
+            args.error(f"unknown character {character_id!r}")
+        return character_id
+
+    def action(self, data: dict[str, Any], where: str) -> DialogueAction | None:
+        type_name = str(data.get("type", ""))
+        try:
+            action_type = ActionType[type_name.upper()]
+        except KeyError:
+            self.errors.append(f"{where}: unknown action type {type_name!r}")
+            return None
+
+        where = f"{where} ({type_name})"
+        raw_args = data.get("args", {})
+        if action_type == ActionType.CHANGE_DIALOGUE_SCENE:
+            return self.change_dialogue_scene(raw_args, where)
+        if not isinstance(raw_args, dict):
+            self.errors.append(f"{where}: args must be an object")
+            return None
+
+        args = _Args(raw_args, where, self.errors)
+        match action_type:
+            case ActionType.SHOW_TEXT:
+                return ShowText(args.text("speaker_name"), args.text("speaker_title"), args.text("text"))
+            case ActionType.SET_BACKGROUND:
+                return self.set_background(args)
+            case ActionType.PLAY_BGM:
+                return PlayBgm(dict(raw_args))
+            case ActionType.PLAY_SFX:
+                return PlaySfx(dict(raw_args))
+            case ActionType.SHOW_CHARACTER:
+                return ShowCharacter(self.character_id(args), args.number("x"), args.number("y"))
+            case ActionType.MOVE_CHARACTER:
+                return MoveCharacter(
+                    self.character_id(args),
+                    args.number("from_x"),
+                    args.number("from_y"),
+                    args.number("to_x"),
+                    args.number("to_y"),
+                    args.number("duration"),
+                    self.easing(args),
+                )
+            case ActionType.HIDE_CHARACTER:
+                return HideCharacter(self.character_id(args))
+            case ActionType.SET_HIGHLIGHT:
+                return SetHighlight(self.character_id(args, allow_empty=True), args.flag("dim_others"))
+            case ActionType.SCREEN_SHAKE:
+                return ScreenShake(
+                    args.number("duration"),
+                    args.number("intensity"),
+                    args.integer("frequency"),
+                    args.flag("infinite"),
+                )
+            case ActionType.PROMPT:
+                return self.prompt(args)
+            case ActionType.SET_EXPRESSION:
+                return self.set_expression(args)
+        return None
+
+    def set_background(self, args: _Args) -> SetBackground:
+        filename = args.optional_text("filename")
+        if filename is not None and self.illustrations is not None and filename not in self.illustrations:
+            args.error(f"illustration {filename!r} doesn't exist")
+
+        transition = None
+        transition_data = args.args.get("transition")
+        if isinstance(transition_data, dict):
+            transition_args = _Args(transition_data, f"{args.where} transition", self.errors)
+            transition = BackgroundTransition(
+                transition_args.text("type", "instant"),
+                transition_args.number("duration", 0.0),
+            )
+            if transition.type not in BACKGROUND_TRANSITIONS:
+                args.error(f"unknown transition {transition.type!r}, expected one of {BACKGROUND_TRANSITIONS}")
+
+        return SetBackground(filename, args.integer("blur", 0), transition)
+
+    def easing(self, args: _Args) -> Easing:
+        name = args.text("easing")
+        try:
+            return Easing[name.upper()]
+        except KeyError:
+            args.error(f"unknown easing {name!r}, expected one of {[e.name.lower() for e in Easing]}")
+            return Easing.LINEAR
+
+    def prompt(self, args: _Args) -> Prompt:
+        options = []
+        for idx, option in self.objects(
+            args.args.get("options", []), f"{args.where}: options", lambda idx: f"{args.where} option {idx}"
+        ):
+            option_args = _Args(option, f"{args.where} option {idx}", self.errors)
+            options.append(PromptOption(option_args.text("message"), option_args.text("flag_value")))
+        if not options:
+            args.error("prompt has no options")
+        return Prompt(args.text("id"), args.text("message"), tuple(options))
+
+    def change_dialogue_scene(self, packages: Any, where: str) -> ChangeDialogueScene | None:
+        if not isinstance(packages, list):
+            self.errors.append(f"{where}: args must be a list of scene branches")
+            return None
+
+        branches = []
+        for idx, package in self.objects(packages, f"{where}: args", lambda idx: f"{where} branch {idx}"):
+            args = _Args(package, f"{where} branch {idx}", self.errors)
+            scene_id = args.text("scene_id")
+            if self.scenes is not None and scene_id not in self.scenes:
+                args.error(f"scene {scene_id!r} doesn't exist")
+            flags = package.get("required_g_flags", {})
+            if not isinstance(flags, dict):
+                args.error(f"required_g_flags must be an object, got {flags!r}")
+                flags = {}
+            required_g_flags = {sys.intern(str(k)): sys.intern(str(v)) for k, v in flags.items()}
+            branches.append(SceneBranch(scene_id, required_g_flags))
+        return ChangeDialogueScene(tuple(branches))
+
+    def set_expression(self, args: _Args) -> SetExpression:
+        action = SetExpression(
+            self.character_id(args),
+            args.text("expression", ""),
+            args.number("fps", 12),
+            args.flag("loop", True),
+        )
+        character = self.characters.get(action.character_id)
+        if character is not None and action.expression and self.sprites is not None:
+            sprite_name = f"{character.sprite_filename}.{action.expression}"
+            if sprite_name not in self.sprites and sprite_name not in self.sequences:
+                args.error(f"sprite {character.sprite_filename!r} has no expression {action.expression!r}")
+        return action
+
+
+def compile_scene(
+        data: DialogueSceneData,
+        scene_id: str = "<scene>",
+        *,
+        illustrations: Collection[str] | None = None,
+        sprites: Collection[str] | None = None,
+        scenes: Collection[str] | None = None
+    ) -> DialogueScript:
+    """
+    Validate and compile a JSON scene script.
+
+    :param data: Parsed JSON of the scene.
+    :param scene_id: Name of the scene, used in error messages.
+    :param illustrations: Known illustration names; None skips the check.
+    :param sprites: Known sprite frame names; None skips the check.
+    :param scenes: Known scene names; None skips the check.
+    :raise SceneCompileError: With every problem found, not only the first one.
+    """
+    return _SceneCompiler(scene_id, illustrations, sprites, scenes).compile(data)
+
+
+def _plain(value: Any) -> Any:
+    # marshal only takes exact builtin types
+    if isinstance(value, IntEnum):
+        return int(value)
+    if isinstance(value, tuple):
+        return tuple(_plain(v) for v in value)
+    return value
+
+
+_ACTION_CODES: dict[type, int] = {cls: int(code) for code, cls in ACTION_CLASSES.items()}
+
+_ACTION_LOADERS: dict[int, Callable[[tuple], DialogueAction]] = {
+    int(code): cls._make for code, cls in ACTION_CLASSES.items() # type: ignore
+}
+_ACTION_LOADERS[ActionType.SET_BACKGROUND] = lambda f: SetBackground(
+    f[0], f[1], BackgroundTransition._make(f[2]) if f[2] is not None else None
+)
+_ACTION_LOADERS[ActionType.MOVE_CHARACTER] = lambda f: MoveCharacter(*f[:6], Easing(f[6]))
+_ACTION_LOADERS[ActionType.PROMPT] = lambda f: Prompt(f[0], f[1], tuple(PromptOption._make(o) for o in f[2]))
+_ACTION_LOADERS[ActionType.CHANGE_DIALOGUE_SCENE] = lambda f: ChangeDialogueScene(
+    tuple(SceneBranch._make(b) for b in f[0])
+)
+
+
+def dump_scene(script: DialogueScript) -> bytes:
+    steps = tuple(
+        (step.id, tuple((_ACTION_CODES[type(action)], *_plain(action)) for action in step.actions))
+        for step in script.steps
+    )
+    body = (_plain(script.characters), steps, script.text_color, script.slash_color)
+    return _SCENE_HEADER.pack(SCENE_MAGIC, SCENE_FORMAT) + marshal.dumps(body)
+
+
+def is_compiled_scene(data: Any) -> bool:
+    return bytes(data[:len(SCENE_MAGIC)]) == SCENE_MAGIC
+
+
+def load_compiled_scene(data: Any) -> DialogueScript:
+    magic, scene_format = _SCENE_HEADER.unpack_from(data)
+    if magic != SCENE_MAGIC or scene_format != SCENE_FORMAT:
+        raise ValueError(f"Unsupported compiled scene (format {scene_format}), please rebuild scene.pak")
+
+    characters, steps, text_color, slash_color = marshal.loads(memoryview(data)[_SCENE_HEADER.size:])
+    return DialogueScript(
+        tuple(DialogueCharacter._make(c) for c in characters),
+        tuple(
+            DialogueStep(step_id, tuple(_ACTION_LOADERS[a[0]](a[1:]) for a in actions))
+            for step_id, actions in steps
+        ),
+        text_color,
+        slash_color,
+    )
+
+
+def load_scene(data: Any, scene_id: str = "<scene>", trusted: bool = True) -> DialogueScript:
+    """
+    Load a scene entry: compiled scenes are unmarshalled, JSON scenes are compiled.
+
+    :param trusted: The entry comes from the base build. Untrusted entries must be JSON.
+    :raise SceneCompileError: The scene is invalid, or compiled but untrusted.
+    """
+    if is_compiled_scene(data):
+        if not trusted:
+            raise SceneCompileError(scene_id, ["compiled scenes are only loaded from the base build, ship overlay scenes as JSON"])
+        return load_compiled_scene(data)
+    return compile_scene(json.loads(bytes(data)), scene_id)
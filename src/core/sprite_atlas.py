@@ -0,0 +1,167 @@
+"""
+Sprite atlases baked by scripts/build_assets.py --atlas.
+
+Every frame of a character (its base sprite, expressions and animation frames)
+is packed into a few shared pages stored as regular sprite.pak entries, plus a
+JSON frame table:
+
+    atlas/frames[@WxH]          {"scale", "pages", "frames", "sequences"}
+    atlas/<character>/<i>[@WxH] page images
+
+Sprite source files follow the naming convention
+
+    <character>.png                  base sprite, e.g. Ann.png
+    <character>.<expression>.png     still expression, e.g. Ann.smile.png
+    <character>.<sequence>.<n>.png   n-th frame of an animation, e.g. Ann.blink.0.png
+
+Sprites are cropped to their opaque bounding box at build time. A trimmed frame
+records [x, y, width, height]: its offset inside the untrimmed frame and the
+untrimmed size, as the "trim" meta of its entry or after its rect in the frame table.
+"""
+import json
+import pygame
+
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple
+
+from core.asset_manager import AssetSource
+from core.pak_format import variant_name
+
+
+ATLAS_FRAMES = "atlas/frames"
+
+
+class SpriteFrame(NamedTuple):
+    """
+    A sprite surface and where it sits in its untrimmed frame.
+    Sprites are placed by the untrimmed frame, so trimming doesn't move them.
+    """
+    surface: pygame.Surface
+    offset: tuple[int, int]
+    size: tuple[int, int]  # Untrimmed size
+
+    @classmethod
+    def untrimmed(cls, surface: pygame.Surface) -> "SpriteFrame":
+        return cls(surface, (0, 0), surface.get_size())
+
+    @classmethod
+    def from_trim(cls, surface: pygame.Surface, trim: list[int] | tuple[int, ...] | None, scale: float = 1.0) -> "SpriteFrame":
+        """
+        :param trim: [x, y, width, height] recorded at build time, None for untrimmed sprites.
+        :param scale: Factor the surface was scaled by since it was trimmed.
+        """
+        if not trim:
+            return cls.untrimmed(surface)
+        x, y, w, h = (round(v * scale) for v in trim)
+        return cls(surface, (x, y), (w, h))
+
+
+def atlas_frames_name(size: tuple[int, int] | None = None) -> str:
+    """
+    Entry name of the frame table, optionally of the atlas baked for a window size.
+    """
+    return variant_name(ATLAS_FRAMES, size) if size is not None else ATLAS_FRAMES
+
+
+def atlas_page_name(character: str, index: int, size: tuple[int, int] | None = None) -> str:
+    name = f"atlas/{character}/{index}"
+    return variant_name(name, size) if size is not None else name
+
+
+def frame_character(frame_name: str) -> str:
+    """
+    Character a frame belongs to, e.g. 'Ann' for 'Ann.blink.0'.
+    """
+    return frame_name.split(".", 1)[0]
+
+
+def split_sequence_frame(frame_name: str) -> tuple[str, int] | None:
+    """
+    Split an animation frame name into (sequence name, frame index),
+    e.g. 'Ann.blink.2' -> ('Ann.blink', 2). Returns None for still frames.
+    """
+    sequence, _, index = frame_name.rpartition(".")
+    if not sequence or not index.isdigit():
+        return None
+    return sequence, int(index)
+
+
+def group_sequences(frame_names: Iterable[str]) -> dict[str, list[str]]:
+    """
+    Collect animation frames into sequences ordered by frame index.
+
+    :return dict: Sequence name -> frame names.
+    """
+    indexed: dict[str, list[tuple[int, str]]] = {}
+    for name in frame_names:
+        split = split_sequence_frame(name)
+        if split is not None:
+            indexed.setdefault(split[0], []).append((split[1], name))
+    return {sequence: [name for _, name in sorted(frames)] for sequence, frames in sorted(indexed.items())}
+
+
+class SpriteAtlas:
+    """
+    Frame table of a sprite atlas. Frames are handed out as subsurfaces of their
+    page, so switching expressions costs neither a decode nor an allocation once
+    the page is loaded.
+    """
+    def __init__(self, table: dict[str, Any], load_page: Callable[[str], pygame.Surface]) -> None:
+        """
+        :param table: Decoded frame table.
+        :param load_page: Returns the display-converted surface of a page entry.
+        """
+        self.scale = float(table["scale"])
+        self.pages: list[str] = list(table["pages"])
+        self.frames: dict[str, tuple[int, pygame.Rect]] = {
+            name: (int(page), pygame.Rect(x, y, w, h)) for name, (page, x, y, w, h, *_) in table["frames"].items()
+        }
+        self.trims: dict[str, list[int]] = {
+            name: trim for name, (_, _, _, _, _, *trim) in table["frames"].items() if trim
+        }
+        self.sequences: dict[str, list[str]] = {
+            name: list(frames) for name, frames in table.get("sequences", {}).items()
+        }
+        self._load_page = load_page
+
+    @classmethod
+    def from_source(
+            cls,
+            source: AssetSource,
+            load_page: Callable[[str], pygame.Surface],
+            size: tuple[int, int] | None = None
+        ) -> "SpriteAtlas | None":
+        """
+        Read the frame table of the atlas baked for size (or the reference atlas).
+        Returns None when the pak holds no such atlas.
+        """
+        name = atlas_frames_name(size)
+        if name not in source:
+            return None
+        return cls(json.loads(bytes(source.read(name))), load_page)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.frames
+
+    def page_name(self, frame_name: str) -> str:
+        """
+        Entry name of the page holding the frame.
+        """
+        return self.pages[self.frames[frame_name][0]]
+
+    def frame(self, name: str) -> pygame.Surface:
+        """
+        Return the frame as a subsurface of its page. Shared; must not be modified.
+        """
+        page, rect = self.frames[name]
+        return self._load_page(self.pages[page]).subsurface(rect)
+
+    def sequence(self, name: str) -> list[str]:
+        """
+        Frame names of an animation sequence; a still frame is a sequence of one.
+        """
+        if name in self.sequences:
+            return self.sequences[name]
+        if name in self.frames:
+            return [name]
+        raise KeyError(f"Sprite atlas has no frame or sequence {name!r}")
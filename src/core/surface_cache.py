@@ -0,0 +1,104 @@
+import pygame
+import threading
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+type SurfaceKey = tuple[Hashable, ...]
+
+
+class SurfaceCache:
+    """
+    LRU cache of decoded, display-converted surfaces bounded by a byte budget.
+
+    Keys are tuples such as (content key, transform, blur, convert mode); the content key
+    comes from AssetSource.content_key, so assets stored under several names share entries.
+    Cached surfaces are shared between scenes and must be treated as read-only.
+    Safe to fill from worker threads.
+    """
+    def __init__(self, budget_bytes: int) -> None:
+        self.budget_bytes = max(0, budget_bytes)
+        self.used_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._surfaces: OrderedDict[SurfaceKey, pygame.Surface] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def surface_bytes(surface: pygame.Surface) -> int:
+        # A subsurface shares its parent's pixels (and pitch); count only the area it views
+        if surface.get_parent() is not None:
+            return surface.get_width() * surface.get_height() * surface.get_bytesize()
+        return surface.get_pitch() * surface.get_height()
+
+    def __contains__(self, key: SurfaceKey) -> bool:
+        return key in self._surfaces
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def get(self, key: SurfaceKey) -> pygame.Surface | None:
+        """
+        Return the cached surface and mark it as most recently used, or None on a miss.
+        """
+        with self._lock:
+            surface = self._surfaces.get(key)
+            if surface is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+    def put(self, key: SurfaceKey, surface: pygame.Surface) -> None:
+        """
+        Insert a surface, evicting least recently used ones until it fits in the budget.
+        Surfaces larger than the whole budget are not cached at all.
+        """
+        size = self.surface_bytes(surface)
+        if size > self.budget_bytes:
+            return
+
+        with self._lock:
+            old = self._surfaces.pop(key, None)
+            if old is not None:
+                self.used_bytes -= self.surface_bytes(old)
+
+            while self._surfaces and self.used_bytes + size > self.budget_bytes:
+                _, evicted = self._surfaces.popitem(last=False)
+                self.used_bytes -= self.surface_bytes(evicted)
+                self.evictions += 1
+
+            self._surfaces[key] = surface
+            self.used_bytes += size
+
+    def get_or_create(self, key: SurfaceKey, factory: Callable[[], pygame.Surface]) -> pygame.Surface:
+        """
+        Return the cached surface, building and caching it with factory() on a miss.
+        """
+        surface = self.get(key)
+        if surface is None:
+            surface = factory()
+            self.put(key, surface)
+        return surface
+
+    def clear(self) -> None:
+        with self._lock:
+            self._surfaces.clear()
+            self.used_bytes = 0
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._surfaces),
+            "used_bytes": self.used_bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,38 @@
+"""
+Rendered text shared by every scene and UI component.
+
+Labels, arrows and values are drawn every frame but rarely change, so renders
+are kept in a SurfaceCache keyed by (font, text, antialias, color). Fonts are
+shared through FontRegistry, so the same label rendered by two scenes is one
+entry. Returned surfaces are shared and must not be modified.
+"""
+import pygame
+
+from collections.abc import Callable, Hashable
+
+from core.surface_cache import SurfaceCache
+
+type Color = tuple[int, int, int] | tuple[int, int, int, int]
+
+# Budget set from the config by SceneManager
+TEXT_CACHE = SurfaceCache(16 * 1024 * 1024)
+
+
+def render_text(font: pygame.font.Font, text: str, antialias: bool, color: Color) -> pygame.Surface:
+    """
+    font.render through the shared cache.
+    """
+    key = (font, text, antialias, color)
+    surface = TEXT_CACHE.get(key)
+    if surface is None:
+        surface = font.render(text, antialias, color)
+        TEXT_CACHE.put(key, surface)
+    return surface
+
+
+def cached_text_surface(key: tuple[Hashable, ...], build: Callable[[], pygame.Surface]) -> pygame.Surface:
+    """
+    Cache any other surface derived from text (e.g. glow effects) next to the renders.
+    The key must start with a tag no render key uses, e.g. ("glow", font, ...).
+    """
+    return TEXT_CACHE.get_or_create(key, build)
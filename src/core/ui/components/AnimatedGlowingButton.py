@@ -1,5 +1,7 @@
 import pygame
 
+from core.text_cache import cached_text_surface, render_text
+
 
 def brighten(color: tuple[int, int, int], factor: float = 1.25) -> tuple[int, int, int]:
     """Slightly brighten a color."""
@@ -45,7 +47,7 @@ class AnimatedGlowingButton:
         self.font = font
 
         # Not hovered: normal text (no extra spacing)
-        self.normal_surface = self.font.render(self.text, True, self.normal_color)
+        self.normal_surface = render_text(self.font, self.text, True, self.normal_color)
 
         # Hovered: slightly brighter with extra letter spacing
         self.hover_surface, self.hover_glyphs = self._render_text_with_spacing(
@@ -61,14 +63,18 @@ class AnimatedGlowingButton:
         self.rect = pygame.Rect(0, 0, max_w, max_h)
         self.rect.center = self.base_pos
 
-        self.glow_glyphs = [
-            (
-                self._create_multi_layer_glow(glyph, self.glow_color, self.glow_layers, self.glow_scale_step),
-                x_offset,
-                glyph.get_size(),
+        # Glyphs come from the text cache, so buttons showing the same letters share their glow.
+        # Shared glows are never modified; render() draws the faded copies cached next to them.
+        self.glow_glyphs: list[tuple[tuple, pygame.Surface, int, tuple[int, int]]] = []
+        for glyph, x_offset in self.hover_glyphs:
+            glow_key = ("glow", glyph, self.glow_color, self.glow_layers, self.glow_scale_step)
+            glow_surface = cached_text_surface(
+                glow_key,
+                lambda glyph=glyph: self._create_multi_layer_glow(
+                    glyph, self.glow_color, self.glow_layers, self.glow_scale_step
+                ),
             )
-            for glyph, x_offset in self.hover_glyphs
-        ]
+            self.glow_glyphs.append((glow_key, glow_surface, x_offset, glyph.get_size()))
 
         # Glow intensity (0.0~1.0)
         self.hover_amount = 0.0
@@ -82,7 +88,7 @@ class AnimatedGlowingButton:
     ) -> tuple[pygame.Surface, list[tuple[pygame.Surface, int]]]:
         """Render text with extra letter spacing and return surface plus glyph positions."""
         if spacing <= 0:
-            glyph = font.render(text, True, color)
+            glyph = render_text(font, text, True, color)
             return glyph, [(glyph, 0)]
 
         # Render glyphs one by one
@@ -91,7 +97,7 @@ class AnimatedGlowingButton:
         max_h = 0
 
         for ch in text:
-            glyph = font.render(ch, True, color)
+            glyph = render_text(font, ch, True, color)
             glyphs.append(glyph)
             w, h = glyph.get_size()
             widths.append(w)
@@ -99,7 +105,7 @@ class AnimatedGlowingButton:
                 max_h = h
 
         if not glyphs:
-            empty = font.render("", True, color)
+            empty = render_text(font, "", True, color)
             return empty, []
 
         total_width = sum(widths) + spacing * (len(glyphs) - 1)
@@ -162,6 +168,13 @@ class AnimatedGlowingButton:
 
         return glow_surf
 
+    @staticmethod
+    def _with_alpha(surface: pygame.Surface, alpha: int) -> pygame.Surface:
+        """Copy of surface drawn at the given opacity."""
+        faded = surface.copy()
+        faded.set_alpha(alpha)
+        return faded
+
     def update(self, delta: float, mouse_pos: tuple[int, int]):
         # Only evaluate hover; position stays unchanged
         self.is_hovered = self.rect.collidepoint(mouse_pos)
@@ -183,13 +196,16 @@ class AnimatedGlowingButton:
             alpha = int(self.glow_max_alpha * self.hover_amount)
             glow_layout_rect = self.hover_surface.get_rect(center=self.rect.center)
 
-            for glow_surface, x_offset, glyph_size in self.glow_glyphs:
-                glow_surface.set_alpha(alpha)
+            for glow_key, glow_surface, x_offset, glyph_size in self.glow_glyphs:
+                faded = cached_text_surface(
+                    ("glow_alpha", glow_key, alpha),
+                    lambda glow_surface=glow_surface: self._with_alpha(glow_surface, alpha),
+                )
                 letter_center = (
                     glow_layout_rect.x + x_offset + glyph_size[0] * 0.5,
                     glow_layout_rect.y + glyph_size[1] * 0.5,
                 )
-                glow_rect = glow_surface.get_rect(center=letter_center)
-                screen.blit(glow_surface, glow_rect.topleft)
+                glow_rect = faded.get_rect(center=letter_center)
+                screen.blit(faded, glow_rect.topleft)
 
         screen.blit(surface, surface_rect.topleft)
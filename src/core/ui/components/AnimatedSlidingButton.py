@@ -1,5 +1,7 @@
 import pygame
 
+from core.text_cache import render_text
+
 class AnimatedSlidingButton:
     def __init__(
             self,
@@ -24,8 +26,8 @@ class AnimatedSlidingButton:
         self.is_hovered = False
 
         # Initialize
-        self.normal_surface = font.render(self.text, True, normal_color)
-        self.hover_surface = font.render(self.text, True, hover_color)
+        self.normal_surface = render_text(font, self.text, True, normal_color)
+        self.hover_surface = render_text(font, self.text, True, hover_color)
         self.rect = self.normal_surface.get_rect(
             topleft = self.base_pos
         )
@@ -0,0 +1,58 @@
+import pygame
+
+from typing import NamedTuple
+
+from core.glyph_atlas import GlyphAtlas
+
+
+class DialogueLine(NamedTuple):
+    surface: pygame.Surface
+    start: int          # Index of the line's first character in the full text
+    end: int
+    extents: list[int]  # Width of the line cut after each of its characters
+
+
+class DialogueText:
+    """
+    Dialogue text wrapped and rendered once per line of dialogue, then revealed
+    a character at a time by clipping the rendered lines.
+    """
+    def __init__(self, glyphs: GlyphAtlas, max_width: int, line_gap: int) -> None:
+        self.glyphs = glyphs
+        self.max_width = max_width
+        self.line_gap = line_gap
+
+        self.text = ""
+        self.visible_count = 0
+        self.lines: list[DialogueLine] = []
+
+    def set_text(self, text: str) -> None:
+        """
+        Lay out and render the full text, hidden until revealed.
+        """
+        self.text = text
+        self.visible_count = 0
+        self.lines = []
+        for start, end in self.glyphs.wrap_spans(text, self.max_width):
+            blits, extents = self.glyphs.layout(text[start:end])
+            self.lines.append(DialogueLine(self.glyphs.render_layout(blits, extents), start, end, extents))
+
+    def reveal(self, count: int) -> None:
+        """
+        Show the first count characters of the text.
+        """
+        self.visible_count = count
+
+    def render(self, screen: pygame.Surface, pos: tuple[float, float], max_bottom: float) -> None:
+        x, y = pos
+        for line in self.lines:
+            # Stop when it's out of screen or not revealed yet
+            if y > max_bottom or self.visible_count <= line.start:
+                break
+
+            if self.visible_count >= line.end:
+                screen.blit(line.surface, (x, y))
+            else:
+                width = line.extents[self.visible_count - line.start - 1]
+                screen.blit(line.surface, (x, y), (0, 0, width, self.glyphs.height))
+            y += self.glyphs.height + self.line_gap
@@ -1,5 +1,6 @@
 import pygame
 
+from core.text_cache import render_text
 from core.ui.components.AnimatedGlowingButton import AnimatedGlowingButton
 
 
@@ -30,9 +31,9 @@ class SaveSlotEntry:
         self._mouse_down_last = False
 
         # Action Button
-        self.text_surface = self.font.render(self.text, True, self.text_color)
+        self.text_surface = render_text(self.font, self.text, True, self.text_color)
         self.text_rect = self.text_surface.get_rect(topleft=self.pos)
-        button_preview = self.font.render(action_text, True, self.text_color)
+        button_preview = render_text(self.font, action_text, True, self.text_color)
         button_width, _ = button_preview.get_size()
         center_x = self.pos[0] + self.entry_width - self.spacing * 2 - button_width // 2
         center_y = self.text_rect.centery
@@ -1,6 +1,7 @@
 import pygame
 
 from typing import Any, Sequence
+from core.text_cache import render_text
 
 
 class SettingEntryBase:
@@ -43,7 +44,7 @@ class SettingEntryBase:
 
     def _build_text(self) -> tuple[int, int, int]:
         # Render the label and return placement helpers
-        self.text_surface = self.font.render(self.text, True, self.text_color)
+        self.text_surface = render_text(self.font, self.text, True, self.text_color)
         self.text_rect = self.text_surface.get_rect(topleft=self.pos)
         return self._compute_area()
 
@@ -97,9 +98,9 @@ class SettingOptionEntry(SettingEntryBase):
         # Build text, arrows, and option placement
         area_left, area_top, center_x = self._build_text()
 
-        option_surface = self.font.render(self.current_option, True, self.text_color)
-        left_arrow_surface = self.font.render("<", True, self.arrow_color)
-        right_arrow_surface = self.font.render(">", True, self.arrow_color)
+        option_surface = render_text(self.font, self.current_option, True, self.text_color)
+        left_arrow_surface = render_text(self.font, "<", True, self.arrow_color)
+        right_arrow_surface = render_text(self.font, ">", True, self.arrow_color)
 
         self.option_rect = option_surface.get_rect(midtop=(center_x, area_top))
         self.left_arrow_rect = left_arrow_surface.get_rect(topleft=(area_left, area_top))
@@ -132,9 +133,9 @@ class SettingOptionEntry(SettingEntryBase):
     def render(self, screen: pygame.Surface):
         self._render_label(screen)
 
-        left_surface = self.font.render("<", True, self.hover_color if self._hover_left else self.arrow_color)
-        option_surface = self.font.render(self.current_option, True, self.text_color)
-        right_surface = self.font.render(">", True, self.hover_color if self._hover_right else self.arrow_color)
+        left_surface = render_text(self.font, "<", True, self.hover_color if self._hover_left else self.arrow_color)
+        option_surface = render_text(self.font, self.current_option, True, self.text_color)
+        right_surface = render_text(self.font, ">", True, self.hover_color if self._hover_right else self.arrow_color)
 
         screen.blit(left_surface, self.left_arrow_rect.topleft)
         screen.blit(option_surface, self.option_rect.topleft)
@@ -186,11 +187,11 @@ class SettingValueEntry(SettingEntryBase):
         # Build all arrow rects around the value
         area_left, area_top, center_x = self._build_text()
 
-        value_surface = self.font.render(self._format_value(), True, self.text_color)
-        left_double_arrow_surface = self.font.render("<<", True, self.arrow_color)
-        left_arrow_surface = self.font.render("<", True, self.arrow_color)
-        right_arrow_surface = self.font.render(">", True, self.arrow_color)
-        right_double_arrow_surface = self.font.render(">>", True, self.arrow_color)
+        value_surface = render_text(self.font, self._format_value(), True, self.text_color)
+        left_double_arrow_surface = render_text(self.font, "<<", True, self.arrow_color)
+        left_arrow_surface = render_text(self.font, "<", True, self.arrow_color)
+        right_arrow_surface = render_text(self.font, ">", True, self.arrow_color)
+        right_double_arrow_surface = render_text(self.font, ">>", True, self.arrow_color)
 
         self.value_rect = value_surface.get_rect(midtop=(center_x, area_top))
 
@@ -239,18 +240,18 @@ class SettingValueEntry(SettingEntryBase):
     def render(self, screen: pygame.Surface):
         self._render_label(screen)
 
-        double_left_arrow_surface = self.font.render(
-            "<<", True, self.hover_color if self._hover_map["big_left"] else self.arrow_color
+        double_left_arrow_surface = render_text(
+            self.font, "<<", True, self.hover_color if self._hover_map["big_left"] else self.arrow_color
         )
-        left_arrow_surface = self.font.render(
-            "<", True, self.hover_color if self._hover_map["small_left"] else self.arrow_color
+        left_arrow_surface = render_text(
+            self.font, "<", True, self.hover_color if self._hover_map["small_left"] else self.arrow_color
         )
-        value_surface = self.font.render(self._format_value(), True, self.text_color)
-        right_arrow_surface = self.font.render(
-            ">", True, self.hover_color if self._hover_map["small_right"] else self.arrow_color
+        value_surface = render_text(self.font, self._format_value(), True, self.text_color)
+        right_arrow_surface = render_text(
+            self.font, ">", True, self.hover_color if self._hover_map["small_right"] else self.arrow_color
         )
-        double_right_arrow_surface = self.font.render(
-            ">>", True, self.hover_color if self._hover_map["big_right"] else self.arrow_color
+        double_right_arrow_surface = render_text(
+            self.font, ">>", True, self.hover_color if self._hover_map["big_right"] else self.arrow_color
         )
 
         screen.blit(double_left_arrow_surface, self.double_left_arrow_rect.topleft)
@@ -293,9 +294,9 @@ class SettingToggleEntry(SettingEntryBase):
         # Build label and arrows for toggling
         area_left, area_top, center_x = self._build_text()
 
-        label_surface = self.font.render(self._current_label(), True, self.text_color)
-        left_arrow_surface = self.font.render("<", True, self.arrow_color)
-        right_arrow_surface = self.font.render(">", True, self.arrow_color)
+        label_surface = render_text(self.font, self._current_label(), True, self.text_color)
+        left_arrow_surface = render_text(self.font, "<", True, self.arrow_color)
+        right_arrow_surface = render_text(self.font, ">", True, self.arrow_color)
 
         self.label_rect = label_surface.get_rect(midtop=(center_x, area_top))
         self.left_arrow_rect = left_arrow_surface.get_rect(topleft=(area_left, area_top))
@@ -318,9 +319,9 @@ class SettingToggleEntry(SettingEntryBase):
     def render(self, screen: pygame.Surface):
         self._render_label(screen)
 
-        left_surface = self.font.render("<", True, self.hover_color if self._hover_left else self.arrow_color)
-        label_surface = self.font.render(self._current_label(), True, self.text_color)
-        right_surface = self.font.render(">", True, self.hover_color if self._hover_right else self.arrow_color)
+        left_surface = render_text(self.font, "<", True, self.hover_color if self._hover_left else self.arrow_color)
+        label_surface = render_text(self.font, self._current_label(), True, self.text_color)
+        right_surface = render_text(self.font, ">", True, self.hover_color if self._hover_right else self.arrow_color)
 
         screen.blit(left_surface, self.left_arrow_rect.topleft)
         screen.blit(label_surface, self.label_rect.topleft)
@@ -0,0 +1,35 @@
+class SpriteAnimation[Frame]:
+    def __init__(
+            self,
+            frames: list[Frame],
+            fps: float = 12.0,
+            loop: bool = True
+        ) -> None:
+        self._frames = frames
+        self._frame_time = 1.0 / max(fps, 1e-6)
+        self._elapsed = 0.0
+        self.loop = loop
+
+    def reset(self) -> None:
+        self._elapsed = 0.0
+
+    @property
+    def frame_index(self) -> int:
+        idx = int(self._elapsed / self._frame_time)
+        if self.loop:
+            return idx % len(self._frames)
+        return min(idx, len(self._frames) - 1)
+
+    @property
+    def curr(self) -> Frame:
+        return self._frames[self.frame_index]
+
+    @property
+    def is_finished(self) -> bool:
+        return not self.loop and self._elapsed >= self._frame_time * len(self._frames)
+
+    def update(self, delta: float) -> None:
+        self._elapsed += max(delta, 0.0)
+        if self.loop:
+            # Keep the clock bounded so long-running loops don't lose precision
+            self._elapsed %= self._frame_time * len(self._frames)
@@ -15,9 +15,17 @@ class Typewriter:
     def current_cps(self) -> float:
         return self._base_cps * self.cps_scale
 
+    @property
+    def full_text(self) -> str:
+        return self._full_text
+
+    @property
+    def visible_count(self) -> int:
+        return round(self._progress)
+
     @property
     def visible_text(self) -> str:
-        return self._full_text[:round(self._progress)]
+        return self._full_text[:self.visible_count]
 
     @property
     def is_finished(self) -> bool:
@@ -34,6 +34,7 @@ def main() -> None:
         if scene_manager.events.quit:
             break
 
+    scene_manager.shutdown()
     pygame.quit()
     sys.exit(0)
 
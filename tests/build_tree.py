@@ -0,0 +1,113 @@
+"""
+Throwaway source tree for running scripts/build_assets.py in tests.
+
+The builder reads its folders through module globals (assets_root, locale_dir,
+MANIFEST_PATH, chapter_manifest_path); BuildTree points them at a temporary
+directory for as long as it is entered.
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+from contextlib import ExitStack, redirect_stdout
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import pygame # noqa: E402
+import build_assets # noqa: E402
+from core.asset_manager import PakFile # noqa: E402
+
+LOCALE = {"title": {"start": "Start", "quit": "Quit"}, "dialogue": {"auto": "Auto"}}
+
+
+class BuildTree:
+    def __init__(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.assets = self.root / "assets"
+        self.locale = self.root / "locale"
+        self._patches = ExitStack()
+
+    def __enter__(self) -> "BuildTree":
+        for folder in ("illustration", "sprite", "scene", "font"):
+            (self.assets / folder).mkdir(parents=True)
+        self.locale.mkdir()
+        self.write_locale("en_us", LOCALE)
+
+        self._patches.enter_context(mock.patch.multiple(
+            build_assets,
+            assets_root=lambda: self.assets,
+            locale_dir=lambda *sub: self.locale.joinpath(*sub),
+            chapter_manifest_path=lambda: self.assets / "chapters.json",
+            MANIFEST_PATH=self.assets / "build_manifest.json",
+        ))
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._patches.close()
+        self._tmp.cleanup()
+
+    def write_image(
+            self,
+            category: str,
+            name: str,
+            size: tuple[int, int],
+            color: tuple[int, int, int, int] = (200, 60, 40, 255),
+            margin: int = 0
+        ) -> Path:
+        """
+        Write a PNG filled with color, inside a transparent margin of the given width.
+        """
+        surface = pygame.Surface(size, pygame.SRCALPHA, 32)
+        surface.fill(color, (margin, margin, size[0] - 2 * margin, size[1] - 2 * margin))
+        path = self.assets / category / f"{name}.png"
+        pygame.image.save(surface, str(path))
+        return path
+
+    def write_scene(self, name: str, data: dict[str, Any]) -> Path:
+        path = self.assets / "scene" / f"{name}.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        return path
+
+    def write_locale(self, lang_code: str, data: dict[str, Any]) -> Path:
+        path = self.locale / f"{lang_code}.json"
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        return path
+
+    def build(self, *argv: str) -> str:
+        """
+        Run the builder and return what it printed.
+        """
+        output = io.StringIO()
+        with redirect_stdout(output):
+            build_assets.main(list(argv))
+        return output.getvalue()
+
+    def pak(self, name: str) -> PakFile:
+        return PakFile(self.assets / name)
+
+    def pak_bytes(self) -> dict[str, bytes]:
+        """
+        Every pak the build wrote, by file name.
+        """
+        paks = sorted(self.assets.glob("*.pak")) + sorted(self.locale.glob("*.pak"))
+        return {path.name: path.read_bytes() for path in paks}
+
+
+def rebuilt(output: str, label: str) -> list[str]:
+    """
+    Entries a build report lists as rebuilt for one category.
+    """
+    lines = output.splitlines()
+    start = next(idx for idx, line in enumerate(lines) if line.startswith(f"[{label}] rebuilt"))
+    names = []
+    for line in lines[start + 1:]:
+        if not line.startswith("    * "):
+            break
+        names.append(line[len("    * "):])
+    return names
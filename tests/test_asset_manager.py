@@ -0,0 +1,119 @@
+import sys
+import json
+import zlib
+import base64
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.asset_manager import AssetHandle, LegacyPak, PakFile, PakStack, _open_pak_file # noqa: E402
+from core.pak_format import PakWriter # noqa: E402
+
+
+class PakFileCloseTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "test.pak"
+        with PakWriter(self.path, "scene", "json", "2026-01-01") as writer:
+            writer.add("raw.json", b'{"raw": true}', "raw")
+            writer.add("zlib.json", b'{"zlib": true}', "zlib")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_close_with_raw_read_alive(self) -> None:
+        pak = PakFile(self.path)
+        data = pak.read("raw.json")
+        pak.close()
+        # The payload stays readable until it is dropped
+        self.assertEqual(bytes(data), b'{"raw": true}')
+        del data
+
+    def test_close_after_reads(self) -> None:
+        pak = PakFile(self.path)
+        self.assertEqual(bytes(pak.read("zlib.json")), b'{"zlib": true}')
+        stored = pak.read_stored("zlib.json")
+        pak.close()
+        self.assertGreater(len(bytes(stored)), 0)
+
+
+class LegacyPakTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write_legacy(self, file_name: str, built_at: str, entries: dict[str, bytes]) -> Path:
+        path = Path(self.tmp.name) / file_name
+        pak = {
+            "category": "illustration",
+            "built_at": built_at,
+            "header": {"filetype": "png", "count": len(entries)},
+            "entries": {name: {"encoded_string": base64.b64encode(data).decode()} for name, data in entries.items()},
+        }
+        path.write_bytes(base64.b64encode(zlib.compress(json.dumps(pak).encode())))
+        return path
+
+    def test_overlay_keys_differ_from_base(self) -> None:
+        base = _open_pak_file(self.write_legacy("illustration.pak", "2026-01-01T00:00:00", {"dock": b"base", "lab": b"lab"}))
+        overlay = _open_pak_file(self.write_legacy("mod.pak", "2026-01-01T00:00:00", {"dock": b"mod"}))
+        assert isinstance(base, LegacyPak) and isinstance(overlay, LegacyPak)
+        self.assertNotEqual(base.content_key("dock"), overlay.content_key("dock"))
+
+        stack = PakStack("illustration", base)
+        base_key = stack.content_key("dock")
+        stack.mount(overlay, 10)
+        self.assertNotEqual(stack.content_key("dock"), base_key)
+        self.assertEqual(stack.read("dock"), b"mod")
+        self.assertEqual(stack.content_key("lab"), base.content_key("lab"))
+
+    def test_in_memory_paks(self) -> None:
+        # SceneManager wraps AssetPak dicts handed to it, which have no file
+        older = _open_pak_file(self.write_legacy("a.pak", "2026-01-01T00:00:00", {"dock": b"old"}))
+        newer = _open_pak_file(self.write_legacy("b.pak", "2026-02-01T00:00:00", {"dock": b"new"}))
+        assert isinstance(older, LegacyPak) and isinstance(newer, LegacyPak)
+        self.assertNotEqual(LegacyPak(older.pak).content_key("dock"), LegacyPak(newer.pak).content_key("dock"))
+
+
+class SlowSource:
+    """
+    Asset source counting its decodes, with a hook run right after each one.
+    """
+    def __init__(self) -> None:
+        self.reads = 0
+        self.on_drop = lambda: None
+
+    def read(self, name: str) -> bytes:
+        self.reads += 1
+        time.sleep(0.01)
+        return name.encode()
+
+    def drop_stored(self, name: str) -> None:
+        self.on_drop()
+
+
+class AssetHandleTest(unittest.TestCase):
+    def test_unload_during_decode(self) -> None:
+        source = SlowSource()
+        handle = AssetHandle(source, "entry")  # type: ignore[arg-type]
+        source.on_drop = handle.unload
+        self.assertEqual(handle.data, b"entry")
+
+    def test_concurrent_decode(self) -> None:
+        source = SlowSource()
+        handle = AssetHandle(source, "entry")  # type: ignore[arg-type]
+        results: list[bytes] = []
+        threads = [threading.Thread(target=lambda: results.append(handle.data)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [b"entry"] * 8)
+        self.assertEqual(source.reads, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
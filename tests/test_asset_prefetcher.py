@@ -0,0 +1,60 @@
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pygame # noqa: E402
+from core.asset_prefetcher import AssetPrefetcher # noqa: E402
+from core.pak_format import PakIntegrityError # noqa: E402
+from core.surface_cache import SurfaceCache # noqa: E402
+
+
+def build_surface() -> pygame.Surface:
+    return pygame.Surface((4, 4))
+
+
+def build_corrupt() -> pygame.Surface:
+    raise PakIntegrityError("dock", "checksum mismatch")
+
+
+def build_broken() -> pygame.Surface:
+    raise TypeError("bug in the build function")
+
+
+class AssetPrefetcherTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sm = SimpleNamespace(surface_cache=SurfaceCache(1024 * 1024))
+
+    def test_stats_with_concurrent_workers(self) -> None:
+        prefetcher = AssetPrefetcher(self.sm, workers=4) # type: ignore
+        self.addCleanup(prefetcher.shutdown)
+        builds = [build_surface, build_corrupt]
+        for idx in range(200):
+            prefetcher.schedule(("key", idx), builds[idx % 2])
+        for idx in range(200):
+            prefetcher.wait(("key", idx))
+        prefetcher.shutdown()
+
+        self.assertEqual(prefetcher.stats()["scheduled"], 200)
+        self.assertEqual(prefetcher.stats()["completed"], 200)
+        self.assertEqual(prefetcher.stats()["failed"], 100)
+        self.assertEqual(prefetcher.stats()["in_flight"], 0)
+        self.assertEqual(len(self.sm.surface_cache), 100)
+
+    def test_wait_on_failed_prefetch(self) -> None:
+        prefetcher = AssetPrefetcher(self.sm, workers=1) # type: ignore
+        self.addCleanup(prefetcher.shutdown)
+        prefetcher.schedule(("corrupt",), build_corrupt)
+        self.assertIsNone(prefetcher.wait(("corrupt",)))
+        self.assertIsNone(prefetcher.wait(("never scheduled",)))
+
+        # Bugs are not mistaken for a bad asset
+        prefetcher.schedule(("broken",), build_broken)
+        with self.assertRaises(TypeError):
+            prefetcher.wait(("broken",))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from build_tree import BuildTree, build_assets # noqa: E402
+from core.config_manager import SUPPORTED_RESOLUTIONS # noqa: E402
+from core.pak_format import variant_name # noqa: E402
+
+
+def background(filename: str | None, blur: int = 0, **args) -> dict:
+    return {"type": "set_background", "args": {"filename": filename, "blur": blur, **args}}
+
+
+class BackgroundBlurTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = BuildTree().__enter__()
+        self.addCleanup(self.tree.__exit__)
+        for name in ("dock", "lab", "room"):
+            self.tree.write_image("illustration", name, (64, 36))
+        self.tree.write_scene("intro", {"characters": [], "steps": [
+            {"id": "l0", "actions": [background("dock", 4), background("lab")]},
+            {"id": "l1", "actions": [background("dock", 8, transition={"type": "fade", "duration": 0.5})]},
+        ]})
+        self.tree.write_scene("outro", {"characters": [], "steps": [
+            {"id": "l0", "actions": [background("dock", 4), background(None, 6)]},
+        ]})
+
+    def test_collected_from_compiled_scenes(self) -> None:
+        blurs = build_assets.collect_background_blurs(build_assets.compile_scenes())
+        self.assertEqual(blurs, {"dock": {4, 8}})
+
+    def test_blurred_variants(self) -> None:
+        self.tree.build()
+        pak = self.tree.pak("illustration.pak")
+        self.addCleanup(pak.close)
+        blurred = {name for name in pak.names() if name not in ("dock", "lab", "room")}
+        self.assertEqual(blurred, {variant_name("dock", size, blur) for size in SUPPORTED_RESOLUTIONS for blur in (4, 8)})
+
+    def test_no_blur_variants(self) -> None:
+        self.tree.build("--no-blur-variants")
+        pak = self.tree.pak("illustration.pak")
+        self.addCleanup(pak.close)
+        self.assertEqual(set(pak.names()), {"dock", "lab", "room"})
+
+
+if __name__ == "__main__":
+    unittest.main()
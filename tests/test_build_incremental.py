@@ -0,0 +1,92 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from build_tree import BuildTree, rebuilt # noqa: E402
+
+SCENE = {"characters": [], "steps": [{"id": "l0", "actions": [
+    {"type": "set_background", "args": {"filename": "dock"}},
+]}]}
+
+
+class IncrementalBuildTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = BuildTree().__enter__()
+        self.addCleanup(self.tree.__exit__)
+        self.tree.write_image("illustration", "dock", (64, 36))
+        self.tree.write_image("illustration", "lab", (64, 36), (40, 60, 200, 255))
+        self.tree.write_image("sprite", "Ann", (16, 32))
+        self.tree.write_scene("intro", SCENE)
+
+    @mock.patch.dict(os.environ, {"SOURCE_DATE_EPOCH": "1767225600"})
+    def test_unchanged_sources_are_reused(self) -> None:
+        output = self.tree.build()
+        self.assertEqual(rebuilt(output, "illustration"), ["dock", "lab"])
+        self.assertEqual(rebuilt(output, "locale/en_us"), ["en_us"])
+        first = self.tree.pak_bytes()
+
+        output = self.tree.build()
+        for label in ("illustration", "sprite", "scene", "locale/en_us"):
+            self.assertEqual(rebuilt(output, label), [], label)
+        # Reused payloads are copied as they were
+        self.assertEqual(self.tree.pak_bytes(), first)
+
+    def test_changed_source_is_rebuilt(self) -> None:
+        self.tree.build()
+        self.tree.write_image("illustration", "lab", (64, 36), (10, 200, 10, 255))
+        output = self.tree.build()
+        self.assertEqual(rebuilt(output, "illustration"), ["lab"])
+        self.assertEqual(rebuilt(output, "sprite"), [])
+
+        pak = self.tree.pak("illustration.pak")
+        self.assertEqual(bytes(pak.read("lab")), (self.tree.assets / "illustration" / "lab.png").read_bytes())
+        pak.close()
+
+    def test_parameters_invalidate(self) -> None:
+        self.tree.build()
+        # A codec override changes the key of every entry it applies to
+        output = self.tree.build("--codec", "illustration/dock=zlib")
+        self.assertEqual(rebuilt(output, "illustration"), ["dock"])
+        pak = self.tree.pak("illustration.pak")
+        self.assertEqual(pak.entry("dock").codec, "zlib")
+        pak.close()
+
+        self.assertEqual(rebuilt(self.tree.build("--force"), "sprite"), ["Ann"])
+        self.assertEqual(rebuilt(self.tree.build("--no-trim"), "sprite"), ["Ann"])
+
+    def test_removed_source_is_dropped(self) -> None:
+        self.tree.build()
+        (self.tree.assets / "illustration" / "lab.png").unlink()
+        self.tree.build()
+        pak = self.tree.pak("illustration.pak")
+        self.assertEqual(list(pak.names()), ["dock"])
+        pak.close()
+
+    def test_corrupt_payload_is_reencoded(self) -> None:
+        self.tree.build()
+        path = self.tree.assets / "illustration.pak"
+        pak = self.tree.pak("illustration.pak")
+        offset = pak.entry("lab").offset
+        pak.close()
+        data = bytearray(path.read_bytes())
+        data[offset + 8] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        output = self.tree.build()
+        self.assertEqual(rebuilt(output, "illustration"), ["lab"])
+        pak = self.tree.pak("illustration.pak")
+        pak.verify("lab", strong=True)
+        pak.close()
+
+    def test_missing_manifest_rebuilds(self) -> None:
+        self.tree.build()
+        (self.tree.assets / "build_manifest.json").unlink()
+        self.assertEqual(rebuilt(self.tree.build(), "illustration"), ["dock", "lab"])
+
+
+if __name__ == "__main__":
+    unittest.main()
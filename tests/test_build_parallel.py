@@ -0,0 +1,50 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from build_tree import BuildTree # noqa: E402
+
+SCENE = {"characters": [{"id": "ann", "sprite_filename": "Ann"}], "steps": [{"id": "l0", "actions": [
+    {"type": "set_background", "args": {"filename": "dock", "blur": 3}},
+    {"type": "show_character", "args": {"character_id": "ann", "x": 0.5, "y": 1}},
+]}]}
+
+
+@mock.patch.dict(os.environ, {"SOURCE_DATE_EPOCH": "1767225600"})
+class ParallelBuildTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = BuildTree().__enter__()
+        self.addCleanup(self.tree.__exit__)
+        self.tree.write_image("illustration", "dock", (96, 54))
+        self.tree.write_image("illustration", "dock_copy", (96, 54))  # Same content, stored once
+        self.tree.write_image("illustration", "lab", (96, 54), (40, 60, 200, 255))
+        for name, margin in (("Ann", 2), ("Ann.blink.0", 3), ("Ann.blink.1", 4), ("Eve", 0)):
+            self.tree.write_image("sprite", name, (24, 48), margin=margin)
+        self.tree.write_scene("intro", SCENE)
+
+    def build_all(self, *argv: str) -> dict[str, bytes]:
+        self.tree.build("--force", *argv)
+        return self.tree.pak_bytes()
+
+    def test_worker_count_does_not_change_output(self) -> None:
+        for options in ([], ["--variants", "--atlas"], ["--pixels", "sprite", "--codec", "illustration=zlib"]):
+            with self.subTest(options=options):
+                single = self.build_all("-j1", *options)
+                self.assertEqual(self.build_all("-j3", *options), single)
+
+    def test_repeated_builds_are_identical(self) -> None:
+        self.assertEqual(self.build_all("-j2"), self.build_all("-j2"))
+
+    def test_build_timestamp(self) -> None:
+        self.tree.build()
+        pak = self.tree.pak("scene.pak")
+        self.assertEqual(pak.meta["built_at"], "2026-01-01T00:00:00+00:00")
+        pak.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from build_tree import BuildTree, build_assets # noqa: E402
+from core import asset_manager, chapter_manifest # noqa: E402
+from core.asset_manager import ShardedPak, open_pak # noqa: E402
+from core.chapter_manifest import load_chapter_shards, shard_pak_name # noqa: E402
+
+
+def scene(background: str, next_scenes: list[str], characters: tuple[str, ...] = (), chapter: str | None = None) -> dict:
+    actions: list[dict] = [{"type": "set_background", "args": {"filename": background}}]
+    if next_scenes:
+        actions.append({"type": "change_dialogue_scene", "args": [{"scene_id": name} for name in next_scenes]})
+    data = {
+        "characters": [
+            {"id": name.lower(), "sprite_filename": name, "scale": 1.0, "default_layer": 1} for name in characters
+        ],
+        "steps": [{"id": "l0", "actions": actions}],
+    }
+    if chapter is not None:
+        data["chapter"] = chapter
+    return data
+
+
+# intro -> road -> pass belong to "one", camp -> shared to "two"; menu is reached by no chaptered scene
+SCENES = {
+    "intro": scene("dock", ["road"], ("Ann",), chapter="one"),
+    "road": scene("road", ["pass"]),
+    "pass": scene("road", ["camp"]),
+    "camp": scene("camp", ["shared"], ("Eve",), chapter="two"),
+    "shared": scene("dock", []),
+    "menu": scene("title", ["intro"]),
+}
+
+
+class ChapterTreeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = BuildTree().__enter__()
+        self.addCleanup(self.tree.__exit__)
+        for name in ("dock", "road", "camp", "title", "unused"):
+            self.tree.write_image("illustration", name, (64, 36))
+        for name in ("Ann", "Ann.blink.0", "Eve"):
+            self.tree.write_image("sprite", name, (16, 32))
+        for name, data in SCENES.items():
+            self.tree.write_scene(name, data)
+
+
+class ChapterManifestTest(ChapterTreeTest):
+    def manifest(self) -> dict:
+        return build_assets.build_chapter_manifest(build_assets.compile_scenes(), build_assets.collect_scene_chapters())
+
+    def test_chapters_are_inherited(self) -> None:
+        manifest = self.manifest()
+        self.assertEqual(
+            {name: entry["chapter"] for name, entry in manifest["scenes"].items()},
+            # pass keeps the chapter it inherits even though it leads into "two"
+            {"intro": "one", "road": "one", "pass": "one", "camp": "two", "shared": "two", "menu": None}
+        )
+        self.assertEqual(manifest["scenes"]["pass"]["next"], ["camp"])
+        self.assertEqual(manifest["chapters"], {
+            "one": {"scenes": ["intro", "pass", "road"], "illustrations": ["dock", "road"], "sprites": ["Ann"]},
+            "two": {"scenes": ["camp", "shared"], "illustrations": ["camp", "dock"], "sprites": ["Eve"]},
+        })
+
+    def test_owners(self) -> None:
+        # dock is shared by both chapters, title only by an unassigned scene, unused by none
+        self.assertEqual(build_assets.chapter_owners(self.manifest()), {
+            "illustration": {"camp": "two", "road": "one"},
+            "scene": {"camp": "two", "intro": "one", "pass": "one", "road": "one", "shared": "two"},
+            "sprite": {"Ann": "one", "Eve": "two"},
+        })
+
+    def test_invalid_chapter_name(self) -> None:
+        self.tree.write_scene("intro", scene("dock", ["road"], ("Ann",), chapter="../one"))
+        with self.assertRaises(SystemExit):
+            build_assets.collect_scene_chapters()
+
+    def test_entry_asset(self) -> None:
+        self.assertEqual(build_assets.entry_asset("illustration", "dock@1280x720"), "dock")
+        self.assertEqual(build_assets.entry_asset("sprite", "Ann.blink.0@1280x720"), "Ann")
+        self.assertEqual(build_assets.entry_asset("sprite", "atlas/Ann/0@1280x720"), "Ann")
+        self.assertIsNone(build_assets.entry_asset("sprite", "atlas/frames@1280x720"))
+        self.assertEqual(build_assets.entry_asset("scene", "intro"), "intro")
+
+
+class ChapterShardTest(ChapterTreeTest):
+    def setUp(self) -> None:
+        super().setUp()
+        for module in (asset_manager, chapter_manifest):
+            patcher = mock.patch.object(module, "assets_root", lambda: self.tree.assets)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def names(self, category: str, chapter: str | None) -> set[str]:
+        pak = self.tree.pak(shard_pak_name(category, chapter))
+        self.addCleanup(pak.close)
+        return set(pak.names())
+
+    def test_shards(self) -> None:
+        self.tree.build("--chapters", "--variants")
+        self.assertEqual(
+            sorted(path.name for path in self.tree.assets.glob("*.pak")),
+            sorted(shard_pak_name(category, chapter) for category in ("illustration", "sprite", "scene") for chapter in (None, "one", "two"))
+        )
+        self.assertEqual(self.names("illustration", None), {
+            f"{name}{suffix}" for name in ("dock", "title", "unused") for suffix in ("", "@1280x720", "@1360x765", "@1600x900")
+        })
+        self.assertEqual(self.names("illustration", "one"), {"road", "road@1280x720", "road@1360x765", "road@1600x900"})
+        self.assertEqual(self.names("scene", None), {"menu"})
+        self.assertEqual(self.names("scene", "two"), {"camp", "shared"})
+        self.assertEqual({name.split("@")[0] for name in self.names("sprite", "one")}, {"Ann", "Ann.blink.0"})
+
+        shards = load_chapter_shards()
+        self.assertEqual(shards["scene"], {"camp": "two", "intro": "one", "pass": "one", "road": "one", "shared": "two"})
+        self.assertEqual(shards["illustration"]["road@1280x720"], "one")
+        self.assertNotIn("dock", shards["illustration"])
+
+    def test_sharded_pak(self) -> None:
+        self.tree.build("--chapters")
+        pak = open_pak("illustration")
+        self.addCleanup(pak.close)
+        assert isinstance(pak, ShardedPak)
+        self.assertEqual(set(pak.names()), {"dock", "title", "unused", "road", "camp"})
+
+        self.assertEqual(bytes(pak.read("dock")), (self.tree.assets / "illustration" / "dock.png").read_bytes())
+        self.assertEqual(pak.opened_shards, [])
+        self.assertEqual(bytes(pak.read("road")), (self.tree.assets / "illustration" / "road.png").read_bytes())
+        self.assertEqual(pak.opened_shards, ["one"])
+
+    def test_shards_removed_without_chapters(self) -> None:
+        self.tree.build("--chapters")
+        self.tree.build()
+        self.assertEqual(
+            sorted(path.name for path in self.tree.assets.glob("*.pak")), ["illustration.pak", "scene.pak", "sprite.pak"]
+        )
+        self.assertEqual(load_chapter_shards(), {})
+        self.assertEqual(self.names("illustration", None), {"dock", "title", "unused", "road", "camp"})
+        pak = open_pak("illustration")
+        self.addCleanup(pak.close)
+        self.assertNotIsInstance(pak, ShardedPak)
+
+
+if __name__ == "__main__":
+    unittest.main()
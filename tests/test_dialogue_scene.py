@@ -0,0 +1,90 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pygame # noqa: E402
+from core.path_resolver import assets_root # noqa: E402
+
+BUILT = (assets_root() / "sprite.pak").exists() and (assets_root() / "scene.pak").exists()
+
+
+@unittest.skipUnless(BUILT, "assets not built, run scripts/build_assets.py")
+class SetExpressionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        from core.scene.DialogueScene import DialogueScene
+        from core.scene.SceneManager import SceneManager
+
+        pygame.init()
+        self.sm = SceneManager(pygame.display.set_mode((1280, 720)))
+        self.scene = DialogueScene(self.sm, self.sm.get_scene_data("dialogue_example"))
+        self.sm.switch(self.scene)
+        self.sm.update(1 / 60)
+        self.character_id = self.scene.dialogue_data.characters[0].id
+
+    def tearDown(self) -> None:
+        self.sm.shutdown()
+        pygame.quit()
+
+    def test_hidden_character(self) -> None:
+        from core.scene.DialogueStructure import HideCharacter, SetExpression
+
+        self.scene._execute_action(HideCharacter(self.character_id))
+        self.scene._execute_action(SetExpression(self.character_id, "", 8, True))
+        self.assertNotIn(self.character_id, self.scene.characters["sprite"])
+        self.sm.update(1 / 60)
+
+    def test_holds_frames(self) -> None:
+        from core.scene.DialogueStructure import SetExpression
+
+        character = self.scene.dialogue_data.characters[0]
+        self.scene._execute_action(SetExpression(self.character_id, "", 8, True))
+        scale = self.scene.scale(character.scale)
+        for frame_name in self.sm.sprite_sequence_names(character.sprite_filename, scale):
+            self.assertIn(("sprite", self.sm.sprite_entry_name(frame_name, scale)), self.scene._held_assets)
+
+
+@unittest.skipUnless(BUILT, "assets not built, run scripts/build_assets.py")
+class BackgroundFadeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        from core.scene.DialogueScene import DialogueScene
+        from core.scene.SceneManager import SceneManager
+
+        pygame.init()
+        self.sm = SceneManager(pygame.display.set_mode((1280, 720)))
+        self.scene = DialogueScene(self.sm, self.sm.get_scene_data("dialogue_example"))
+        self.sm.switch(self.scene)
+        self.sm.update(1 / 60)
+
+    def tearDown(self) -> None:
+        self.sm.shutdown()
+        pygame.quit()
+
+    def test_cached_background_keeps_its_alpha(self) -> None:
+        from core.scene.DialogueStructure import BackgroundTransition, SetBackground
+
+        filename = next(
+            action.filename
+            for step in self.scene.dialogue_data.steps for action in step.actions
+            if isinstance(action, SetBackground) and action.filename is not None
+        )
+        shared = self.sm.get_illustration_surface(filename, self.scene.windows_size)
+        # As if another scene drew it translucent
+        self.addCleanup(shared.set_alpha, shared.get_alpha())
+        shared.set_alpha(200)
+
+        self.scene._apply_background(filename, 0, BackgroundTransition("fade", 1.0))
+        self.scene._bg_transition["elapsed"] = 0.5 # type: ignore
+        self.scene.draw(pygame.Surface(self.scene.windows_size))
+        self.assertEqual(shared.get_alpha(), 200)
+
+        self.sm.update(1.0)
+        self.assertIs(self.scene.background, shared)
+
+
+if __name__ == "__main__":
+    unittest.main()
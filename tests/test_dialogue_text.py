@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pygame # noqa: E402
+from core.glyph_atlas import GlyphAtlas # noqa: E402
+from core.ui.components.DialogueText import DialogueText # noqa: E402
+
+FONT_PATH = os.path.join(os.path.dirname(pygame.__file__), pygame.font.get_default_font())
+TEXT = "We made it to the dock before the storm. AVAWA To Ty\nThe lab is next."
+
+
+class DialogueTextTest(unittest.TestCase):
+    def setUp(self) -> None:
+        pygame.font.init()
+        self.atlas = GlyphAtlas(pygame.font.Font(FONT_PATH, 32), (255, 255, 255))
+        self.text = DialogueText(self.atlas, 300, 4)
+
+    def test_lines_laid_out_once(self) -> None:
+        with mock.patch.object(self.atlas, "layout", wraps=self.atlas.layout) as layout:
+            self.text.set_text(TEXT)
+        self.assertEqual(layout.call_count, len(self.text.lines))
+
+        for line in self.text.lines:
+            expected = self.atlas.render(TEXT[line.start:line.end])
+            self.assertEqual(line.surface.get_size(), expected.get_size())
+            self.assertEqual(
+                pygame.surfarray.array_alpha(line.surface).tolist(), pygame.surfarray.array_alpha(expected).tolist()
+            )
+            self.assertEqual(line.extents, self.atlas.layout(TEXT[line.start:line.end])[1])
+
+    def test_reveal(self) -> None:
+        self.text.set_text(TEXT)
+        self.assertGreater(len(self.text.lines), 2)
+        first = self.text.lines[0]
+        screen = pygame.Surface((400, 400), pygame.SRCALPHA)
+
+        self.text.reveal(first.start + 4)
+        self.text.render(screen, (0, 0), 400)
+        # Only the revealed characters of the first line are drawn
+        expected = pygame.Surface((400, 400), pygame.SRCALPHA)
+        expected.blit(first.surface, (0, 0), (0, 0, first.extents[3], self.atlas.height))
+        self.assertEqual(pygame.surfarray.array_alpha(screen).tolist(), pygame.surfarray.array_alpha(expected).tolist())
+        self.assertLess(screen.get_bounding_rect().right, first.surface.get_width())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pygame # noqa: E402
+from core.font_registry import FontRegistry, FontStyle # noqa: E402
+
+FONT_PATH = os.path.join(os.path.dirname(pygame.__file__), pygame.font.get_default_font())
+
+
+class FontRegistryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        pygame.font.init()
+
+    def test_shared_and_evicted(self) -> None:
+        registry = FontRegistry(2)
+        font = registry.get(FONT_PATH, 20)
+        self.assertIs(registry.get(FONT_PATH, 20), font)
+        self.assertTrue(registry.get(FONT_PATH, 20, FontStyle.BOLD).bold)
+        registry.get(FONT_PATH, 30)
+        self.assertEqual(registry.stats()["evictions"], 1)
+        self.assertIsNot(registry.get(FONT_PATH, 20), font)
+
+    def test_concurrent_get_and_invalidate(self) -> None:
+        registry = FontRegistry(4)
+        errors: list[Exception] = []
+
+        def work(offset: int) -> None:
+            try:
+                for i in range(50):
+                    registry.get(FONT_PATH, 10 + (i + offset) % 8)
+                    if i % 10 == 0:
+                        registry.invalidate()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(registry), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
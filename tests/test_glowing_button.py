@@ -0,0 +1,43 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pygame # noqa: E402
+from core.text_cache import TEXT_CACHE # noqa: E402
+from core.ui.components.AnimatedGlowingButton import AnimatedGlowingButton # noqa: E402
+
+
+class GlowingButtonTest(unittest.TestCase):
+    def setUp(self) -> None:
+        pygame.font.init()
+        TEXT_CACHE.clear()
+        self.font = pygame.font.Font(None, 32)
+        self.screen = pygame.Surface((320, 120), pygame.SRCALPHA, 32)
+
+    def test_shared_glow_is_not_faded(self) -> None:
+        hovered = AnimatedGlowingButton("Start", "start", (160, 60), self.font)
+        other = AnimatedGlowingButton("Start", "start", (160, 60), self.font)
+        shared = [glow_surface for _, glow_surface, _, _ in other.glow_glyphs]
+        self.assertEqual([glow_surface for _, glow_surface, _, _ in hovered.glow_glyphs], shared)
+        alphas = [glow_surface.get_alpha() for glow_surface in shared]
+
+        hovered.update(0.05, hovered.rect.center)
+        hovered.render(self.screen)
+        self.assertGreater(hovered.hover_amount, 0.0)
+        self.assertEqual([glow_surface.get_alpha() for glow_surface in shared], alphas)
+
+    def test_faded_glow_is_cached(self) -> None:
+        button = AnimatedGlowingButton("Go", "go", (160, 60), self.font)
+        button.hover_amount = 1.0
+        button.render(self.screen)
+        entries = len(TEXT_CACHE)
+        button.render(self.screen)
+        self.assertEqual(len(TEXT_CACHE), entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
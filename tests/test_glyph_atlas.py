@@ -0,0 +1,55 @@
+import os
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pygame # noqa: E402
+from core.glyph_atlas import GlyphAtlas # noqa: E402
+
+FONT_PATH = os.path.join(os.path.dirname(pygame.__file__), pygame.font.get_default_font())
+WORDS = "The quick brown fox jumps over the lazy dog AVAWA To Ty LT Wa Yo we're P. F. \"quoted\" f(x)".split()
+
+
+class GlyphAtlasTest(unittest.TestCase):
+    def setUp(self) -> None:
+        pygame.font.init()
+        self.font = pygame.font.Font(FONT_PATH, 40)
+        self.atlas = GlyphAtlas(self.font, (255, 255, 255))
+        self.random = random.Random(1)
+
+    def sentence(self) -> str:
+        return " ".join(self.random.choice(WORDS) for _ in range(self.random.randint(1, 12)))
+
+    def test_matches_font(self) -> None:
+        for text in ["Hello, World! AVAWA", "Te, Yo. LT AT Wa", "unkerned", "x"] + [self.sentence() for _ in range(50)]:
+            # Atlas lines are font.get_height() tall, some fonts render their line gap too
+            expected = self.font.render(text, True, (255, 255, 255))
+            expected = expected.subsurface((0, 0, expected.get_width(), self.atlas.height))
+            rendered = self.atlas.render(text)
+            self.assertEqual(rendered.get_size(), expected.get_size(), text)
+            self.assertEqual(self.atlas.size(text)[0], self.font.size(text)[0], text)
+            self.assertEqual(
+                pygame.surfarray.array_alpha(rendered).tolist(), pygame.surfarray.array_alpha(expected).tolist(), text
+            )
+            self.assertEqual(
+                self.atlas.layout(text)[1], [self.font.size(text[:i + 1])[0] for i in range(len(text))], text
+            )
+
+    def test_wrap_fits(self) -> None:
+        for _ in range(50):
+            text = " ".join(self.sentence() for _ in range(4))
+            max_width = self.random.randint(150, 600)
+            lines = self.atlas.wrap_spans(text, max_width)
+            self.assertEqual("".join(text[start:end] for start, end in lines), text)
+            for start, end in lines:
+                self.assertLessEqual(self.font.size(text[start:end])[0], max_width)
+                if end < len(text):
+                    # Lines are as long as they can be
+                    self.assertGreater(self.font.size(text[start:end + 1])[0], max_width)
+
+
+if __name__ == "__main__":
+    unittest.main()
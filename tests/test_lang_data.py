@@ -0,0 +1,117 @@
+import json
+import sys
+import zlib
+import base64
+import unittest
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from build_tree import BuildTree # noqa: E402
+from core.locale import pak_loader # noqa: E402
+from core.locale.pak_loader import LangData, flatten_strings # noqa: E402
+
+LOCALE_SOURCES = sorted((Path(__file__).resolve().parent.parent / "src" / "locale").glob("*.json"))
+
+NESTED = {
+    "title": {"start": "Start", "quit": "Quit"},
+    "saveSelector": {"slot_label": "Slot {n}", "confirm": {"yes": "Yes", "no": "No"}},
+    "empty": "",
+    "greeting": "你好",
+}
+
+
+def nested_get(data: Any, path: tuple[str, ...]) -> Any:
+    """The lookup LangData did while it kept the nested source dict."""
+    node = data
+    for key in path:
+        if not isinstance(node, Mapping):
+            raise TypeError(f"Expected dict at {key=}, got {type(node)!r}")
+        node = node[key]
+    return node
+
+
+def paths(data: dict[str, Any], prefix: tuple[str, ...] = ()) -> Iterator[tuple[str, ...]]:
+    for key, value in data.items():
+        yield prefix + (key,)
+        if isinstance(value, dict):
+            yield from paths(value, prefix + (key,))
+
+
+class LangDataTest(unittest.TestCase):
+    def assert_matches_nested(self, nested: dict[str, Any]) -> None:
+        lang = LangData(flatten_strings(nested))
+        self.assertEqual(lang.get_map(), nested)
+        for path in paths(nested):
+            value = nested_get(nested, path)
+            if isinstance(value, str):
+                self.assertEqual(lang.get_str(*path), value, path)
+                self.assertEqual(lang.get_str(".".join(path)), value, path)
+                with self.assertRaises(KeyError):
+                    lang.get_map(*path)
+            else:
+                self.assertEqual(lang.get_map(*path), value, path)
+                # Maps keep the order of the source, which menus are built in
+                self.assertEqual(list(lang.get_map(*path)), list(value), path)
+                with self.assertRaises(KeyError):
+                    lang.get_str(*path)
+
+    def test_matches_nested_lookup(self) -> None:
+        self.assert_matches_nested(NESTED)
+
+    def test_shipped_locales(self) -> None:
+        self.assertTrue(LOCALE_SOURCES)
+        for source in LOCALE_SOURCES:
+            with self.subTest(source.name):
+                self.assert_matches_nested(json.loads(source.read_text(encoding="utf-8")))
+
+    def test_missing_paths(self) -> None:
+        lang = LangData(flatten_strings(NESTED))
+        for path in (("missing",), ("title", "missing"), ("title", "start", "deeper")):
+            with self.assertRaises(KeyError):
+                lang.get_str(*path)
+            with self.assertRaises(KeyError):
+                lang.get_map(*path)
+        # A prefix of a key is not a map
+        with self.assertRaises(KeyError):
+            lang.get_map("tit")
+
+    def test_invalid_sources(self) -> None:
+        with self.assertRaises(TypeError):
+            flatten_strings(["not", "a", "dict"])
+        with self.assertRaises(TypeError):
+            flatten_strings({"title": {"start": 1}})
+        with self.assertRaises(ValueError):
+            flatten_strings({"title.start": "Start"})
+
+
+class LangDataPakTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = BuildTree().__enter__()
+        self.addCleanup(self.tree.__exit__)
+        patcher = mock.patch.object(pak_loader, "locale_dir", lambda *sub: self.tree.locale.joinpath(*sub))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_built_and_legacy_paks(self) -> None:
+        self.tree.write_locale("en_us", NESTED)
+        self.tree.build()
+        built = LangData.from_pak("en_us")
+        # The builder adds the path of the language's font to its strings
+        nested = {**NESTED, "font_path": built.get_str("font_path")}
+        self.assertEqual(built.get_map(), nested)
+
+        legacy = base64.b64encode(zlib.compress(json.dumps(nested).encode("utf-8")))
+        (self.tree.locale / "en_us.pak").write_bytes(legacy)
+        self.assertEqual(LangData.from_pak("en_us"), built)
+
+    def test_missing_pak(self) -> None:
+        with self.assertRaises(FileNotFoundError):
+            LangData.from_pak("xx_xx")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.asset_manager import PakFile # noqa: E402
+from core.pak_format import PakFormatError, PakIntegrityError, PakWriter # noqa: E402
+from core.pak_patch import apply_patch, make_patch # noqa: E402
+
+V1 = {
+    "keep": b"unchanged payload",
+    "change": b"first version",
+    "remove": b"dropped in v2",
+    "shared": b"payload reused under another name",
+}
+V2 = {
+    "change": b"second version",
+    "keep": b"unchanged payload",
+    "copy": b"payload reused under another name",
+    "shared": b"payload reused under another name",
+    "add": b"new in v2",
+}
+V3 = {
+    "keep": b"unchanged payload",
+    "change": b"third version",
+    "add": b"new in v2",
+    "late": b"new in v3",
+}
+
+
+class PakPatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def write_pak(self, name: str, entries: dict[str, bytes], built_at: str, **meta: Any) -> Path:
+        path = self.dir / name
+        with PakWriter(path, "illustration", "png", built_at) as writer:
+            writer.meta.update(meta)
+            for entry_name, data in entries.items():
+                writer.add(entry_name, data, "zlib", filename=f"{entry_name}.png", tag=entry_name)
+        return path
+
+    def read_all(self, path: Path) -> dict[str, bytes]:
+        pak = PakFile(path)
+        try:
+            return {name: bytes(pak.read(name)) for name in pak.names()}
+        finally:
+            pak.close()
+
+    def test_round_trip(self) -> None:
+        v1 = self.write_pak("v1.pak", V1, "2026-01-01")
+        v2 = self.write_pak("v2.pak", V2, "2026-02-01", priority=3, language="en_us")
+        stats = make_patch(v1, v2, self.dir / "p12.pak")
+        self.assertEqual((stats.added, stats.changed, stats.removed), (2, 1, 1))
+        self.assertEqual((stats.copied, stats.unchanged), (1, 2))
+
+        output = self.dir / "out.pak"
+        self.assertEqual(apply_patch(v1, self.dir / "p12.pak", output), len(V2))
+        self.assertEqual(self.read_all(output), V2)
+        self.assertEqual(output.read_bytes(), v2.read_bytes())
+
+        pak = PakFile(output)
+        self.assertEqual((pak.meta["priority"], pak.meta["language"]), (3, "en_us"))
+        self.assertNotIn("patch", pak.meta)
+        self.assertEqual(pak.entries["copy"].meta, {"tag": "copy"})
+        pak.close()
+
+    def test_chain(self) -> None:
+        v1 = self.write_pak("v1.pak", V1, "2026-01-01")
+        v2 = self.write_pak("v2.pak", V2, "2026-02-01")
+        v3 = self.write_pak("v3.pak", V3, "2026-03-01")
+        make_patch(v1, v2, self.dir / "p12.pak")
+        make_patch(v2, v3, self.dir / "p23.pak")
+
+        player = self.dir / "player.pak"
+        player.write_bytes(v1.read_bytes())
+        apply_patch(player, self.dir / "p12.pak")
+        apply_patch(player, self.dir / "p23.pak")
+        self.assertEqual(player.read_bytes(), v3.read_bytes())
+
+    def test_wrong_base(self) -> None:
+        v1 = self.write_pak("v1.pak", V1, "2026-01-01")
+        v2 = self.write_pak("v2.pak", V2, "2026-02-01")
+        v3 = self.write_pak("v3.pak", V3, "2026-03-01")
+        make_patch(v2, v3, self.dir / "p23.pak")
+        before = v1.read_bytes()
+        with self.assertRaises(PakFormatError):
+            apply_patch(v1, self.dir / "p23.pak")
+        self.assertEqual(v1.read_bytes(), before)
+
+    def test_corrupt_payload_leaves_base(self) -> None:
+        v1 = self.write_pak("v1.pak", V1, "2026-01-01")
+        v2 = self.write_pak("v2.pak", V2, "2026-02-01")
+        patch_path = self.dir / "p12.pak"
+        make_patch(v1, v2, patch_path)
+
+        pak = PakFile(patch_path)
+        offset = pak.entries["change"].offset
+        pak.close()
+        data = bytearray(patch_path.read_bytes())
+        data[offset] ^= 0xFF
+        patch_path.write_bytes(bytes(data))
+
+        before = v1.read_bytes()
+        with self.assertRaises(PakIntegrityError):
+            apply_patch(v1, patch_path)
+        self.assertEqual(v1.read_bytes(), before)
+        self.assertEqual(sorted(path.name for path in self.dir.iterdir()), ["p12.pak", "v1.pak", "v2.pak"])
+
+    def test_category_mismatch(self) -> None:
+        v1 = self.write_pak("v1.pak", V1, "2026-01-01")
+        other = self.dir / "scene.pak"
+        with PakWriter(other, "scene", "json", "2026-01-01") as writer:
+            writer.add("keep", b"{}")
+        with self.assertRaises(PakFormatError):
+            make_patch(v1, other, self.dir / "p.pak")
+        self.assertFalse((self.dir / "p.pak").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
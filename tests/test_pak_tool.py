@@ -0,0 +1,73 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import pygame # noqa: E402
+import pak_tool # noqa: E402
+from build_assets import encode_surface # noqa: E402
+from core.pak_format import PakWriter # noqa: E402
+
+
+class InspectTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def write_pak(self, name: str, images: dict[str, tuple[bytes, str, int, dict]]) -> Path:
+        path = self.dir / name
+        with PakWriter(path, "sprite", "png", "2026-01-01") as writer:
+            for entry_name, (payload, codec, size, meta) in images.items():
+                writer.add_encoded(entry_name, payload, codec, size, **meta)
+        return path
+
+    def inspect(self, *paths: Path, status: int = 0) -> str:
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(pak_tool.main(["inspect", *map(str, paths)]), status)
+        return output.getvalue()
+
+    def test_pixels_pak(self) -> None:
+        surface = pygame.Surface((12, 7), pygame.SRCALPHA)
+        surface.fill((200, 40, 40, 255))
+        path = self.write_pak("pixels.pak", {
+            "raw": encode_surface(surface, "raw", pixels=True),
+            "zlib": encode_surface(surface, "zlib", pixels=True),
+            "png": encode_surface(surface, "raw"),
+        })
+        output = self.inspect(path)
+        self.assertIn("3 entries", output)
+        self.assertEqual(output.count("12x7"), 3)
+
+    def test_corrupt_entry_reports_its_own_error(self) -> None:
+        path = self.write_pak("corrupt.pak", {"broken": (b"not a png", "raw", 9, {})})
+        # The failed read still references the mapping when the pak is closed
+        with self.assertRaises(pygame.error):
+            self.inspect(path)
+
+    def test_unreadable_paks_are_reported(self) -> None:
+        surface = pygame.Surface((12, 7), pygame.SRCALPHA)
+        good = self.write_pak("good.pak", {"png": encode_surface(surface, "raw")})
+        truncated = self.dir / "truncated.pak"
+        truncated.write_bytes(good.read_bytes()[:-8])
+
+        output = self.inspect(self.dir / "missing.pak", truncated, self.dir, good, status=1)
+        self.assertIn("[missing.pak] missing", output)
+        self.assertIn("[truncated.pak] unreadable:", output)
+        self.assertIn(f"[{self.dir.name}] unreadable:", output)
+        # The readable pak is still listed
+        self.assertIn("[good.pak] 1 entries", output)
+        self.assertIn("12x7", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
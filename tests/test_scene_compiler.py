@@ -0,0 +1,187 @@
+import copy
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pygame # noqa: E402
+from core.asset_manager import PakFile # noqa: E402
+from core.pak_format import PakWriter # noqa: E402
+from core.path_resolver import locale_dir # noqa: E402
+from core.scene.SceneManager import SceneManager # noqa: E402
+from core.scene.DialogueStructure import ( # noqa: E402
+    BackgroundTransition, ChangeDialogueScene, Easing, MoveCharacter, Prompt, PromptOption, SceneBranch,
+    SetBackground, SetExpression, ShowText
+)
+from core.scene_compiler import ( # noqa: E402
+    SceneCompileError, compile_scene, dump_scene, is_compiled_scene, load_compiled_scene, load_scene
+)
+
+SCENE = {
+    "characters": [
+        {"id": "ann", "sprite_filename": "Ann", "scale": 0.8, "default_layer": 1},
+    ],
+    "text_color": [200, 210, 220],
+    "steps": [
+        {"id": "intro", "actions": [
+            {"type": "set_background", "args": {"filename": "dock", "blur": 4, "transition": {"type": "fade", "duration": 0.5}}},
+            {"type": "play_bgm", "args": {"filename": "theme"}},
+            {"type": "play_sfx", "args": {}},
+            {"type": "show_character", "args": {"character_id": "ann", "x": 0.5, "y": 1.0}},
+            {"type": "move_character", "args": {
+                "character_id": "ann", "from_x": 0, "from_y": 1, "to_x": 0.5, "to_y": 1, "duration": 0.4, "easing": "out_back"
+            }},
+            {"type": "set_expression", "args": {"character_id": "ann", "expression": "blink", "fps": 8, "loop": False}},
+            {"type": "set_highlight", "args": {"character_id": "", "dim_others": True}},
+            {"type": "screen_shake", "args": {"duration": 1, "intensity": 3, "frequency": 20, "infinite": False}},
+            {"type": "show_text", "args": {"speaker_name": "Ann", "speaker_title": "Pilot", "text": "We made it."}},
+            {"type": "hide_character", "args": {"character_id": "ann"}},
+        ]},
+        {"id": "choice", "actions": [
+            {"type": "prompt", "args": {"id": "choice1", "message": "Where to?", "options": [
+                {"message": "Dock", "flag_value": "dock"},
+                {"message": "Lab", "flag_value": "lab"},
+            ]}},
+            {"type": "change_dialogue_scene", "args": [
+                {"scene_id": "dock", "required_g_flags": {"choice1": "dock"}},
+                {"scene_id": "lab"},
+            ]},
+        ]},
+    ],
+}
+KNOWN = {
+    "illustrations": {"dock"},
+    "sprites": {"Ann", "Ann.blink.0", "Ann.blink.1"},
+    "scenes": {"dock", "lab"},
+}
+
+
+class SceneCompilerTest(unittest.TestCase):
+    def compile_errors(self, data: dict, **known) -> list[str]:
+        with self.assertRaises(SceneCompileError) as raised:
+            compile_scene(data, "broken", **known)
+        self.assertEqual(raised.exception.scene_id, "broken")
+        self.assertIn("'broken'", str(raised.exception))
+        return raised.exception.errors
+
+    def test_compile(self) -> None:
+        script = compile_scene(SCENE, "example", **KNOWN)
+        self.assertEqual(script.text_color, (200, 210, 220))
+        self.assertEqual(script.characters[0].default_layer, 1)
+
+        intro, choice = script.steps
+        self.assertEqual(intro.id, "intro")
+        self.assertEqual(intro.actions[0], SetBackground("dock", 4, BackgroundTransition("fade", 0.5)))
+        self.assertIsInstance(intro.actions[4], MoveCharacter)
+        self.assertIs(intro.actions[4].easing, Easing.OUT_BACK)
+        self.assertEqual(intro.actions[5], SetExpression("ann", "blink", 8.0, False))
+        self.assertEqual(intro.actions[8], ShowText("Ann", "Pilot", "We made it."))
+        self.assertEqual(choice.actions[0], Prompt("choice1", "Where to?", (PromptOption("Dock", "dock"), PromptOption("Lab", "lab"))))
+        self.assertEqual(
+            choice.actions[1], ChangeDialogueScene((SceneBranch("dock", {"choice1": "dock"}), SceneBranch("lab", {})))
+        )
+
+    def test_round_trip(self) -> None:
+        script = compile_scene(SCENE, "example", **KNOWN)
+        data = dump_scene(script)
+        self.assertTrue(is_compiled_scene(data))
+        loaded = load_compiled_scene(memoryview(data))
+        self.assertEqual(loaded, script)
+        self.assertEqual([type(a) for s in loaded.steps for a in s.actions], [type(a) for s in script.steps for a in s.actions])
+        self.assertIs(loaded.steps[0].actions[4].easing, Easing.OUT_BACK)
+
+    def test_json_scene_is_compiled_on_load(self) -> None:
+        self.assertEqual(load_scene(json.dumps(SCENE).encode(), "example"), compile_scene(SCENE, "example"))
+
+    def test_untrusted_compiled_scene(self) -> None:
+        data = dump_scene(compile_scene(SCENE, "example"))
+        with self.assertRaises(SceneCompileError):
+            load_scene(data, "example", trusted=False)
+
+    def test_reports_every_error(self) -> None:
+        data = copy.deepcopy(SCENE)
+        intro = data["steps"][0]["actions"]
+        intro[0]["args"]["filename"] = "missing_background"
+        intro[3]["args"]["character_id"] = "bob"
+        del intro[8]["args"]["text"]
+        intro[4]["args"]["easing"] = "wobbly"
+        intro.append({"type": "dance", "args": {}})
+        errors = self.compile_errors(data, **KNOWN)
+
+        self.assertEqual(len(errors), 5)
+        self.assertIn("step 0 (intro), action 0 (set_background): illustration 'missing_background' doesn't exist", errors)
+        self.assertIn("step 0 (intro), action 3 (show_character): unknown character 'bob'", errors)
+        self.assertIn("step 0 (intro), action 8 (show_text): missing argument 'text'", errors)
+        self.assertIn("step 0 (intro), action 10: unknown action type 'dance'", errors)
+
+    def test_missing_references(self) -> None:
+        data = copy.deepcopy(SCENE)
+        data["steps"][0]["actions"][5]["args"]["expression"] = "wink"
+        data["steps"][1]["actions"][1]["args"][1]["scene_id"] = "nowhere"
+        errors = self.compile_errors(data, **KNOWN)
+        self.assertEqual(errors, [
+            "step 0 (intro), action 5 (set_expression): sprite 'Ann' has no expression 'wink'",
+            "step 1 (choice), action 1 (change_dialogue_scene) branch 1: scene 'nowhere' doesn't exist",
+        ])
+
+    def test_malformed_structure(self) -> None:
+        data = copy.deepcopy(SCENE)
+        data["steps"][1]["actions"][0]["args"]["options"][1] = "Lab"
+        data["steps"][1]["actions"][1]["args"][0] = "dock"
+        data["steps"][1]["actions"][1]["args"][1]["required_g_flags"] = "choice1"
+        data["steps"][0]["actions"].append(["not", "an", "action"])
+        data["steps"].append("not a step")
+        data["characters"].append(None)
+        errors = self.compile_errors(data)
+        self.assertEqual(errors, [
+            "character 1: must be an object, got None",
+            "step 2: must be an object, got 'not a step'",
+            "step 0 (intro), action 10: must be an object, got ['not', 'an', 'action']",
+            "step 1 (choice), action 0 (prompt) option 1: must be an object, got 'Lab'",
+            "step 1 (choice), action 1 (change_dialogue_scene) branch 0: must be an object, got 'dock'",
+            "step 1 (choice), action 1 (change_dialogue_scene) branch 1: required_g_flags must be an object, got 'choice1'",
+        ])
+
+    def test_not_a_scene(self) -> None:
+        self.assertEqual(self.compile_errors([]), ["scene must be an object, got list"])  # type: ignore[arg-type]
+        self.assertEqual(self.compile_errors({"steps": {}}), ["steps must be a list, got {}"])
+
+
+class OverlaySceneTest(unittest.TestCase):
+    def setUp(self) -> None:
+        if not list(locale_dir().glob("*.pak")):
+            self.skipTest("locales not built, run scripts/build_assets.py")
+
+        self.tmp = tempfile.TemporaryDirectory()
+        paths = {name: Path(self.tmp.name) / f"{name}.pak" for name in ("base", "mod")}
+        script = compile_scene(SCENE, "example")
+        with PakWriter(paths["base"], "scene", "json", "2026-01-01") as writer:
+            writer.add("example", dump_scene(script))
+            writer.add("lab", dump_scene(script))
+        with PakWriter(paths["mod"], "scene", "json", "2026-01-01") as writer:
+            writer.add("example", dump_scene(script))
+            writer.add("lab", json.dumps(SCENE).encode())
+
+        pygame.init()
+        self.sm = SceneManager(pygame.display.set_mode((320, 180)), asset_scenes=PakFile(paths["base"]))
+        self.assertEqual(self.sm.get_scene_data("example"), script)
+        self.sm.mount_pak("scene", PakFile(paths["mod"]), priority=1)
+
+    def tearDown(self) -> None:
+        self.sm.shutdown()
+        pygame.quit()
+        self.tmp.cleanup()
+
+    def test_overlay_scenes_must_be_json(self) -> None:
+        with self.assertRaises(SceneCompileError):
+            self.sm.get_scene_data("example")
+        self.assertEqual(self.sm.get_scene_data("lab"), compile_scene(SCENE, "lab"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import io
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from build_tree import BuildTree, build_assets # noqa: E402
+import pygame # noqa: E402
+from core.sprite_atlas import ( # noqa: E402
+    SpriteAtlas, atlas_frames_name, atlas_page_name, frame_character, group_sequences, split_sequence_frame
+)
+
+FRAMES = {
+    "Ann": ((30, 60), (200, 40, 40, 255)),
+    "Ann.smile": ((30, 60), (40, 200, 40, 255)),
+    "Ann.blink.0": ((30, 60), (10, 10, 10, 255)),
+    "Ann.blink.1": ((30, 60), (20, 20, 20, 255)),
+    "Ann.blink.2": ((30, 60), (30, 30, 30, 255)),
+    "Ann.blink.10": ((30, 60), (40, 40, 40, 255)),
+    "Eve": ((20, 70), (40, 40, 200, 255)),
+}
+
+
+def pixels(surface: pygame.Surface) -> bytes:
+    return pygame.image.tobytes(surface, "RGBA")
+
+
+class FrameNamingTest(unittest.TestCase):
+    def test_names(self) -> None:
+        self.assertEqual(frame_character("Ann.blink.0"), "Ann")
+        self.assertEqual(split_sequence_frame("Ann.blink.2"), ("Ann.blink", 2))
+        self.assertIsNone(split_sequence_frame("Ann.smile"))
+        self.assertIsNone(split_sequence_frame("Ann"))
+        self.assertEqual(atlas_frames_name((1280, 720)), "atlas/frames@1280x720")
+        self.assertEqual(atlas_page_name("Ann", 1), "atlas/Ann/1")
+
+    def test_sequences_are_ordered_by_index(self) -> None:
+        self.assertEqual(group_sequences(FRAMES), {"Ann.blink": ["Ann.blink.0", "Ann.blink.1", "Ann.blink.2", "Ann.blink.10"]})
+
+
+class PackFramesTest(unittest.TestCase):
+    def test_no_overlap(self) -> None:
+        sizes = {f"f{idx}": (10 + idx * 7 % 40, 15 + idx * 11 % 50) for idx in range(60)}
+        placements, page_sizes = build_assets.pack_frames(sizes, (128, 128))
+        self.assertGreater(len(page_sizes), 1)
+        self.assertEqual(placements.keys(), sizes.keys())
+
+        rects = [(page, pygame.Rect(x, y, w, h)) for page, x, y, w, h in placements.values()]
+        for page, rect in rects:
+            page_w, page_h = page_sizes[page]
+            self.assertTrue(rect.right <= page_w and rect.bottom <= page_h)
+        for idx, (page, rect) in enumerate(rects):
+            for other_page, other in rects[idx + 1:]:
+                self.assertFalse(page == other_page and rect.colliderect(other))
+
+    def test_frame_too_large(self) -> None:
+        with self.assertRaises(ValueError):
+            build_assets.pack_frames({"huge": (200, 10)}, (128, 128))
+
+
+class AtlasBuildTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = BuildTree().__enter__()
+        self.addCleanup(self.tree.__exit__)
+        for name, (size, color) in FRAMES.items():
+            self.tree.write_image("sprite", name, size, color)
+
+    def load_atlas(self, size: tuple[int, int] | None = None) -> SpriteAtlas:
+        pak = self.tree.pak("sprite.pak")
+        self.addCleanup(pak.close)
+        atlas = SpriteAtlas.from_source(pak, lambda name: pygame.image.load(io.BytesIO(bytes(pak.read(name)))), size)
+        assert atlas is not None
+        self.names = set(pak.names())
+        return atlas
+
+    def test_frame_table(self) -> None:
+        self.tree.build("--atlas", "--no-trim")
+        atlas = self.load_atlas()
+        self.assertEqual(self.names, {"atlas/frames", "atlas/Ann/0", "atlas/Eve/0"})
+        self.assertEqual(set(atlas.frames), set(FRAMES))
+        self.assertEqual(atlas.scale, 1.0)
+        self.assertEqual(atlas.trims, {})
+        self.assertEqual(atlas.page_name("Ann.blink.1"), "atlas/Ann/0")
+        self.assertEqual(atlas.page_name("Eve"), "atlas/Eve/0")
+
+        for name, (size, color) in FRAMES.items():
+            frame = atlas.frame(name)
+            self.assertEqual(frame.get_size(), size)
+            expected = pygame.Surface(size, pygame.SRCALPHA, 32)
+            expected.fill(color)
+            self.assertEqual(pixels(frame), pixels(expected), name)
+
+    def test_sequences(self) -> None:
+        self.tree.build("--atlas", "--no-trim")
+        atlas = self.load_atlas()
+        self.assertEqual(atlas.sequence("Ann.blink"), ["Ann.blink.0", "Ann.blink.1", "Ann.blink.2", "Ann.blink.10"])
+        self.assertEqual(atlas.sequence("Ann.smile"), ["Ann.smile"])
+        with self.assertRaises(KeyError):
+            atlas.sequence("Ann.wink")
+
+    def test_variant_atlases(self) -> None:
+        self.tree.build("--atlas", "--variants", "--no-trim")
+        atlas = self.load_atlas((1280, 720))
+        self.assertIn("atlas/frames@1280x720", self.names)
+        self.assertAlmostEqual(atlas.scale, 1280 / 1920)
+        expected = pygame.transform.smoothscale_by(pygame.Surface((20, 70), pygame.SRCALPHA, 32), 1280 / 1920)
+        self.assertEqual(atlas.frame("Eve").get_size(), expected.get_size())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import io
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from build_tree import BuildTree, build_assets # noqa: E402
+import pygame # noqa: E402
+from core.sprite_atlas import SpriteAtlas, SpriteFrame # noqa: E402
+
+
+class TrimSurfaceTest(unittest.TestCase):
+    def test_crops_margins(self) -> None:
+        surface = pygame.Surface((40, 80), pygame.SRCALPHA, 32)
+        surface.fill((255, 0, 0, 255), (3, 7, 20, 50))
+        cropped, trim = build_assets.trim_surface(surface)
+        self.assertEqual(trim, [3, 7, 40, 80])
+        self.assertEqual(cropped.get_size(), (20, 50))
+        self.assertEqual(cropped.get_bounding_rect().size, (20, 50))
+
+    def test_nothing_to_crop(self) -> None:
+        opaque = pygame.Surface((10, 10), pygame.SRCALPHA, 32)
+        opaque.fill((0, 0, 0, 255))
+        self.assertEqual(build_assets.trim_surface(opaque), (opaque, None))
+
+        # A fully transparent frame is kept whole rather than cropped to nothing
+        blank = pygame.Surface((10, 10), pygame.SRCALPHA, 32)
+        self.assertEqual(build_assets.trim_surface(blank), (blank, None))
+
+
+class SpriteFrameTest(unittest.TestCase):
+    def test_from_trim(self) -> None:
+        surface = pygame.Surface((20, 50), pygame.SRCALPHA, 32)
+        self.assertEqual(SpriteFrame.from_trim(surface, None), (surface, (0, 0), (20, 50)))
+        self.assertEqual(SpriteFrame.from_trim(surface, [3, 7, 40, 80]), (surface, (3, 7), (40, 80)))
+        self.assertEqual(SpriteFrame.from_trim(surface, [3, 7, 40, 80], 0.5), (surface, (2, 4), (20, 40)))
+
+
+class TrimBuildTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = BuildTree().__enter__()
+        self.addCleanup(self.tree.__exit__)
+        self.tree.write_image("sprite", "Ann", (40, 80), margin=5)
+        self.tree.write_image("sprite", "Eve", (40, 80))
+        self.tree.write_image("illustration", "room", (64, 36), margin=4)
+
+    def open_pak(self, name: str):
+        pak = self.tree.pak(name)
+        self.addCleanup(pak.close)
+        return pak
+
+    def test_entry_meta(self) -> None:
+        self.tree.build("--variants")
+        sprites = self.open_pak("sprite.pak")
+        self.assertEqual(sprites.entry_meta("Ann")["trim"], [5, 5, 40, 80])
+        self.assertEqual(sprites.entry_meta("Ann")["image_size"], [30, 70])
+        self.assertNotIn("trim", sprites.entry_meta("Eve"))
+
+        # Variants are trimmed after scaling, so their offsets are in variant pixels
+        variant = sprites.entry_meta("Ann@1280x720")
+        scaled = pygame.transform.smoothscale_by(pygame.Surface((40, 80), pygame.SRCALPHA, 32), 1280 / 1920)
+        self.assertEqual(variant["trim"][2:], list(scaled.get_size()))
+        self.assertEqual(pygame.image.load(io.BytesIO(bytes(sprites.read("Ann@1280x720")))).get_size(), tuple(variant["image_size"]))
+
+        # Only sprites are trimmed
+        self.assertNotIn("trim", self.open_pak("illustration.pak").entry_meta("room"))
+
+    def test_no_trim(self) -> None:
+        self.tree.build("--no-trim")
+        sprites = self.open_pak("sprite.pak")
+        self.assertNotIn("trim", sprites.entry_meta("Ann"))
+        self.assertEqual(pygame.image.load(io.BytesIO(bytes(sprites.read("Ann")))).get_size(), (40, 80))
+
+    def test_atlas_frame_table(self) -> None:
+        self.tree.build("--atlas")
+        sprites = self.open_pak("sprite.pak")
+        atlas = SpriteAtlas.from_source(sprites, lambda name: pygame.image.load(io.BytesIO(bytes(sprites.read(name)))))
+        assert atlas is not None
+        self.assertEqual(atlas.trims, {"Ann": [5, 5, 40, 80]})
+        self.assertEqual(atlas.frame("Ann").get_size(), (30, 70))
+        self.assertEqual(atlas.frame("Eve").get_size(), (40, 80))
+
+        frame = SpriteFrame.from_trim(atlas.frame("Ann"), atlas.trims.get("Ann"))
+        self.assertEqual((frame.offset, frame.size), ((5, 5), (40, 80)))
+
+
+if __name__ == "__main__":
+    unittest.main()